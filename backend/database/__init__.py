@@ -4,4 +4,4 @@ Database modules for persistent storage and caching.
 """
 
 from .db_manager import DatabaseManager
-from .tidb_manager import TiDBManager, get_database_manager
+from .tidb_manager import TiDBManager, LazyDatabase, get_database_manager, get_db
@@ -15,7 +15,7 @@ import sqlite3
 import json
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -60,7 +60,8 @@ class DatabaseManager:
     @contextmanager
     def _get_connection(self):
         """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
+        # Scrapers run concurrently; wait on the write lock instead of failing
+        conn = sqlite3.connect(self.db_path, timeout=30)
         conn.row_factory = sqlite3.Row
         try:
             yield conn
@@ -135,6 +136,39 @@ class DatabaseManager:
                 )
             """)
             
+            # Listing fingerprints for incremental scraping
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS listing_fingerprints (
+                    event_id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    updated_at TEXT
+                )
+            """)
+            
+            # Per-source run history (see scraper/telemetry.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    status TEXT,
+                    saved INTEGER DEFAULT 0,
+                    wall_s REAL DEFAULT 0,
+                    listing_s REAL DEFAULT 0,
+                    details_s REAL DEFAULT 0,
+                    normalize_s REAL DEFAULT 0,
+                    write_s REAL DEFAULT 0,
+                    requests INTEGER DEFAULT 0,
+                    bytes INTEGER DEFAULT 0,
+                    cache_hits INTEGER DEFAULT 0,
+                    retries INTEGER DEFAULT 0,
+                    errors INTEGER DEFAULT 0,
+                    error_message TEXT
+                )
+            """)
+            
             # Create indexes for common queries
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_source ON events(source)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_start_date ON events(start_date)")
@@ -142,6 +176,8 @@ class DatabaseManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_mode ON events(mode)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_prize ON events(prize_pool_numeric)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_tag ON event_tags(tag)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_fingerprints_source ON listing_fingerprints(source)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_source ON scrape_runs(source, started_at)")
             
             # Create FTS (Full-Text Search) virtual table
             cursor.execute("""
@@ -178,16 +214,8 @@ class DatabaseManager:
     
     # ============ CRUD Operations ============
     
-    def save_event(self, event: HackathonEvent) -> bool:
-        """
-        Save or update a single event.
-        
-        Args:
-            event: HackathonEvent object to save
-            
-        Returns:
-            True if successful, False if skipped (ended/past deadline)
-        """
+    def _should_save(self, event: HackathonEvent) -> bool:
+        """False for ended events and events whose registration has closed."""
         # Filter out past events
         if event.status == 'ended':
             return False
@@ -200,47 +228,76 @@ class DatabaseManager:
                     return False
             except ValueError:
                 pass
+        return True
+    
+    def _write_events(self, cursor, events: List[HackathonEvent]):
+        """Upsert events and replace their tags and themes (caller commits)."""
+        cursor.executemany("""
+            INSERT OR REPLACE INTO events (
+                id, source, title, url, start_date, end_date,
+                registration_deadline, location, mode, description,
+                prize_pool, prize_pool_numeric, image_url, logo_url,
+                organizer, participants_count, team_size_min, team_size_max,
+                status, scraped_at, last_updated
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            event.id, event.source, event.title, event.url,
+            event.start_date, event.end_date, event.registration_deadline,
+            event.location, event.mode, event.description,
+            event.prize_pool, event.prize_pool_numeric,
+            event.image_url, event.logo_url, event.organizer,
+            event.participants_count, event.team_size_min, event.team_size_max,
+            event.status, event.scraped_at, event.last_updated
+        ) for event in events])
+        
+        # Update tags and themes
+        ids = [(event.id,) for event in events]
+        cursor.executemany("DELETE FROM event_tags WHERE event_id = ?", ids)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO event_tags (event_id, tag) VALUES (?, ?)",
+            [(event.id, tag) for event in events for tag in event.tags]
+        )
+        cursor.executemany("DELETE FROM event_themes WHERE event_id = ?", ids)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO event_themes (event_id, theme) VALUES (?, ?)",
+            [(event.id, theme) for event in events for theme in event.themes]
+        )
+    
+    def save_event(self, event: HackathonEvent) -> bool:
+        """
+        Save or update a single event.
+        
+        Args:
+            event: HackathonEvent object to save
+            
+        Returns:
+            True if successful, False if skipped (ended/past deadline)
+        """
+        if not self._should_save(event):
+            return False
 
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Upsert event
-            cursor.execute("""
-                INSERT OR REPLACE INTO events (
-                    id, source, title, url, start_date, end_date,
-                    registration_deadline, location, mode, description,
-                    prize_pool, prize_pool_numeric, image_url, logo_url,
-                    organizer, participants_count, team_size_min, team_size_max,
-                    status, scraped_at, last_updated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                event.id, event.source, event.title, event.url,
-                event.start_date, event.end_date, event.registration_deadline,
-                event.location, event.mode, event.description,
-                event.prize_pool, event.prize_pool_numeric,
-                event.image_url, event.logo_url, event.organizer,
-                event.participants_count, event.team_size_min, event.team_size_max,
-                event.status, event.scraped_at, event.last_updated
-            ))
-            
-            # Update tags
-            cursor.execute("DELETE FROM event_tags WHERE event_id = ?", (event.id,))
-            for tag in event.tags:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO event_tags (event_id, tag) VALUES (?, ?)",
-                    (event.id, tag)
-                )
-            
-            # Update themes
-            cursor.execute("DELETE FROM event_themes WHERE event_id = ?", (event.id,))
-            for theme in event.themes:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO event_themes (event_id, theme) VALUES (?, ?)",
-                    (event.id, theme)
-                )
-            
+            self._write_events(conn.cursor(), [event])
             return True
     
+    def save_event_batch(self, events: List[HackathonEvent]) -> int:
+        """
+        Save or update many events in a single transaction.
+        
+        Args:
+            events: HackathonEvent objects to save
+            
+        Returns:
+            Number of events written (ended/past-deadline events are skipped)
+        """
+        # Last write wins within a batch, as with sequential save_event calls
+        to_save = list({e.id: e for e in events if self._should_save(e)}.values())
+        if not to_save:
+            return 0
+        with self._get_connection() as conn:
+            self._write_events(conn.cursor(), to_save)
+        return len(to_save)
+    
     def save_events(self, events: List[HackathonEvent], source: str) -> int:
         """
         Save multiple events from a source.
@@ -253,10 +310,7 @@ class DatabaseManager:
         Returns:
             Number of events saved
         """
-        count = 0
-        for event in events:
-            if self.save_event(event):
-                count += 1
+        count = self.save_event_batch(events)
         
         # Update scrape metadata
         self.update_scrape_metadata(source, count, True)
@@ -422,6 +476,28 @@ class DatabaseManager:
             
             return events, total
     
+    def iter_events(self, batch_size: int = 500) -> Iterator[HackathonEvent]:
+        """
+        Every stored event, with tags and themes, in ID order.
+        
+        Reads in batches of ``batch_size`` so large tables are not loaded
+        at once (used to merge shard staging databases).
+        """
+        last_id = ''
+        while True:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT * FROM events WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                )
+                rows = [dict(row) for row in cursor.fetchall()]
+                events = [self._row_to_event(row, cursor) for row in rows]
+            if not events:
+                return
+            yield from events
+            last_id = events[-1].id
+    
     def get_all_tags(self) -> List[Tuple[str, int]]:
         """Get all unique tags with their counts."""
         with self._get_connection() as conn:
@@ -549,6 +625,92 @@ class DatabaseManager:
             
             return [row['source'] for row in cursor.fetchall()]
     
+    # ============ Run Telemetry ============
+    
+    _RUN_COLUMNS = (
+        'run_id', 'source', 'started_at', 'status', 'saved', 'wall_s', 'listing_s',
+        'details_s', 'normalize_s', 'write_s', 'requests', 'bytes', 'cache_hits',
+        'retries', 'errors', 'error_message'
+    )
+    
+    def save_scrape_runs(self, runs: List[Dict]) -> int:
+        """
+        Append per-source run telemetry rows.
+        
+        Args:
+            runs: Dicts keyed by the scrape_runs columns (see scraper/telemetry.py)
+            
+        Returns:
+            Number of rows written
+        """
+        if not runs:
+            return 0
+        columns = ", ".join(self._RUN_COLUMNS)
+        placeholders = ", ".join("?" * len(self._RUN_COLUMNS))
+        with self._get_connection() as conn:
+            conn.executemany(
+                f"INSERT INTO scrape_runs ({columns}) VALUES ({placeholders})",
+                [tuple(run.get(c) for c in self._RUN_COLUMNS) for run in runs]
+            )
+        return len(runs)
+    
+    def get_scrape_runs(self, source: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        """Get run telemetry rows, newest first, optionally for one source."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if source:
+                cursor.execute(
+                    "SELECT * FROM scrape_runs WHERE source = ? ORDER BY started_at DESC, id DESC LIMIT ?",
+                    (source, limit)
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM scrape_runs ORDER BY started_at DESC, id DESC LIMIT ?",
+                    (limit,)
+                )
+            return [dict(row) for row in cursor.fetchall()]
+    
+    # ============ Incremental Scraping ============
+    
+    def get_listing_fingerprints(self, source: str) -> Dict[str, str]:
+        """Get stored listing fingerprints for a source, keyed by event ID."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT event_id, fingerprint FROM listing_fingerprints WHERE source = ?",
+                (source,)
+            )
+            return {row['event_id']: row['fingerprint'] for row in cursor.fetchall()}
+    
+    def save_listing_fingerprints(self, source: str, fingerprints: Dict[str, str]):
+        """Upsert listing fingerprints for a source in one transaction."""
+        if not fingerprints:
+            return
+        now = datetime.now().isoformat()
+        with self._get_connection() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO listing_fingerprints (event_id, source, fingerprint, updated_at)
+                VALUES (?, ?, ?, ?)
+            """, [(event_id, source, fp, now) for event_id, fp in fingerprints.items()])
+    
+    def touch_events(self, event_ids: List[str]) -> int:
+        """Bump last_updated for events that were seen unchanged."""
+        if not event_ids:
+            return 0
+        now = datetime.now().isoformat()
+        touched = 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(event_ids), 500):
+                chunk = event_ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(
+                    f"UPDATE events SET last_updated = ? WHERE id IN ({placeholders})",
+                    [now] + chunk
+                )
+                touched += cursor.rowcount
+        return touched
+    
     # ============ Helper Methods ============
     
     def _row_to_event(self, row: Dict, cursor) -> HackathonEvent:
@@ -8,6 +8,7 @@ Uses mysql-connector-python to connect to TiDB Serverless.
 import os
 import json
 import logging
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional, Any, Tuple
 from contextlib import contextmanager
@@ -115,75 +116,136 @@ class TiDBManager:
                 )
             """)
             
+            # Listing fingerprints for incremental scraping
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS listing_fingerprints (
+                    event_id VARCHAR(255) PRIMARY KEY,
+                    source VARCHAR(100),
+                    fingerprint CHAR(40),
+                    updated_at DATETIME,
+                    INDEX idx_fp_source (source)
+                )
+            """)
+            
+            # Per-source run history (see scraper/telemetry.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_runs (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    run_id VARCHAR(32) NOT NULL,
+                    source VARCHAR(100) NOT NULL,
+                    started_at DATETIME NOT NULL,
+                    status VARCHAR(20),
+                    saved INT DEFAULT 0,
+                    wall_s DOUBLE DEFAULT 0,
+                    listing_s DOUBLE DEFAULT 0,
+                    details_s DOUBLE DEFAULT 0,
+                    normalize_s DOUBLE DEFAULT 0,
+                    write_s DOUBLE DEFAULT 0,
+                    requests INT DEFAULT 0,
+                    bytes BIGINT DEFAULT 0,
+                    cache_hits INT DEFAULT 0,
+                    retries INT DEFAULT 0,
+                    errors INT DEFAULT 0,
+                    error_message TEXT,
+                    INDEX idx_runs_source (source, started_at)
+                )
+            """)
+            
             cursor.close()
     
-    def save_event(self, event: HackathonEvent) -> bool:
-        """Save or update a single event."""
+    _UPSERT_EVENT = """
+        INSERT INTO events (
+            id, source, title, url, description, start_date, end_date,
+            deadline, location, mode, prize_pool, prize_pool_numeric,
+            tags, organizer, image_url, team_size_min, team_size_max,
+            participants_count, status, scraped_at, last_updated
+        ) VALUES (
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+        )
+        ON DUPLICATE KEY UPDATE
+            title = VALUES(title),
+            url = VALUES(url),
+            description = VALUES(description),
+            start_date = VALUES(start_date),
+            end_date = VALUES(end_date),
+            deadline = VALUES(deadline),
+            location = VALUES(location),
+            mode = VALUES(mode),
+            prize_pool = VALUES(prize_pool),
+            prize_pool_numeric = VALUES(prize_pool_numeric),
+            tags = VALUES(tags),
+            organizer = VALUES(organizer),
+            image_url = VALUES(image_url),
+            team_size_min = VALUES(team_size_min),
+            team_size_max = VALUES(team_size_max),
+            participants_count = VALUES(participants_count),
+            status = VALUES(status),
+            last_updated = VALUES(last_updated)
+    """
+    
+    def _should_save(self, event: HackathonEvent) -> bool:
+        """False for ended events and events whose registration has closed."""
         # Skip ended events
         if event.status == 'ended':
             return False
         
-        # Skip past deadlines
-        if event.deadline:
+        # Skip past registration deadlines (stored in the "deadline" column)
+        if event.registration_deadline:
             try:
-                deadline = datetime.strptime(event.deadline[:10], "%Y-%m-%d").date()
+                deadline = datetime.strptime(event.registration_deadline[:10], "%Y-%m-%d").date()
                 if deadline < datetime.now().date():
                     return False
             except:
                 pass
+        return True
+    
+    def _event_row(self, event: HackathonEvent, now: str) -> Tuple:
+        """Parameters for _UPSERT_EVENT."""
+        tags_json = json.dumps(event.tags) if event.tags else '[]'
+        return (
+            event.id, event.source, event.title, event.url, event.description,
+            event.start_date, event.end_date, event.registration_deadline, event.location,
+            event.mode, event.prize_pool, event.prize_pool_numeric,
+            tags_json, event.organizer, event.image_url,
+            event.team_size_min, event.team_size_max, event.participants_count,
+            event.status, now, now
+        )
+    
+    def save_event(self, event: HackathonEvent) -> bool:
+        """Save or update a single event."""
+        if not self._should_save(event):
+            return False
         
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            tags_json = json.dumps(event.tags) if event.tags else '[]'
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            cursor.execute("""
-                INSERT INTO events (
-                    id, source, title, url, description, start_date, end_date,
-                    deadline, location, mode, prize_pool, prize_pool_numeric,
-                    tags, organizer, image_url, team_size_min, team_size_max,
-                    participants_count, status, scraped_at, last_updated
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
-                ON DUPLICATE KEY UPDATE
-                    title = VALUES(title),
-                    url = VALUES(url),
-                    description = VALUES(description),
-                    start_date = VALUES(start_date),
-                    end_date = VALUES(end_date),
-                    deadline = VALUES(deadline),
-                    location = VALUES(location),
-                    mode = VALUES(mode),
-                    prize_pool = VALUES(prize_pool),
-                    prize_pool_numeric = VALUES(prize_pool_numeric),
-                    tags = VALUES(tags),
-                    organizer = VALUES(organizer),
-                    image_url = VALUES(image_url),
-                    team_size_min = VALUES(team_size_min),
-                    team_size_max = VALUES(team_size_max),
-                    participants_count = VALUES(participants_count),
-                    status = VALUES(status),
-                    last_updated = VALUES(last_updated)
-            """, (
-                event.id, event.source, event.title, event.url, event.description,
-                event.start_date, event.end_date, event.deadline, event.location,
-                event.mode, event.prize_pool, event.prize_pool_numeric,
-                tags_json, event.organizer, event.image_url,
-                event.team_size_min, event.team_size_max, event.participants_count,
-                event.status, now, now
-            ))
-            
+            cursor.execute(self._UPSERT_EVENT, self._event_row(event, now))
             cursor.close()
             return True
     
+    def save_event_batch(self, events: List[HackathonEvent]) -> int:
+        """Save or update many events over one connection in one transaction."""
+        # Last write wins within a batch, as with sequential save_event calls
+        to_save = list({e.id: e for e in events if self._should_save(e)}.values())
+        if not to_save:
+            return 0
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            conn.start_transaction()
+            try:
+                cursor.executemany(self._UPSERT_EVENT, [self._event_row(e, now) for e in to_save])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        return len(to_save)
+    
     def save_events(self, events: List[HackathonEvent], source: str) -> int:
         """Save multiple events from a source."""
-        saved = 0
-        for event in events:
-            if self.save_event(event):
-                saved += 1
+        saved = self.save_event_batch(events)
         
         # Update metadata
         self.update_scrape_metadata(source, saved, True)
@@ -332,6 +394,15 @@ class TiDBManager:
             
             cursor.close()
     
+    def get_scrape_metadata(self, source: str) -> Optional[Dict]:
+        """Get scraping metadata for a source."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM scrape_metadata WHERE source = %s", (source,))
+            row = cursor.fetchone()
+            cursor.close()
+            return row
+    
     def delete_old_events(self, days: int = 90) -> int:
         """Delete events that ended more than X days ago."""
         with self._get_connection() as conn:
@@ -345,6 +416,96 @@ class TiDBManager:
             logger.info(f"Deleted {deleted} old events (ended before {cutoff})")
             return deleted
     
+    _RUN_COLUMNS = (
+        'run_id', 'source', 'started_at', 'status', 'saved', 'wall_s', 'listing_s',
+        'details_s', 'normalize_s', 'write_s', 'requests', 'bytes', 'cache_hits',
+        'retries', 'errors', 'error_message'
+    )
+    
+    def save_scrape_runs(self, runs: List[Dict]) -> int:
+        """Append per-source run telemetry rows; returns rows written."""
+        if not runs:
+            return 0
+        columns = ", ".join(self._RUN_COLUMNS)
+        placeholders = ", ".join(["%s"] * len(self._RUN_COLUMNS))
+        rows = []
+        for run in runs:
+            row = dict(run)
+            row['started_at'] = datetime.fromisoformat(run['started_at']).strftime("%Y-%m-%d %H:%M:%S")
+            rows.append(tuple(row.get(c) for c in self._RUN_COLUMNS))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(f"INSERT INTO scrape_runs ({columns}) VALUES ({placeholders})", rows)
+            cursor.close()
+        return len(rows)
+    
+    def get_scrape_runs(self, source: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        """Get run telemetry rows, newest first, optionally for one source."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            if source:
+                cursor.execute(
+                    "SELECT * FROM scrape_runs WHERE source = %s ORDER BY started_at DESC, id DESC LIMIT %s",
+                    (source, limit)
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM scrape_runs ORDER BY started_at DESC, id DESC LIMIT %s",
+                    (limit,)
+                )
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+    
+    def get_listing_fingerprints(self, source: str) -> Dict[str, str]:
+        """Get stored listing fingerprints for a source, keyed by event ID."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT event_id, fingerprint FROM listing_fingerprints WHERE source = %s",
+                (source,)
+            )
+            result = {event_id: fp for event_id, fp in cursor.fetchall()}
+            cursor.close()
+            return result
+    
+    def save_listing_fingerprints(self, source: str, fingerprints: Dict[str, str]):
+        """Upsert listing fingerprints for a source in one transaction."""
+        if not fingerprints:
+            return
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            conn.start_transaction()
+            cursor.executemany("""
+                INSERT INTO listing_fingerprints (event_id, source, fingerprint, updated_at)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    fingerprint = VALUES(fingerprint),
+                    updated_at = VALUES(updated_at)
+            """, [(event_id, source, fp, now) for event_id, fp in fingerprints.items()])
+            conn.commit()
+            cursor.close()
+    
+    def touch_events(self, event_ids: List[str]) -> int:
+        """Bump last_updated for events that were seen unchanged."""
+        if not event_ids:
+            return 0
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        touched = 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(event_ids), 500):
+                chunk = event_ids[i:i + 500]
+                placeholders = ",".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"UPDATE events SET last_updated = %s WHERE id IN ({placeholders})",
+                    [now] + chunk
+                )
+                touched += cursor.rowcount
+            cursor.close()
+        return touched
+    
     def _row_to_event(self, row: Dict) -> HackathonEvent:
         """Convert database row to HackathonEvent."""
         tags = row.get('tags')
@@ -362,7 +523,7 @@ class TiDBManager:
             description=row.get('description'),
             start_date=row.get('start_date'),
             end_date=row.get('end_date'),
-            deadline=row.get('deadline'),
+            registration_deadline=row.get('deadline'),  # Column keeps its old name
             location=row.get('location'),
             mode=row.get('mode'),
             prize_pool=row.get('prize_pool'),
@@ -391,3 +552,29 @@ def get_database_manager():
         # Adjust path to be relative to project root if needed, or let it be
         # If we use relative path, we assume CWD is project root
         return DatabaseManager('hackathons.db')
+
+
+_db = None
+_db_lock = threading.Lock()
+
+
+def get_db():
+    """
+    Shared database manager for this process, created on first use.
+
+    Connecting (and for TiDB, creating tables) only happens when something
+    actually needs the database, not when a module that may use it is imported.
+    """
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = get_database_manager()
+    return _db
+
+
+class LazyDatabase:
+    """Module-level stand-in for the shared manager; connects on first attribute access."""
+
+    def __getattr__(self, name):
+        return getattr(get_db(), name)
@@ -14,6 +14,8 @@ from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from .keyword_matcher import KeywordMatcher
+
 
 class EventMode(Enum):
     """Event participation modes."""
@@ -127,6 +129,8 @@ class DataNormalizer:
             "in-person", "in person", "onsite", "on-site", "offline",
             "physical", "venue", "campus"
         ]
+        self._online_matcher = KeywordMatcher(self.online_keywords)
+        self._in_person_matcher = KeywordMatcher(self.in_person_keywords)
         
         # Common tag mappings for normalization
         self.tag_mappings = {
@@ -330,6 +334,10 @@ class DataNormalizer:
         
         return location
     
+    def _mode_keywords_in(self, text: str) -> Tuple[bool, bool]:
+        """Whether ``text`` has online and in-person keywords (whole words)."""
+        return self._online_matcher.search(text), self._in_person_matcher.search(text)
+
     def _detect_mode(self, location: str, raw_data: Dict) -> str:
         """Detect if event is in-person, online, or hybrid."""
         # Check explicit mode field first (safely handle None)
@@ -353,8 +361,7 @@ class DataNormalizer:
         description_str = raw_data.get('description') or ''
         text_to_check = f"{location_str} {description_str}".lower()
         
-        has_online = any(kw in text_to_check for kw in self.online_keywords)
-        has_inperson = any(kw in text_to_check for kw in self.in_person_keywords)
+        has_online, has_inperson = self._mode_keywords_in(text_to_check)
         
         if has_online and has_inperson:
             return EventMode.HYBRID.value
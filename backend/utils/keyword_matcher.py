@@ -0,0 +1,176 @@
+"""
+Keyword Matcher
+===============
+Finds which of a set of keywords occur in a text, in a single pass.
+
+Tag extraction, theme detection, online/in-person mode detection and the
+search tag filters all used to loop over their keywords with one
+``kw in text.lower()`` substring scan each. That costs one pass over the
+text per keyword, and matches inside words: 'AR' in "hackathon", 'app' in
+"apply", 'ai' in "maintain".
+
+``KeywordMatcher`` compiles its keyword set into one alternation regex,
+factored as a trie so keywords sharing a prefix share its checks, and scans
+the lower-cased text once whatever the number of keywords. Matches are whole
+words, with ``\\b``-like boundaries except that ``_`` separates words too
+("ai_ml" has 'AI'). Keywords of several words ("machine learning",
+"in-person", "AR/VR") match with any punctuation or whitespace between their
+words, and a trailing plural "s" is accepted ("apps" for "app").
+
+The end of the word is checked by the regex; the start is checked on each
+match, because a leading assertion would keep ``re`` from skipping ahead to
+the first characters of the keywords. ``python main.py bench --keywords``
+times every workload against the old loops.
+
+Build a matcher once per keyword set and reuse it; it is immutable and
+safe to share between threads.
+"""
+
+import re
+import string
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Punctuation that splits a keyword into words; '+' and '#' stay part of words (C++, C#)
+_SEPARATORS = str.maketrans({c: ' ' for c in string.punctuation.replace('+', '').replace('#', '')
+                             + '“”‘’–—•…·«»'})
+
+_ALNUM = r'[^\W_]'
+# Between the words of a keyword
+_GAP = r'[\W_]+'
+
+
+def _words(text: str) -> List[str]:
+    return text.lower().translate(_SEPARATORS).split()
+
+
+def _trie_pattern(keys: List[str], plurals: bool) -> Tuple[str, List[int]]:
+    """
+    Alternation of ``keys`` (words joined by single spaces) factored as a trie.
+
+    An empty group marks where each key ends; returns the pattern and, per
+    group in pattern order, the index of its key in ``keys``.
+    """
+    root: Dict = {}
+    for index, key in enumerate(keys):
+        node = root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[None] = index
+
+    marks: List[int] = []
+
+    def build(node: Dict) -> str:
+        branches = []
+        for char in sorted(c for c in node if c is not None):
+            edge = _GAP if char == ' ' else re.escape(char)
+            branches.append(edge + build(node[char]))
+        if None in node:
+            # After the longer keys through this node ("web3" before "web")
+            index = node[None]
+            marks.append(index)
+            end = '()'
+            if keys[index][-1].isalnum():
+                end += ('s?' if plurals else '') + f'(?!{_ALNUM})'
+            branches.append(end)
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return build(root), marks
+
+
+def _contains(outer: List[str], inner: List[str], plurals: bool) -> bool:
+    """Whether the words ``inner`` occur as a run inside ``outer``."""
+    size = len(inner)
+    for start in range(len(outer) - size + 1):
+        run = outer[start:start + size]
+        if run == inner or (plurals and run[:-1] == inner[:-1] and run[-1] == inner[-1] + 's'):
+            return True
+    return False
+
+
+class KeywordMatcher:
+    """Whole-word matcher for a fixed keyword list."""
+
+    def __init__(self, keywords: Iterable[str], plurals: bool = True):
+        """
+        Args:
+            keywords: Keywords in priority order; results keep this order
+                      and spelling
+            plurals: Also match the keyword followed by "s" ("apps" for "app")
+        """
+        self.keywords: List[str] = []
+        split: List[List[str]] = []
+        seen = set()
+        for kw in keywords:
+            words = _words(kw)
+            key = ' '.join(words)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self.keywords.append(kw.strip())
+            split.append(words)
+
+        self._pattern = None
+        self._groups: List[int] = []     # keyword index of each end-marking group
+        if split:
+            pattern, self._groups = _trie_pattern([' '.join(words) for words in split], plurals)
+            self._pattern = re.compile(pattern, re.DOTALL)
+
+        # After a multi-word keyword the scan resumes at its second word, so
+        # keywords overlapping it are still found; the ones it contains that
+        # start at the same position are added from this table
+        self._resume = [len(words[0]) if len(words) > 1 else None for words in split]
+        self._inside = [
+            [j for j, inner in enumerate(split) if j != i and _contains(words, inner, plurals)]
+            if len(words) > 1 else []
+            for i, words in enumerate(split)
+        ]
+
+    def _matches(self, text: str):
+        """Indices of the keywords found in lower-cased ``text``, in text order."""
+        search = self._pattern.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                return
+            start = match.start()
+            if start and text[start].isalnum() and text[start - 1].isalnum():
+                pos = start + 1  # Inside a word; a keyword may still start further in
+                continue
+            index = self._groups[match.lastindex - 1]
+            yield index
+            resume = self._resume[index]
+            if resume is None:
+                pos = match.end()
+            else:
+                yield from self._inside[index]
+                pos = start + resume
+
+    def find_all(self, text: Optional[str], limit: Optional[int] = None) -> List[str]:
+        """
+        Keywords occurring in ``text``, in keyword-list order.
+
+        Args:
+            text: Text to scan (None or empty finds nothing)
+            limit: Return at most this many (the highest-priority ones)
+        """
+        if not text or self._pattern is None:
+            return []
+        found = set(self._matches(text.lower()))
+        return [self.keywords[i] for i in sorted(found)[:limit]]
+
+    def search(self, text: Optional[str]) -> bool:
+        """Whether any keyword occurs in ``text``."""
+        if not text or self._pattern is None:
+            return False
+        text = text.lower()
+        match = self._pattern.search(text)
+        if match is None:
+            return False
+        start = match.start()
+        if not (start and text[start].isalnum() and text[start - 1].isalnum()):
+            return True
+        return next(self._matches(text), None) is not None
+
+    def __repr__(self) -> str:
+        return f'KeywordMatcher({len(self.keywords)} keywords)'
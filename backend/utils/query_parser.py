@@ -8,6 +8,8 @@ import os
 import json
 from typing import Optional, Dict, Any
 
+from .keyword_matcher import KeywordMatcher
+
 # System prompt tuned for hackathon search intent parsing
 SYSTEM_PROMPT = """You are a hackathon search query parser. Convert user queries into structured filters.
 
@@ -103,29 +105,28 @@ def apply_filters_to_events(events: list, filters: Dict[str, Any]) -> list:
     
     # Filter by tags (any match)
     if filters.get("tags"):
-        search_tags = set(t.lower() for t in filters["tags"])
+        search_tags = KeywordMatcher(filters["tags"])
         def has_tag(event):
             event_tags = event.get("tags", [])
             if isinstance(event_tags, str):
                 event_tags = [event_tags]
-            event_tags_lower = set(t.lower() for t in event_tags if t)
             # Also check title and description
-            title = (event.get("title") or "").lower()
-            desc = (event.get("description") or "").lower()
-            text = f"{title} {desc} {' '.join(event_tags_lower)}"
-            return any(tag in text for tag in search_tags)
+            title = event.get("title") or ""
+            desc = event.get("description") or ""
+            text = f"{title} {desc} {' | '.join(t for t in event_tags if t)}"
+            return search_tags.search(text)
         result = [e for e in result if has_tag(e)]
     
     # Exclude tags
     if filters.get("exclude_tags"):
         exclude = set(t.lower() for t in filters["exclude_tags"])
+        exclude_in_title = KeywordMatcher(filters["exclude_tags"])
         def no_excluded_tag(event):
             event_tags = event.get("tags", [])
             if isinstance(event_tags, str):
                 event_tags = [event_tags]
             event_tags_lower = set(t.lower() for t in event_tags if t)
-            title = (event.get("title") or "").lower()
-            return not any(tag in title or tag in event_tags_lower for tag in exclude)
+            return not (exclude & event_tags_lower or exclude_in_title.search(event.get("title")))
         result = [e for e in result if no_excluded_tag(e)]
     
     # Filter by prize
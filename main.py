@@ -6,9 +6,20 @@ Main entry point for the hackathon aggregation system.
 Usage:
     python main.py scrape                    # Scrape all sites
     python main.py scrape --site mlh         # Scrape single site
-    python main.py scrape --tier tier_1      # Scrape high-priority sites
+    python main.py scrape --tier tier_1      # Scrape stale high-priority sites
+    python main.py scrape --daemon           # Keep scraping as sources go stale
+    python main.py scrape --budget 75m       # Fit the run into 75 minutes
+    python main.py scrape --shard 2/3        # Scrape shard 2 of 3 into data/staging
+    python main.py merge                     # Merge shard staging files into the database
+    python main.py scrape --resume           # Continue an interrupted run
+    python main.py renormalize               # Rebuild events from data/raw, offline
     python main.py search "AI hackathons"    # Search cached data
     python main.py stats                     # Show database statistics
+    python main.py list                      # Registered sources and tiers
+    python main.py scrape --record DIR       # Scrape and save fixtures
+    python main.py bench --fixtures DIR      # Time scrapers on fixtures, offline
+    python main.py bench --keywords          # Keyword matcher vs. substring loops
+    python main.py runs                      # Run history and regressions per source
     python main.py serve                     # Start web UI (coming soon)
 """
 
@@ -16,6 +27,7 @@ import argparse
 import sys
 import json
 import logging
+import time
 from pathlib import Path
 from typing import Optional, List
 
@@ -40,94 +52,190 @@ class HackFind:
     
     def __init__(self, config_path: str = "config/websites.json"):
         self.config_path = Path(config_path)
-        self.db = None
-        self.normalizer = None
+        self._normalizer = None
         self._initialize()
     
     def _initialize(self):
-        """Initialize components."""
-        from backend.database.tidb_manager import get_database_manager
-        from backend.utils.data_normalizer import DataNormalizer
-        
-        self.db = get_database_manager()  # Auto-selects TiDB or SQLite
-        self.normalizer = DataNormalizer()
-        
+        """Initialize components (the database connects on first use)."""
         # Load config for site list
         with open(self.config_path, 'r') as f:
             self.config = __import__('json').load(f)
         
         logger.info("HackFind initialized")
     
+    @property
+    def db(self):
+        """Shared database manager; TiDB or SQLite (USE_TIDB), connected on first use."""
+        from backend.database.tidb_manager import get_db
+        return get_db()
+    
+    @property
+    def normalizer(self):
+        if self._normalizer is None:
+            from backend.utils.data_normalizer import DataNormalizer
+            self._normalizer = DataNormalizer()
+        return self._normalizer
+    
     def scrape_site(self, site_key: str, force: bool = False) -> int:
         """
         Scrape a single site using scrape_all module.
         
         Args:
             site_key: Key from websites.json (e.g., "mlh", "devpost")
-            force: Force refresh even if cache is fresh
+            force: Re-fetch details even for unchanged listings
             
         Returns:
             Number of events scraped
         """
         logger.info(f"Scraping {site_key}...")
         
-        # Map site keys to scrape_all functions
-        from scraper.scrape_all import (
-            scrape_devpost, scrape_devfolio, scrape_unstop, scrape_mlh,
-            scrape_dorahacks, scrape_hackerearth, scrape_kaggle, scrape_devdisplay,
-            scrape_techgig, scrape_geeksforgeeks, scrape_hackquest, scrape_mycareernet,
-            scrape_hackculture, scrape_superteam
-        )
+        from scraper import registry
+        from scraper.orchestrator import SourceResult
+        from scraper.resource_blocking import browser_metrics
+        from scraper.telemetry import telemetry, source
         
-        scrapers = {
-            'devpost': scrape_devpost,
-            'devfolio': scrape_devfolio,
-            'unstop': scrape_unstop,
-            'mlh': scrape_mlh,
-            'dorahacks': scrape_dorahacks,
-            'hackerearth': scrape_hackerearth,
-            'kaggle': scrape_kaggle,
-            'devdisplay': scrape_devdisplay,
-            'techgig': scrape_techgig,
-            'geeksforgeeks': scrape_geeksforgeeks,
-            'hackquest': scrape_hackquest,
-            'mycareernet': scrape_mycareernet,
-            'hackculture': scrape_hackculture,
-            'superteam': scrape_superteam
-        }
+        try:
+            spec = registry.get(site_key)
+        except ValueError as e:
+            logger.error(str(e))
+            return 0
         
+        telemetry.reset()
+        result = SourceResult(key=site_key, method=spec.method)
+        start = time.monotonic()
         try:
-            if site_key in scrapers:
-                count = scrapers[site_key]()
-                logger.info(f"✓ {site_key}: {count} events")
-                return count if count else 0
-            else:
-                logger.error(f"Unknown site: {site_key}")
-                return 0
+            scrape = spec.job_func(force)
+            with source(site_key):
+                count = scrape()
+            from scraper.scrape_all import writer  # Shared writer the scrapers save through
+            writer.flush()
+            result.saved = count or 0
+            logger.info(f"✓ {site_key}: {count} events")
         except Exception as e:
+            result.status, result.error = 'error', str(e)
             logger.error(f"✗ {site_key}: {e}")
-            return 0
+        result.wall_time = time.monotonic() - start
+        telemetry.persist(self.db, [result], browser_metrics.snapshot())
+        return result.saved
     
-    def scrape_all(self, tier: Optional[str] = None, force: bool = False) -> dict:
+    def scrape_all(
+        self,
+        tier: Optional[str] = None,
+        force: bool = False,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        daemon: bool = False,
+        dry_run: bool = False,
+        budget: Optional[float] = None,
+        shard=None,
+        resume: bool = False
+    ) -> dict:
         """
-        Scrape all configured sites using scrape_all.main().
+        Scrape the sites whose data is stale, using scrape_all.main().
+        
+        Sources are picked and ordered by scraper/scheduler.py (TTL,
+        priority tier, historical cost per event).
         
         Args:
-            tier: Optional tier filter (ignored - uses scrape_all.main)
-            force: Force refresh (ignored)
+            tier: Only sources of this priority tier (name or prefix)
+            force: Scrape even fresh sources and re-fetch unchanged details
+            workers: Max sources scraped concurrently (default from config)
+            timeout: Per-source timeout in seconds (default from config)
+            daemon: Keep running, scraping each source as its TTL expires
+            dry_run: Only print the schedule
+            budget: Wall-clock budget per run in seconds; sources are started
+                    highest yield first and pre-empted to fit
+            shard: scraper.sharding.Shard; scrape only its share, into its
+                   staging database (merge() writes it to the main database)
+            resume: Continue the checkpoint of an interrupted run
             
         Returns:
             Dict with results
         """
-        from scraper.scrape_all import main as scrape_main
+        from scraper import registry
+        from scraper.scheduler import plan_sources, select_sources, print_plan, run_daemon
+        
+        def scrape_main(**kwargs):
+            from scraper.scrape_all import main
+            return main(**kwargs)
         
-        logger.info("Running full scrape via scrape_all.py...")
-        scrape_main()
+        keys = [spec.key for spec in registry.sources(full_run=True)]
+        if daemon and shard:
+            logger.error("--shard cannot be combined with --daemon (each run replaces the staging file)")
+            return {}
+        if daemon and resume:
+            logger.error("--resume cannot be combined with --daemon")
+            return {}
+        if daemon:
+            logger.info("Starting scrape scheduler daemon...")
+            run_daemon(self.db, keys, lambda due: scrape_main(
+                max_workers=workers, timeout=timeout, sources=due, budget_s=budget), tier=tier)
+            return {'total': self.db.get_statistics().get('total_events', 0)}
+        
+        plans = plan_sources(self.db, keys)
+        due = select_sources(plans, tier, force)
+        print_plan(plans)
+        if dry_run:
+            return {'due': due}
+        if not due:
+            logger.info("All sources are fresh, nothing to scrape (use --force to scrape anyway)")
+            return {'total': self.db.get_statistics().get('total_events', 0)}
+        
+        logger.info(f"Scraping {len(due)} stale source(s): {', '.join(due)}")
+        scrape_main(max_workers=workers, timeout=timeout, force=force, sources=due, budget_s=budget, shard=shard,
+                    resume=resume)
         
         # Return stats
         stats = self.db.get_statistics()
         return {'total': stats.get('total_events', 0)}
     
+    def merge(self, staging: Optional[str] = None, keep: bool = False) -> dict:
+        """
+        Merge shard staging databases into the main database.
+        
+        Args:
+            staging: Directory with shard-i-of-N.db files (default from config)
+            keep: Keep the staging files after merging
+            
+        Returns:
+            Merge counts (files, events, duplicates, touched, runs)
+        """
+        from scraper.sharding import merge, print_merge_report
+        
+        stats = merge(self.db, Path(staging) if staging else None, keep=keep)
+        if not stats['files']:
+            logger.warning("No shard staging files to merge")
+        else:
+            print_merge_report(stats)
+        return stats
+    
+    def renormalize(
+        self,
+        raw: Optional[str] = None,
+        sources: Optional[List[str]] = None,
+        workers: Optional[int] = None
+    ) -> dict:
+        """
+        Re-normalize the stored raw records and upsert the events, offline.
+        
+        Args:
+            raw: Raw store directory (default from config)
+            sources: Only these sources (raw store folder names)
+            workers: Normalizer processes (default: CPU count)
+            
+        Returns:
+            Counts (files, records, events, duplicates, failed, truncated)
+        """
+        from scraper.raw_store import renormalize, print_renormalize_report
+        
+        start = time.monotonic()
+        stats = renormalize(self.db, Path(raw) if raw else None, sources, workers)
+        if not stats['files']:
+            logger.warning("No raw records to re-normalize (they are stored by scrape runs)")
+        else:
+            print_renormalize_report(stats, time.monotonic() - start)
+        return stats
+    
     def search(
         self,
         query: str = "",
@@ -169,10 +277,17 @@ class HackFind:
     def get_stale_sources(self, max_age_hours: int = 6) -> List[str]:
         """Get sources that need refreshing."""
         return self.db.get_stale_sources(max_age_hours)
+    
+    def get_run_history(self, source: Optional[str] = None, limit: int = 500) -> List[dict]:
+        """Get scrape run telemetry, newest first."""
+        return self.db.get_scrape_runs(source, limit)
 
 
 def main():
     """CLI entry point."""
+    from scraper.budget import parse_duration
+    from scraper.sharding import Shard
+    
     parser = argparse.ArgumentParser(
         description="HackFind - Hackathon Aggregator",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -181,8 +296,15 @@ Examples:
     python main.py scrape                    # Scrape all sites
     python main.py scrape --site mlh         # Scrape single site
     python main.py scrape --tier tier_1_high_value
+    python main.py scrape --budget 75m
+    python main.py scrape --shard 1/3 && python main.py merge
+    python main.py scrape --resume
+    python main.py renormalize --sources Devpost Unstop
     python main.py search "AI hackathons"
     python main.py stats
+    python main.py scrape --record data/fixtures
+    python main.py bench --fixtures data/fixtures --repeat 3
+    python main.py runs --source devpost
         """
     )
     
@@ -192,7 +314,20 @@ Examples:
     scrape_parser = subparsers.add_parser('scrape', help='Scrape hackathon sites')
     scrape_parser.add_argument('--site', '-s', help='Specific site to scrape')
     scrape_parser.add_argument('--tier', '-t', help='Tier to scrape (tier_1_high_value, tier_2_medium, tier_3_low)')
-    scrape_parser.add_argument('--force', '-f', action='store_true', help='Force refresh')
+    scrape_parser.add_argument('--force', '-f', action='store_true', help='Scrape fresh sources too and re-fetch unchanged details')
+    scrape_parser.add_argument('--workers', '-w', type=int, help='Max sources scraped concurrently')
+    scrape_parser.add_argument('--timeout', type=float, help='Per-source timeout in seconds')
+    scrape_parser.add_argument('--daemon', action='store_true', help='Keep running; scrape each source when its TTL expires')
+    scrape_parser.add_argument('--dry-run', action='store_true', help='Show which sources are due and exit')
+    scrape_parser.add_argument('--budget', type=parse_duration,
+                               help='Wall-clock budget for the run, e.g. 75m or 4500 (highest-yield sources first)')
+    scrape_parser.add_argument('--shard', type=Shard.parse,
+                               help='Scrape shard i of N (e.g. 2/3) into a staging database; see "merge"')
+    scrape_parser.add_argument('--resume', action='store_true',
+                               help='Continue an interrupted run, skipping what it already saved')
+    fixture_group = scrape_parser.add_mutually_exclusive_group()
+    fixture_group.add_argument('--record', metavar='DIR', help='Save HTTP responses and page snapshots as fixtures')
+    fixture_group.add_argument('--replay', metavar='DIR', help='Serve requests and pages from fixtures (offline)')
     
     # Search command
     search_parser = subparsers.add_parser('search', help='Search hackathons')
@@ -213,6 +348,31 @@ Examples:
     stale_parser = subparsers.add_parser('stale', help='List sites needing refresh')
     stale_parser.add_argument('--hours', type=int, default=6, help='Max age in hours')
     
+    # Merge command
+    merge_parser = subparsers.add_parser('merge', help='Merge shard staging databases (scrape --shard) into the database')
+    merge_parser.add_argument('--staging', help='Directory with the shard-i-of-N.db files (default: data/staging)')
+    merge_parser.add_argument('--keep', action='store_true', help='Keep the staging files after merging')
+    
+    # Renormalize command
+    renorm_parser = subparsers.add_parser('renormalize',
+                                          help='Rebuild events from the stored raw records with the current normalizer')
+    renorm_parser.add_argument('--raw', help='Raw store directory (default: data/raw)')
+    renorm_parser.add_argument('--sources', '-s', nargs='+', help='Sources to re-normalize (default: all)')
+    renorm_parser.add_argument('--workers', '-w', type=int, help='Normalizer processes (default: CPU count)')
+    
+    # Runs command
+    runs_parser = subparsers.add_parser('runs', help='Show scrape run history and regressions')
+    runs_parser.add_argument('--source', '-s', help='Show every stored run of one source')
+    runs_parser.add_argument('--window', type=int, default=5, help='Previous runs to compare the latest with')
+    
+    # Bench command
+    bench_parser = subparsers.add_parser('bench', help='Time scrapers against recorded fixtures (offline)')
+    bench_parser.add_argument('--fixtures', default='data/fixtures', help='Fixture directory from scrape --record')
+    bench_parser.add_argument('--sources', '-s', nargs='+', help='Sources to benchmark (default: all)')
+    bench_parser.add_argument('--repeat', type=int, default=1, help='Runs per source (fastest is reported)')
+    bench_parser.add_argument('--keywords', action='store_true', help='Benchmark keyword matching on stored descriptions instead')
+    bench_parser.add_argument('--limit', type=int, default=5000, help='Descriptions to load for --keywords')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -224,10 +384,16 @@ Examples:
     
     # Execute command
     if args.command == 'scrape':
+        if args.record or args.replay:
+            from scraper import fixtures
+            fixtures.activate('record' if args.record else 'replay', args.record or args.replay)
+            # Record every detail page, not just the changed ones
+            args.force = args.force or bool(args.record)
         if args.site:
             app.scrape_site(args.site, args.force)
         else:
-            app.scrape_all(args.tier, args.force)
+            app.scrape_all(args.tier, args.force, args.workers, args.timeout, args.daemon, args.dry_run,
+                           args.budget, args.shard, args.resume)
     
     elif args.command == 'search':
         events, total = app.search(
@@ -269,12 +435,14 @@ Examples:
             print(f"    {mode}: {count}")
     
     elif args.command == 'list':
+        from scraper import registry
         print("\n📋 Available sites:")
-        for key in app.factory.available_sites:
-            config = app.factory.config['websites'][key]
-            print(f"  • {key}: {config['name']} [{config['difficulty']}]")
+        for spec in registry.sources():
+            config = app.config['websites'].get(spec.key, {})
+            extra = '' if spec.full_run else ', --site only'
+            print(f"  • {spec.key}: {spec.name} [{config.get('difficulty', '?')}, {spec.method}{extra}]")
         print(f"\n🎯 Priority tiers:")
-        for tier, sites in app.factory.priority_tiers.items():
+        for tier, sites in app.config.get('scraping_priority', {}).items():
             print(f"  {tier}: {', '.join(sites)}")
     
     elif args.command == 'stale':
@@ -285,6 +453,36 @@ Examples:
                 print(f"  • {source}")
         else:
             print(f"\n✓ All sources are fresh (<{args.hours}h old)")
+    
+    elif args.command == 'merge':
+        app.merge(args.staging, args.keep)
+    
+    elif args.command == 'renormalize':
+        app.renormalize(args.raw, args.sources, args.workers)
+    
+    elif args.command == 'runs':
+        from scraper.telemetry import print_runs_report, print_source_history
+        history = app.get_run_history(args.source)
+        if not history:
+            print("\nNo scrape runs recorded yet")
+        elif args.source:
+            print(f"\n📈 Run history for {args.source}:")
+            print_source_history(history)
+        else:
+            print("\n📈 Latest run per source (vs. median of previous runs):")
+            print_runs_report(history, window=args.window)
+    
+    elif args.command == 'bench':
+        if args.keywords:
+            from scraper.bench_keywords import bench, load_descriptions, print_keyword_report
+            texts = load_descriptions(app.db, args.limit)
+            if not texts:
+                print("\nNo stored descriptions to benchmark (run a scrape first)")
+            else:
+                print_keyword_report(bench(texts, max(3, args.repeat)), len(texts))
+        else:
+            from scraper.bench_scrapers import bench, print_bench_report
+            print_bench_report(bench(Path(args.fixtures), args.sources, args.repeat))
 
 
 if __name__ == "__main__":
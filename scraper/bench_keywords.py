@@ -0,0 +1,105 @@
+"""
+Keyword Matching Benchmark
+==========================
+Compares the compiled KeywordMatcher with the per-keyword substring loops
+it replaced, on the descriptions stored in the database::
+
+    python main.py bench --keywords [--limit 5000] [--repeat 3]
+
+Three workloads are timed (best of ``repeat``):
+
+- ``tags``    extract_tags_from_text (~30 tech keywords, first 10 kept)
+- ``themes``  theme detection on detail pages
+- ``mode``    DataNormalizer online / in-person detection, which runs on
+              every normalized event; the report warns if it got slower
+
+For each, the report shows how many texts got different keywords and which
+keywords the old loops found most often inside other words ('AR' in
+"hackathon", 'app' in "apply"): the false positives the matcher removes.
+"""
+import time
+from collections import Counter
+from typing import Callable, Dict, List
+
+from backend.utils.data_normalizer import DataNormalizer
+
+
+def _substring_loop(keywords: List[str], limit: int = None) -> Callable[[str], List[str]]:
+    """The previous implementation: one lower-cased substring scan per keyword."""
+    def find(text):
+        text_lower = text.lower()
+        found = []
+        for kw in keywords:
+            if kw.lower() in text_lower and kw not in found:
+                found.append(kw)
+                if limit and len(found) >= limit:
+                    break
+        return found
+    return find
+
+
+def load_descriptions(db, limit: int = 5000) -> List[str]:
+    """Title plus description of up to ``limit`` stored events."""
+    events, _ = db.query_events(page_size=limit)
+    return [f'{e.title or ""} {e.description or ""}'.strip() for e in events if e.description]
+
+
+def _time(func: Callable[[str], List[str]], texts: List[str], repeat: int):
+    best, results = None, None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        results = [func(t) for t in texts]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def bench(texts: List[str], repeat: int = 3) -> Dict[str, Dict]:
+    """
+    Time old loops against the compiled matchers.
+
+    Returns:
+        Dict of workload -> {'loops_s', 'matcher_s', 'changed', 'dropped'}
+    """
+    from scraper.scrape_all import TAG_KEYWORDS, THEME_KEYWORDS, keyword_matcher
+
+    normalizer = DataNormalizer()
+    mode_keywords = [('online', normalizer.online_keywords), ('in-person', normalizer.in_person_keywords)]
+    modes = [kind for kind, _ in mode_keywords]
+    workloads = {
+        'tags': (_substring_loop(TAG_KEYWORDS, 10),
+                 lambda t: keyword_matcher('tags').find_all(t, limit=10)),
+        'themes': (_substring_loop(THEME_KEYWORDS, 10),
+                   lambda t: keyword_matcher('themes').find_all(t, limit=10)),
+        'mode': (lambda t: [kind for kind, kws in mode_keywords if any(kw in t.lower() for kw in kws)],
+                 lambda t: [kind for kind, hit in zip(modes, normalizer._mode_keywords_in(t)) if hit]),
+    }
+
+    results = {}
+    for name, (loops, matcher) in workloads.items():
+        loops_s, old = _time(loops, texts, repeat)
+        matcher_s, new = _time(matcher, texts, repeat)
+        dropped = Counter()
+        changed = 0
+        for before, after in zip(old, new):
+            if set(before) != set(after):
+                changed += 1
+                dropped.update(set(before) - set(after))
+        results[name] = {'loops_s': loops_s, 'matcher_s': matcher_s, 'changed': changed, 'dropped': dropped}
+    return results
+
+
+def print_keyword_report(results: Dict[str, Dict], count: int):
+    """Timing and difference table."""
+    print(f'\n  {count} texts')
+    print(f'  {"Workload":<9} {"Loops":>9} {"Matcher":>9} {"Speedup":>8} {"Changed":>8}  Most dropped (substring-only hits)')
+    print('  ' + '-' * 90)
+    for name, r in results.items():
+        speedup = r['loops_s'] / r['matcher_s'] if r['matcher_s'] else 0
+        dropped = ', '.join(f'{kw} ×{n}' for kw, n in r['dropped'].most_common(4)) or '-'
+        print(f'  {name:<9} {r["loops_s"] * 1000:>7.0f}ms {r["matcher_s"] * 1000:>7.0f}ms '
+              f'{speedup:>7.1f}× {r["changed"]:>8}  {dropped}')
+    mode = results.get('mode')
+    if mode and mode['matcher_s'] > mode['loops_s'] * 1.1:
+        print(f'  ⚠ Mode detection (every normalized event) is slower than the old loops: '
+              f'{mode["matcher_s"] * 1000:.0f}ms vs {mode["loops_s"] * 1000:.0f}ms')
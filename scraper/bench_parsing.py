@@ -0,0 +1,127 @@
+"""
+Parsing Micro-Benchmark
+=======================
+Parse time and peak memory per source on saved sample pages.
+
+For every sample it compares:
+- ``html.parser``   full BeautifulSoup tree (the old behaviour)
+- ``lxml``          full tree with the lxml backend
+- ``lxml/partial``  the restricted tree the scraper now uses (if any)
+- ``get_text`` vs ``html_to_text`` for text extraction (clean_html)
+
+Samples are plain HTML files named ``<source>.html`` in data/samples/.
+``--fetch`` saves any that are missing, using HTTP or the browser pool
+depending on the source.
+
+Peak memory is the Python heap as seen by tracemalloc; libxml2's own C
+allocations are not included, so lxml variants read somewhat low.
+
+Usage:
+    python -m scraper.bench_parsing [--fetch] [--repeat 5] [--samples DIR]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+from bs4 import BeautifulSoup
+
+from scraper.parsing import ANCHORS, HEAD_META, html_to_text, make_soup
+
+DEFAULT_SAMPLES_DIR = Path(__file__).parent.parent / 'data' / 'samples'
+
+# source -> (sample URL, how it is fetched, restricted tree the scraper uses)
+SAMPLES = {
+    'mlh': ('https://mlh.io/seasons/2026/events', 'http', ANCHORS),
+    'mlh_enrichment': ('https://hackmit.org/', 'http', HEAD_META),
+    'hackculture': ('https://hackculture.io/challenges', 'browser', ANCHORS),
+    'techgig': ('https://engage.techgig.com/hackathons', 'browser', None),
+    'kaggle': ('https://www.kaggle.com/competitions', 'browser', None),
+}
+
+
+def fetch_samples(samples_dir: Path):
+    """Save sample pages that are not on disk yet."""
+    samples_dir.mkdir(parents=True, exist_ok=True)
+    for source, (url, method, _) in SAMPLES.items():
+        path = samples_dir / f'{source}.html'
+        if path.exists():
+            continue
+        try:
+            if method == 'browser':
+                from scraper.browser_pool import browser_page
+                with browser_page(source) as page:
+                    page.goto(url, wait_until='networkidle', timeout=60000)
+                    html = page.content()
+            else:
+                from scraper.fetcher import fetcher
+                html = fetcher.get(url, timeout=30).text
+            path.write_text(html, encoding='utf-8')
+            print(f'  saved {path.name} ({len(html) // 1024} KB)')
+        except Exception as e:
+            print(f'  could not fetch {source}: {e}')
+
+
+def measure(func: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """Best-of-N wall time (ms) and peak traced memory (MB) of func()."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best * 1000, peak / (1024 * 1024)
+
+
+def run(samples_dir: Path, repeat: int):
+    files = sorted(samples_dir.glob('*.html'))
+    if not files:
+        print(f'No samples in {samples_dir} (use --fetch)')
+        return
+
+    print(f'\n  {"Source":<24} {"Variant":<14} {"Time":>9} {"Peak":>9}')
+    print('  ' + '-' * 58)
+    for path in files:
+        html = path.read_text(encoding='utf-8', errors='replace')
+        only = SAMPLES.get(path.stem, (None, None, None))[2]
+        variants = [
+            ('html.parser', lambda: BeautifulSoup(html, 'html.parser')),
+            ('lxml', lambda: make_soup(html)),
+        ]
+        if only is not None:
+            variants.append(('lxml/partial', lambda: make_soup(html, only)))
+        variants += [
+            ('get_text', lambda: BeautifulSoup(html, 'html.parser').get_text(separator=' ', strip=True)),
+            ('html_to_text', lambda: html_to_text(html)),
+        ]
+
+        label = f'{path.stem} ({len(html) // 1024}K)'
+        for name, func in variants:
+            ms, mb = measure(func, repeat)
+            print(f'  {label:<24} {name:<14} {ms:>7.1f}ms {mb:>7.1f}MB')
+            label = ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parsing on saved sample pages')
+    parser.add_argument('--samples', type=Path, default=DEFAULT_SAMPLES_DIR, help='Sample directory')
+    parser.add_argument('--fetch', action='store_true', help='Download missing samples first')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per variant (best is kept)')
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_samples(args.samples)
+    run(args.samples, max(1, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,420 @@
+"""
+Shared Browser Pool
+===================
+Launches Chromium once per browser lane instead of once per source.
+
+Playwright's sync API is bound to the thread that started it, so browser
+scrapers run on a small fixed set of long-lived lane threads
+(``BrowserLanes``), each owning one ``BrowserPool``. Sources that run on the
+same lane share its browser and only pay for a new context.
+
+Each pool:
+- caps how many pages are open at once (``max_pages``)
+- hands out one context per checkout, so pages never share cookies
+- recycles a context after ``recycle_after`` navigations to bound memory
+- offers the stealth profile (desktop Chrome UA, 1366x768 viewport) used by
+  the DoraHacks and HackerEarth scrapers
+- blocks images, media, fonts and trackers per site (resource_blocking.py)
+
+With record/replay fixtures active (fixtures.py) pages are wrapped to
+record their snapshots, or replaced by ``ReplayPage`` without launching a
+browser at all.
+
+``crawl_tabs()`` spreads a list of detail pages over several tabs of a pool.
+
+Options live in ``browser_config.pool`` of config/websites.json.
+
+Scrapers just do::
+
+    with browser_page('dorahacks', stealth=True) as page:
+        page.goto(...)
+
+On a lane this uses the lane's pool; anywhere else (e.g. a single
+``main.py scrape -s kaggle``) a throwaway pool is launched for the call.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from queue import Queue
+from typing import Callable, Dict, Iterable, List, Optional
+
+from scraper import budget, fixtures, telemetry
+from scraper.resource_blocking import ResourceFilter, browser_metrics
+from scraper.settings import browser_pool_config
+
+DEFAULT_STEALTH = {
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'viewport': {'width': 1366, 'height': 768},
+    'device_scale_factor': 1,
+}
+
+# Pool owned by the current lane thread, if any
+_local = threading.local()
+
+
+class _PooledContext:
+    """A browser context plus its usage counters."""
+
+    def __init__(self, context, profile: str):
+        self.context = context
+        self.profile = profile
+        self.navigations = 0
+
+
+class BrowserPool:
+    """
+    One Chromium instance handing out isolated contexts.
+
+    Not thread-safe: a pool must only be used from the thread that created
+    it (a Playwright sync API restriction).
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        recycle_after: Optional[int] = None,
+        headless: Optional[bool] = None,
+        config: Optional[Dict] = None
+    ):
+        cfg = config if config is not None else browser_pool_config()
+        self.config = cfg
+        self.max_pages = max_pages or cfg.get('max_pages', 4)
+        self.recycle_after = recycle_after or cfg.get('recycle_after', 50)
+        self.headless = cfg.get('headless', True) if headless is None else headless
+        self.profiles = {
+            'default': {},
+            'stealth': cfg.get('stealth', DEFAULT_STEALTH),
+        }
+
+        self._playwright = None
+        self._browser = None
+        self._idle: Dict[str, List[_PooledContext]] = {}
+        self.open_pages = 0
+        self.stats = {'launches': 0, 'contexts': 0, 'recycled': 0, 'pages': 0}
+
+    def _ensure_browser(self):
+        """Launch Chromium on first use, or again if it crashed."""
+        if self._browser is not None and not self._browser.is_connected():
+            self._browser = None
+            self._idle.clear()
+        if self._browser is None:
+            if self._playwright is None:
+                from playwright.sync_api import sync_playwright
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+            self.stats['launches'] += 1
+        return self._browser
+
+    def _checkout(self, profile: str) -> _PooledContext:
+        browser = self._ensure_browser()
+        idle = self._idle.setdefault(profile, [])
+        if idle:
+            return idle.pop()
+        self.stats['contexts'] += 1
+        return _PooledContext(browser.new_context(**self.profiles[profile]), profile)
+
+    def _checkin(self, ctx: _PooledContext):
+        if ctx.navigations >= self.recycle_after or not self._browser:
+            self.stats['recycled'] += 1
+            try:
+                ctx.context.close()
+            except Exception:
+                pass
+        else:
+            self._idle.setdefault(ctx.profile, []).append(ctx)
+
+    @contextmanager
+    def page(self, site: Optional[str] = None, stealth: bool = False):
+        """
+        Open a page in its own context and close it on exit.
+
+        Args:
+            site: websites.json key; selects the resource allowlist and
+                  labels the page's transfer/load metrics
+            stealth: Use the stealth user agent / viewport profile
+
+        Raises:
+            RuntimeError: If ``max_pages`` pages are already open
+        """
+        if self.open_pages >= self.max_pages:
+            raise RuntimeError(f'Browser pool page limit reached ({self.max_pages} open)')
+
+        store = fixtures.active()
+        if store and store.replaying:
+            self.open_pages += 1
+            self.stats['pages'] += 1
+            try:
+                yield fixtures.ReplayPage(store, site)
+            finally:
+                self.open_pages -= 1
+            return
+
+        ctx = self._checkout('stealth' if stealth else 'default')
+        page = ctx.context.new_page()
+        page_stats = self._instrument(page, ctx, ResourceFilter(site, self.config))
+        self.open_pages += 1
+        self.stats['pages'] += 1
+        try:
+            yield fixtures.RecordingPage(page, store, site) if store else page
+        finally:
+            self.open_pages -= 1
+            try:
+                page.close()
+            except Exception:
+                pass
+            self._checkin(ctx)
+            browser_metrics.record(site or 'other', page_stats['mode'], page_stats)
+
+    def _instrument(self, page, ctx: _PooledContext, resource_filter: ResourceFilter) -> Dict:
+        """Attach blocking and metric listeners; returns the live stats dict."""
+        page_stats = {'mode': resource_filter.mode, 'requests': 0, 'blocked': 0,
+                      'bytes': 0, 'loads': 0, 'load_s': 0.0}
+        nav_started = [None]
+
+        def on_request(request):
+            page_stats['requests'] += 1
+            if request.is_navigation_request() and request.frame == page.main_frame:
+                nav_started[0] = time.monotonic()
+
+        def on_request_finished(request):
+            try:
+                sizes = request.sizes()
+                page_stats['bytes'] += sizes['responseBodySize'] + sizes['responseHeadersSize']
+            except Exception:
+                pass
+
+        def on_load(_):
+            if nav_started[0] is not None:
+                page_stats['loads'] += 1
+                page_stats['load_s'] += time.monotonic() - nav_started[0]
+                nav_started[0] = None
+
+        def on_navigated(frame):
+            if frame == page.main_frame:
+                ctx.navigations += 1
+
+        def route(route):
+            request = route.request
+            if resource_filter.blocks(request.resource_type, request.url):
+                page_stats['blocked'] += 1
+                route.abort()
+            else:
+                route.continue_()
+
+        if resource_filter.enabled:
+            page.route('**/*', route)
+        page.on('request', on_request)
+        page.on('requestfinished', on_request_finished)
+        page.on('load', on_load)
+        page.on('framenavigated', on_navigated)
+        return page_stats
+
+    def close(self):
+        """Close all contexts, the browser and the Playwright driver."""
+        for contexts in self._idle.values():
+            for ctx in contexts:
+                try:
+                    ctx.context.close()
+                except Exception:
+                    pass
+        self._idle.clear()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+@contextmanager
+def browser_pool():
+    """The current lane's pool, or a throwaway pool closed on exit."""
+    pool = getattr(_local, 'pool', None)
+    if pool is not None:
+        yield pool
+        return
+    pool = BrowserPool()
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+
+@contextmanager
+def browser_page(site: Optional[str] = None, stealth: bool = False):
+    """Open a page from the current lane's pool (see browser_pool())."""
+    with browser_pool() as pool:
+        with pool.page(site, stealth=stealth) as page:
+            yield page
+
+
+def crawl_tabs(
+    pool: BrowserPool,
+    items: Iterable,
+    url_of: Callable[[object], str],
+    handle: Callable[[object, Optional[str]], None],
+    tabs: int = 4,
+    site: Optional[str] = None,
+    wait_selector: Optional[str] = None,
+    selector_timeout_ms: int = 15000,
+    nav_timeout_ms: int = 30000
+):
+    """
+    Visit many pages across several tabs of one pool.
+
+    The sync API can only wait on one page at a time, but the browser loads
+    all tabs concurrently: every tab's navigation is started (returning at
+    response commit) and tabs are then drained in order, so the others keep
+    loading while we wait on one. A drained tab immediately starts on the
+    next item. No new items are started once the source's run-budget slice
+    is used up (see budget.py); tabs already loading are still handled.
+
+    Args:
+        pool: Pool to open tabs from (capped by its free page slots)
+        items: Work items, e.g. dicts with a URL
+        url_of: Returns the URL for an item
+        handle: Called as handle(item, html); html is None if navigation failed
+        tabs: Tabs to use
+        site: websites.json key for resource blocking and metrics
+        wait_selector: Selector that marks the content as rendered; on
+                       timeout the page is handed over as it is
+        selector_timeout_ms: Max wait for ``wait_selector``
+        nav_timeout_ms: Max wait for the navigation to commit
+    """
+    items = iter(items)
+    inflight = deque()
+
+    def start(page) -> bool:
+        if budget.expired():
+            return False
+        item = next(items, None)
+        if item is None:
+            return False
+        try:
+            page.goto(url_of(item), wait_until='commit', timeout=nav_timeout_ms)
+            inflight.append((page, item, True))
+        except Exception:
+            inflight.append((page, item, False))
+        return True
+
+    with ExitStack() as stack:
+        tabs = max(1, min(tabs, pool.max_pages - pool.open_pages))
+        for _ in range(tabs):
+            page = stack.enter_context(pool.page(site))
+            if not start(page):
+                break
+
+        while inflight:
+            page, item, navigated = inflight.popleft()
+            html = None
+            if navigated:
+                try:
+                    if wait_selector:
+                        page.wait_for_selector(wait_selector, timeout=selector_timeout_ms)
+                    else:
+                        page.wait_for_load_state('domcontentloaded', timeout=selector_timeout_ms)
+                except Exception:
+                    pass  # Slow or unusual page: parse whatever has rendered
+                try:
+                    html = page.content()
+                except Exception:
+                    html = None
+            handle(item, html)
+            start(page)
+
+
+class BrowserLanes:
+    """
+    Fixed set of daemon threads that each own a BrowserPool.
+
+    Jobs are taken from a shared queue, so a lane stuck on a slow source
+    does not hold up the others. Browsers are launched lazily, so an idle
+    lane costs nothing. A lane whose job was given up on (``cancel()``) is
+    replaced right away; the stuck thread exits once its job returns.
+    """
+
+    def __init__(self, lanes: int, **pool_kwargs):
+        self.lanes = max(1, lanes)
+        self._pool_kwargs = pool_kwargs
+        self._queue: Queue = Queue()
+        self._stats_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._running: Dict[Future, threading.Thread] = {}
+        self._retired = set()
+        self._serial = self.lanes
+        self.stats = {'launches': 0, 'contexts': 0, 'recycled': 0, 'pages': 0}
+        self._threads = [
+            threading.Thread(target=self._work, name=f'browser-lane-{i}', daemon=True)
+            for i in range(self.lanes)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, func: Callable, source: Optional[str] = None) -> Future:
+        """Run ``func()`` on the next free lane, attributed to ``source``."""
+        future = Future()
+        self._queue.put((func, source, future))
+        return future
+
+    def cancel(self, future: Future):
+        """Give up on a job: drop it if still queued, else replace the lane running it."""
+        if future.cancel():
+            return
+        with self._lock:
+            thread = self._running.get(future)
+            if thread is None or thread in self._retired:
+                return
+            self._retired.add(thread)
+            self._threads.remove(thread)
+            replacement = threading.Thread(target=self._work, name=f'browser-lane-{self._serial}', daemon=True)
+            self._serial += 1
+            self._threads.append(replacement)
+        replacement.start()
+
+    def _work(self):
+        me = threading.current_thread()
+        pool = BrowserPool(**self._pool_kwargs)
+        _local.pool = pool
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                func, source, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                with self._lock:
+                    self._running[future] = me
+                try:
+                    with telemetry.source(source):
+                        future.set_result(func())
+                except BaseException as e:
+                    future.set_exception(e)
+                with self._lock:
+                    del self._running[future]
+                    if me in self._retired:
+                        break  # A replacement lane took over while this job ran
+        finally:
+            _local.pool = None
+            pool.close()
+            with self._stats_lock:
+                for k, v in pool.stats.items():
+                    self.stats[k] += v
+
+    def close(self, timeout: float = 30):
+        """Stop the lanes once their current job is done and close browsers."""
+        with self._lock:
+            threads = list(self._threads)
+        for _ in threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
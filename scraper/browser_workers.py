@@ -0,0 +1,392 @@
+"""
+Browser Worker Processes
+========================
+Runs browser scrapers in separate processes instead of lane threads.
+
+A hung ``page.goto`` or a Chromium memory blow-up inside the main process
+can stall or kill the whole run, HTTP sources and database writer included.
+``BrowserProcessPool`` has the same ``submit()`` / ``close()`` / ``stats``
+interface as ``BrowserLanes`` but each lane is a worker process that:
+
+- owns one BrowserPool for all the jobs it runs (browser launched once)
+- sends the events its scrapers save back to the parent over a queue; the
+  parent hands them to its EventWriter, so only the parent touches the DB
+- reports its browser metrics and telemetry with each finished job
+- gets the source's run-budget deadline with each job (see budget.py)
+- stores the raw records of its scrapers in its own part of the run's
+  raw files (see raw_store.py)
+
+The parent supervises the workers and kills (with their Chromium children)
+and restarts any worker that:
+
+- exits unexpectedly (crash, OOM kill)
+- runs one job longer than ``job_timeout_s``
+- runs a job the orchestrator gave up on (``cancel()``)
+- uses more than ``worker_memory_mb`` of resident memory, including its
+  browser processes (Linux only; read from /proc)
+
+The job fails with an error and the next job gets a fresh worker.
+
+Options live in ``browser_config.pool`` of config/websites.json::
+
+    "isolation": "process", "worker_memory_mb": 1536, "job_timeout_s": null
+
+``job_timeout_s: null`` uses the run's per-source timeout; ``"isolation":
+"thread"`` goes back to in-process BrowserLanes.
+"""
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from queue import Empty
+from typing import Callable, Dict, List, Optional
+
+from scraper import budget, fixtures, raw_store, telemetry as run_telemetry
+from scraper.resource_blocking import browser_metrics
+
+_POOL_STATS = ('launches', 'contexts', 'recycled', 'pages')
+_EVENT_BATCH = 50
+
+
+# ---- Worker side ----
+
+class _QueueWriter:
+    """EventWriter stand-in inside a worker: ships events to the parent."""
+
+    def __init__(self, results):
+        self.results = results
+        self.job_id = None
+        self._buffer: List = []
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'failed': 0}
+
+    def save(self, event) -> bool:
+        self._buffer.append(event)
+        self.stats['queued'] += 1
+        if len(self._buffer) >= _EVENT_BATCH:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        batch, self._buffer = self._buffer, []
+        if batch:
+            self.results.put(('events', self.job_id, batch))
+            self.stats['batches'] += 1
+        return len(batch)
+
+
+def _worker_main(tasks, results, pool_kwargs: Dict, fixture_cfg, raw_cfg):
+    """Entry point of a worker process: run jobs until told to stop."""
+    if hasattr(os, 'setsid'):
+        os.setsid()  # Own process group, so the parent can kill us with our browser
+    if fixture_cfg:
+        fixtures.activate(*fixture_cfg)
+    if raw_cfg:
+        raw_store.activate(raw_store.RawStore(*raw_cfg))
+
+    from scraper import browser_pool, scrape_all
+    writer = _QueueWriter(results)
+    scrape_all.writer = writer
+
+    pool = browser_pool.BrowserPool(**pool_kwargs)
+    browser_pool._local.pool = pool
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            job_id, func, source, deadline = task
+            writer.job_id = job_id
+            budget.reset()
+            if source:
+                budget.set_deadline(source, deadline)
+            run_telemetry.telemetry.reset()
+            browser_metrics.reset()
+            error, saved = None, 0
+            try:
+                with run_telemetry.source(source):
+                    saved = func() or 0
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+            writer.flush()
+            if raw_store.active():
+                raw_store.active().flush()
+            results.put(('done', job_id, saved, error, browser_metrics.snapshot(),
+                         run_telemetry.telemetry.snapshot(), dict(pool.stats)))
+    finally:
+        pool.close()
+        raw_store.close()
+
+
+# ---- Parent side ----
+
+def _process_tree(pid: int) -> List[int]:
+    """pid and all its descendants (Linux /proc); just [pid] elsewhere."""
+    children: Dict[int, List[int]] = {}
+    try:
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat', 'rb') as f:
+                    # Field 4 is the parent pid; comm (field 2) may contain spaces
+                    ppid = int(f.read().rsplit(b')', 1)[1].split()[1])
+            except (OSError, ValueError, IndexError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    except OSError:
+        return [pid]
+
+    tree, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        tree.append(p)
+        stack.extend(children.get(p, []))
+    return tree
+
+
+def _tree_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process and its descendants, or None if unknown."""
+    if not os.path.isdir('/proc'):
+        return None
+    page = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    for p in _process_tree(pid):
+        try:
+            with open(f'/proc/{p}/statm', 'rb') as f:
+                total += int(f.read().split()[1]) * page
+        except (OSError, ValueError, IndexError):
+            pass
+    return total / (1024 * 1024)
+
+
+def _kill_tree(process):
+    """Kill a worker, its process group and any browser it launched."""
+    pid = process.pid
+    if pid is None:
+        return
+    if hasattr(os, 'killpg'):
+        for p in reversed(_process_tree(pid)):
+            try:
+                os.kill(p, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    else:
+        process.kill()
+    process.join(5)
+
+
+class _Job:
+    def __init__(self, job_id: int, func: Callable, source: Optional[str]):
+        self.id = job_id
+        self.func = func
+        self.source = source
+        self.future = Future()
+        self.started = None
+        self.cancelled = False
+
+
+class _Worker:
+    def __init__(self, ctx, results, pool_kwargs: Dict, fixture_cfg, raw_cfg, serial: int):
+        self.serial = serial
+        self.tasks = ctx.Queue()
+        self.process = ctx.Process(
+            target=_worker_main, args=(self.tasks, results, pool_kwargs, fixture_cfg, raw_cfg),
+            name=f'browser-worker-{serial}', daemon=True
+        )
+        self.process.start()
+        self.job: Optional[_Job] = None
+
+
+class BrowserProcessPool:
+    """
+    Fixed number of supervised worker processes running browser jobs.
+
+    ``submit(func, source)`` takes a picklable callable (a module-level
+    scraper function or a partial of one) and returns a Future with the
+    number of events it saved. Saved events are passed to ``sink`` in the
+    parent as they arrive.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        sink: Callable,
+        job_timeout: Optional[float] = None,
+        memory_mb: Optional[float] = None,
+        **pool_kwargs
+    ):
+        self.lanes = max(1, workers)
+        self.sink = sink
+        self.job_timeout = job_timeout
+        self.memory_mb = memory_mb
+        self._pool_kwargs = pool_kwargs
+        store = fixtures.active()
+        self._fixture_cfg = (store.mode, str(store.path)) if store else None
+        raw = raw_store.active()
+        self._raw_cfg = (str(raw.path), raw.run_id, raw.flush_every_s) if raw else None
+
+        self._ctx = multiprocessing.get_context('spawn')  # no forking a threaded parent
+        self._results = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self._pending: deque = deque()
+        self._jobs: Dict[int, _Job] = {}
+        self._next_id = 0
+        self._serial = 0
+        self._closing = False
+        self._worker_stats: Dict[int, Dict] = {}
+        self.stats = {name: 0 for name in _POOL_STATS}
+        self.stats['restarts'] = 0
+
+        self._workers = [self._spawn() for _ in range(self.lanes)]
+        self._supervisor = threading.Thread(target=self._supervise, name='browser-supervisor', daemon=True)
+        self._supervisor.start()
+
+    def _spawn(self) -> _Worker:
+        self._serial += 1
+        return _Worker(self._ctx, self._results, self._pool_kwargs, self._fixture_cfg, self._raw_cfg, self._serial)
+
+    def submit(self, func: Callable, source: Optional[str] = None) -> Future:
+        """Queue ``func()`` for the next free worker."""
+        with self._lock:
+            self._next_id += 1
+            job = _Job(self._next_id, func, source)
+            self._jobs[job.id] = job
+            self._pending.append(job)
+        return job.future
+
+    def cancel(self, future: Future):
+        """Give up on a job: drop it if still queued, else kill and replace its worker."""
+        with self._lock:
+            job = next((j for j in self._jobs.values() if j.future is future), None)
+            if job is None:
+                return
+            if job in self._pending:
+                self._pending.remove(job)
+                self._jobs.pop(job.id, None)
+                future.cancel()
+                return
+            job.cancelled = True  # The supervisor kills its worker on its next check
+
+    # ---- Supervisor thread ----
+
+    def _supervise(self):
+        while True:
+            try:
+                message = self._results.get(timeout=0.5)
+            except Empty:
+                message = None
+            except (EOFError, OSError):
+                break
+            if message:
+                self._handle(message)
+            self._check_workers()
+            self._dispatch()
+            with self._lock:
+                if self._closing and not self._jobs:
+                    break
+
+    def _handle(self, message):
+        kind, job_id = message[0], message[1]
+        job = self._jobs.get(job_id)
+        if job is None:
+            return  # Job of a worker we already killed
+
+        if kind == 'events':
+            with run_telemetry.source(job.source):
+                for event in message[2]:
+                    try:
+                        self.sink(event)
+                    except Exception as e:
+                        print(f'  ⚠ Could not queue event from {job.source}: {e}')
+            return
+
+        _, _, saved, error, metrics, telemetry_snapshot, pool_stats = message
+        browser_metrics.merge(metrics)
+        run_telemetry.telemetry.merge(telemetry_snapshot)
+        worker = next((w for w in self._workers if w.job is job), None)
+        if worker:
+            self._worker_stats[worker.serial] = pool_stats
+            worker.job = None
+        self._finish(job, error=RuntimeError(error) if error else None, result=saved)
+
+    def _finish(self, job: _Job, error: Optional[BaseException] = None, result=None):
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def _check_workers(self):
+        for i, worker in enumerate(self._workers):
+            job = worker.job
+            reason = None
+            if not worker.process.is_alive():
+                reason = f'browser worker crashed (exit code {worker.process.exitcode})'
+            elif job and job.cancelled:
+                reason = 'source timed out, browser worker stopped'
+            elif job and self.job_timeout and time.monotonic() - job.started > self.job_timeout:
+                reason = f'browser worker killed after {self.job_timeout:g}s'
+            elif job and self.memory_mb:
+                rss = _tree_rss_mb(worker.process.pid)
+                if rss is not None and rss > self.memory_mb:
+                    reason = f'browser worker killed at {rss:.0f} MB (limit {self.memory_mb:g} MB)'
+
+            if reason is None:
+                continue
+            if job:
+                print(f'  ⚠ {job.source}: {reason}; restarting worker')
+            _kill_tree(worker.process)
+            if job:
+                self._finish(job, error=RuntimeError(reason))
+            with self._lock:
+                closing = self._closing
+            if not closing:
+                self._workers[i] = self._spawn()
+                self.stats['restarts'] += 1
+
+    def _dispatch(self):
+        for worker in self._workers:
+            if worker.job is not None or not worker.process.is_alive():
+                continue
+            with self._lock:
+                if not self._pending:
+                    return
+                job = self._pending.popleft()
+            job.started = time.monotonic()
+            worker.job = job
+            worker.tasks.put((job.id, job.func, job.source, budget.deadline(job.source) if job.source else None))
+
+    # ---- Shutdown ----
+
+    def close(self, timeout: float = 30):
+        """Let running jobs finish (up to ``timeout``), then stop all workers."""
+        with self._lock:
+            self._closing = True
+            for job in self._pending:
+                job.future.cancel()
+                self._jobs.pop(job.id, None)
+            self._pending.clear()
+        self._supervisor.join(timeout)
+
+        deadline = time.monotonic() + 5
+        for worker in self._workers:
+            try:
+                worker.tasks.put(None)
+            except (OSError, ValueError):
+                pass
+        for worker in self._workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                _kill_tree(worker.process)
+
+        for pool_stats in self._worker_stats.values():
+            for name in _POOL_STATS:
+                self.stats[name] += pool_stats.get(name, 0)
@@ -0,0 +1,192 @@
+"""
+Time-Budgeted Runs
+==================
+Fits a scrape into a fixed wall-clock budget (``--budget 75m``).
+
+The scheduled GitHub Actions job is killed after 90 minutes. Without a
+budget, one hanging browser source could use up that time before the
+sources started after it ever ran. With a budget:
+
+- sources are started in order of their historical yield (saved events per
+  second, from ``scrape_runs``), so the most productive ones go first
+- each source gets a time slice: its median wall time × ``headroom``, at
+  least ``min_slice_s``, ``default_slice_s`` if it has no history, and
+  never past the end of the run
+- a source that uses up its slice is pre-empted: the scraper loops check
+  ``expired()`` between pages, detail fetches and scrolls and wind down,
+  keeping every event saved so far (status "preempted")
+- a source that does not stop within ``grace_s`` of its slice is abandoned
+  like a timeout (``abandon()``); the events it saved until then are
+  written, anything it still saves afterwards is dropped (see writer.py)
+- sources that cannot get ``min_slice_s`` before the end of the run are not
+  started (status "skipped") and stay due for the next run
+
+Deadlines are wall-clock (``time.time()``) per source key, so browser
+worker processes (see browser_workers.py) can be handed them too.
+
+Options live in ``scrape_run.budget`` of config/websites.json::
+
+    "budget": {"headroom": 1.5, "min_slice_s": 60, "default_slice_s": 600, "grace_s": 30}
+"""
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Dict, List, Optional, Set, Tuple
+
+from scraper.settings import run_config
+from scraper.telemetry import current_source
+
+_deadlines: Dict[str, float] = {}
+_abandoned: Set[str] = set()
+_lock = threading.Lock()
+
+
+def budget_config() -> Dict:
+    return run_config().get('budget', {})
+
+
+def parse_duration(text: str) -> float:
+    """Seconds in "4500", "75m", "1.5h" or "90s"."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*', str(text).lower())
+    if not match:
+        raise ValueError(f"Invalid duration '{text}' (e.g. 4500, 75m, 1.5h)")
+    return float(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+
+
+# ---- Per-source deadlines ----
+
+def set_deadline(key: str, at: Optional[float]):
+    """Give ``key`` until ``at`` (epoch seconds); None removes its deadline."""
+    with _lock:
+        if at is None:
+            _deadlines.pop(key, None)
+        else:
+            _deadlines[key] = at
+
+
+def deadline(key: Optional[str] = None) -> Optional[float]:
+    """Deadline of ``key`` (default: the current thread's source), if any."""
+    key = key or current_source()
+    return _deadlines.get(key) if key else None
+
+
+def remaining(key: Optional[str] = None) -> Optional[float]:
+    """Seconds left in the source's slice (None = unlimited)."""
+    at = deadline(key)
+    return None if at is None else at - time.time()
+
+
+def expired(key: Optional[str] = None) -> bool:
+    """Whether the source has used up its slice; scraper loops stop when it has."""
+    left = remaining(key)
+    return left is not None and left <= 0
+
+
+def abandon(key: str):
+    """Give up on ``key`` (timeout): its deadline passes now and what it still saves is dropped."""
+    with _lock:
+        _deadlines[key] = time.time()
+        _abandoned.add(key)
+
+
+def abandoned(key: Optional[str] = None) -> bool:
+    """Whether the source (default: the current thread's) was given up on."""
+    key = key or current_source()
+    return key in _abandoned if key else False
+
+
+def reset():
+    """Forget all deadlines (start of a run)."""
+    with _lock:
+        _deadlines.clear()
+        _abandoned.clear()
+
+
+# ---- Planning ----
+
+def typical_wall_time(runs: List[Dict], window: int = 5) -> Optional[float]:
+    """Median wall time of the last successful runs."""
+    times = [r['wall_s'] for r in runs if r.get('status') == 'ok'][:window]
+    return median(times) if times else None
+
+
+def events_per_second(runs: List[Dict], window: int = 5) -> Optional[float]:
+    """Median yield of the last completed (ok or pre-empted) runs."""
+    rates = [r['saved'] / r['wall_s'] for r in runs
+             if r.get('status') in ('ok', 'preempted') and r.get('wall_s')][:window]
+    return median(rates) if rates else None
+
+
+@dataclass
+class RunBudget:
+    """Deadline of a run and the time slice of each source in it."""
+    total_s: float
+    slices: Dict[str, float]
+    min_slice_s: float = 60
+    grace_s: float = 30
+    started: float = field(default_factory=time.time)
+
+    @property
+    def ends_at(self) -> float:
+        return self.started + self.total_s
+
+    def left(self) -> float:
+        return self.ends_at - time.time()
+
+    def start_slice(self, key: str) -> Optional[float]:
+        """
+        Slice for a source starting now, and set its deadline.
+
+        Returns:
+            Seconds the source may run, or None if the run has too little
+            time left to start it
+        """
+        # Keep the grace period inside the run deadline
+        available = self.left() - self.grace_s
+        if available < self.min_slice_s:
+            return None
+        slice_s = min(self.slices.get(key, available), available)
+        set_deadline(key, time.time() + slice_s)
+        return slice_s
+
+
+def plan_budget(db, keys: List[str], total_s: float) -> Tuple[List[str], RunBudget]:
+    """
+    Order sources by yield and give each a time slice.
+
+    Args:
+        db: Database manager with the scrape_runs history
+        keys: Sources to run
+        total_s: Wall-clock budget of the whole run
+
+    Returns:
+        (keys in start order, RunBudget)
+    """
+    cfg = budget_config()
+    headroom = cfg.get('headroom', 1.5)
+    min_slice = cfg.get('min_slice_s', 60)
+    default_slice = cfg.get('default_slice_s', 600)
+    try:
+        history = db.get_scrape_runs(limit=50 * max(1, len(keys)))
+    except Exception:
+        history = []
+
+    slices, rates = {}, {}
+    for key in keys:
+        runs = [r for r in history if r['source'] == key]
+        typical = typical_wall_time(runs)
+        slices[key] = min(total_s, max(min_slice, typical * headroom) if typical else default_slice)
+        rates[key] = events_per_second(runs)
+
+    # Highest yield first; sources without history last (stable within ties)
+    order = sorted(keys, key=lambda k: (rates[k] is None, -(rates[k] or 0)))
+    budget = RunBudget(total_s, slices, min_slice_s=min_slice, grace_s=cfg.get('grace_s', 30))
+    return order, budget
+
+
+def print_budget_plan(order: List[str], budget: RunBudget):
+    """Start order and slice of each source."""
+    print(f'\n  Budget {budget.total_s / 60:.0f} min, highest yield first:')
+    print('  ' + ', '.join(f'{key} ({budget.slices[key] / 60:.1f}m)' for key in order))
@@ -0,0 +1,176 @@
+"""
+Scrape Checkpoints
+==================
+Records a run's progress so an interrupted run can be resumed (``--resume``).
+
+When a run dies midway (e.g. the CI job is killed during the Kaggle
+browser step), the next run used to start over and fetch every Devpost
+and Unstop detail page again. Every run now checkpoints:
+
+- each event the writer has persisted (source, event ID), recorded when
+  its batch is flushed, so a checkpointed event is always in the database;
+  the last one per source is that source's cursor
+- each source that finished successfully, once its events are flushed
+
+A ``--resume`` run picks up the unfinished run's checkpoint:
+
+- finished sources are not run again (their freshness is still recorded)
+- the incremental sources (Devpost, Devfolio, Unstop) skip the listings
+  whose events were already persisted, without fetching their details
+  (see incremental.py); their fingerprints are stored at the end as usual
+
+Listing pages themselves are walked again: page contents shift between
+runs as events are added, so only event IDs are a safe resume point. A
+listing page costs one request for 50-100 events; the detail requests
+skipped are one per event.
+
+A run without ``--resume`` starts a new checkpoint; a run that completes
+clears it. Checkpoints live in a local SQLite file (``scrape_run.checkpoint.path``,
+default ``.cache/checkpoint.db``, one per shard), not in the main database,
+so recording them costs no network round trips.
+
+In CI (.github/workflows/scrape.yml) every attempt of a shard job caches
+its checkpoint and staging database, even when the scraper step is killed;
+a rerun of the job restores them and runs with ``--resume``.
+"""
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from scraper.settings import run_config
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def checkpoint_path(shard=None) -> Path:
+    """Checkpoint file of this process (one per shard)."""
+    path = PROJECT_ROOT / run_config().get('checkpoint', {}).get('path', '.cache/checkpoint.db')
+    if shard:
+        path = path.with_name(f'{path.stem}-shard-{shard.index}-of-{shard.count}{path.suffix}')
+    return path
+
+
+class Checkpoint:
+    """Progress of the current run in a local SQLite file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.run_id: Optional[str] = None
+        self.resumed = False
+        self._persisted: Set[str] = set()   # Event IDs saved by the run being resumed
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS checkpoint_run (
+                    run_id TEXT PRIMARY KEY,
+                    started_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS checkpoint_sources (
+                    source TEXT PRIMARY KEY,
+                    saved INTEGER DEFAULT 0,
+                    finished_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS checkpoint_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT,
+                    event_id TEXT NOT NULL
+                );
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _execute(self, sql: str, params: Iterable = (), many: bool = False):
+        with self._lock, closing(self._connect()) as conn, conn:
+            if many:
+                conn.executemany(sql, params)
+            else:
+                return conn.execute(sql, tuple(params)).fetchall()
+
+    def start(self, resume: bool = False) -> bool:
+        """
+        Begin a run.
+
+        Args:
+            resume: Continue the unfinished run's checkpoint if there is one
+
+        Returns:
+            True if an unfinished run is being resumed
+        """
+        previous = self._execute("SELECT run_id FROM checkpoint_run")
+        if resume and previous:
+            self.run_id = previous[0]['run_id']
+            self.resumed = True
+            self._persisted = {row['event_id'] for row in self._execute("SELECT event_id FROM checkpoint_events")}
+            return True
+        self.clear()
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.resumed = False
+        self._execute("INSERT INTO checkpoint_run (run_id, started_at) VALUES (?, ?)",
+                      (self.run_id, datetime.now().isoformat(timespec='seconds')))
+        return False
+
+    def record_events(self, events: Iterable[Tuple[Optional[str], str]]):
+        """Mark (source, event ID) pairs as persisted (called after a flush)."""
+        self._execute("INSERT INTO checkpoint_events (source, event_id) VALUES (?, ?)", events, many=True)
+
+    def finish_source(self, source: str, saved: int):
+        """Mark a source as done; its events must already be flushed."""
+        self._execute("INSERT OR REPLACE INTO checkpoint_sources (source, saved, finished_at) VALUES (?, ?, ?)",
+                      (source, saved, datetime.now().isoformat(timespec='seconds')))
+
+    def finished_sources(self) -> Dict[str, int]:
+        """Sources done in this run (or the run being resumed), with events saved."""
+        return {row['source']: row['saved'] for row in self._execute("SELECT source, saved FROM checkpoint_sources")}
+
+    def persisted(self, event_id: str) -> bool:
+        """Whether the run being resumed already saved ``event_id``."""
+        return event_id in self._persisted
+
+    def cursors(self) -> Dict[str, Dict]:
+        """Per source: events persisted and the last one (its cursor)."""
+        rows = self._execute("""
+            SELECT source, COUNT(*) AS events, MAX(seq) AS last_seq FROM checkpoint_events GROUP BY source
+        """)
+        last = {row['seq']: row['event_id'] for row in self._execute(
+            "SELECT seq, event_id FROM checkpoint_events WHERE seq IN (SELECT MAX(seq) FROM checkpoint_events GROUP BY source)")}
+        return {row['source']: {'events': row['events'], 'last': last.get(row['last_seq'])} for row in rows}
+
+    def clear(self):
+        """Forget the run (it completed, or a new one starts)."""
+        for table in ('checkpoint_run', 'checkpoint_sources', 'checkpoint_events'):
+            self._execute(f"DELETE FROM {table}")
+        self._persisted = set()
+
+
+# Checkpoint of the run in progress in this process, if any
+_active: Optional[Checkpoint] = None
+
+
+def activate(checkpoint: Optional[Checkpoint]):
+    global _active
+    _active = checkpoint
+
+
+def persisted(event_id: str) -> bool:
+    """Whether the run being resumed already saved ``event_id`` (False when not resuming)."""
+    return _active is not None and _active.resumed and _active.persisted(event_id)
+
+
+def print_resume_report(checkpoint: Checkpoint):
+    """What a resumed run is skipping."""
+    finished = checkpoint.finished_sources()
+    cursors = checkpoint.cursors()
+    print(f'  ↻ Resuming run {checkpoint.run_id}: '
+          f'{sum(c["events"] for c in cursors.values())} events already saved')
+    if finished:
+        print(f'    Finished, skipped: {", ".join(f"{s} ({n})" for s, n in sorted(finished.items()))}')
+    partial = {s: c for s, c in cursors.items() if s not in finished}
+    for source, c in sorted(partial.items(), key=lambda item: str(item[0])):
+        print(f'    {source}: continuing after {c["events"]} events (last {c["last"]})')
@@ -0,0 +1,319 @@
+"""
+Pooled HTTP Fetcher
+===================
+Shared keep-alive HTTP layer for all scrapers.
+
+One ``requests.Session`` per host group keeps TLS connections open between
+requests, so the detail phase reuses sockets instead of handshaking once per
+event. Each host group also has an adaptive limiter (rate_limit.py) that
+backs off when the site answers 429/5xx and recovers on success, so
+parallel detail workers get as much throughput as the site tolerates.
+
+Throttled responses (429, 5xx) and connection errors/timeouts are retried
+with jittered exponential backoff, honouring ``Retry-After``. Policy comes
+from ``http.retry`` in config/websites.json::
+
+    "retry": {"max_retries": 3, "backoff_base_s": 1.0, "backoff_max_s": 30}
+
+Host groups come from the ``http`` block of each site in
+config/websites.json::
+
+    "http": {"hosts": ["unstop.com"], "max_connections": 10,
+             "min_connections": 2, "rate_per_s": 10}
+
+A request matches a group when its hostname equals one of ``hosts`` or is a
+subdomain of it. Any other host gets its own group with the default cap.
+
+GET requests made with ``cache='<site key>'`` go through the on-disk
+HttpCache (see http_cache.py). A site's ``cache_max_age_s`` skips the
+network entirely while an entry is fresh; older entries are revalidated
+with a conditional request. ``cache_reads()`` collects how the cached GETs
+of the current thread were served, so a caller can tell details served by
+max age (possibly older than the listing that led to them) from fetched or
+revalidated ones (see incremental.py).
+
+Every response, error and cache hit is counted towards the current
+source's run telemetry (telemetry.py).
+
+While record/replay fixtures are active (fixtures.py) requests are recorded
+or answered from the fixture directory, and the cache is bypassed.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Set
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraper import fixtures
+from scraper.http_cache import HttpCache
+from scraper.rate_limit import AdaptiveLimiter, backoff_delay, retry_after_seconds
+from scraper.settings import load_config
+from scraper.telemetry import telemetry
+
+DEFAULT_TIMEOUT = 30
+
+# Responses that mean "slow down / try again later"
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Collector of the current thread's cache_reads(), if any
+_reads = threading.local()
+
+
+@contextmanager
+def cache_reads() -> Iterator[Set[str]]:
+    """
+    Collect how this thread's cached GETs are served inside the block:
+    'fresh' (within the site's max age, no request), 'revalidated' (304)
+    or 'miss'. An enclosing collector gets them too.
+    """
+    outer = getattr(_reads, 'kinds', None)
+    kinds = _reads.kinds = set()
+    try:
+        yield kinds
+    finally:
+        _reads.kinds = outer
+        if outer is not None:
+            outer.update(kinds)
+
+
+def note_cache_reads(kinds: Iterable[str]):
+    """Add reads made elsewhere (another thread, the run memo) to this thread's collector."""
+    active = getattr(_reads, 'kinds', None)
+    if active is not None:
+        active.update(kinds)
+
+
+class _HostGroup:
+    """Session and adaptive limiter shared by a set of hosts."""
+
+    def __init__(self, name: str, limits: Dict, pool_size: int):
+        self.name = name
+        self.max_connections = limits['max_connections']
+        self.limiter = AdaptiveLimiter(
+            self.max_connections,
+            min_connections=limits.get('min_connections', 1),
+            rate_per_s=limits.get('rate_per_s'),
+            burst=limits.get('burst')
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+
+class Fetcher:
+    """
+    Thread-safe HTTP client with per-host-group sessions and limits.
+
+    Usage:
+        r = fetcher.get('https://unstop.com/api/...', headers=headers, timeout=10)
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config if config is not None else load_config()
+        http_cfg = config.get('http', {})
+        self.pool_size = http_cfg.get('pool_size', 20)
+        self.default_max_connections = http_cfg.get('default_max_connections', 8)
+
+        self._host_to_group: Dict[str, str] = {}
+        self._group_limits: Dict[str, Dict] = {}
+        self._cache_max_age: Dict[str, float] = {}
+        for key, site in config.get('websites', {}).items():
+            site_http = site.get('http', {})
+            for host in site_http.get('hosts', []):
+                self._host_to_group[host.lower()] = key
+            if site_http.get('hosts'):
+                self._group_limits[key] = {
+                    'max_connections': site_http.get('max_connections', self.default_max_connections),
+                    **{k: site_http[k] for k in ('min_connections', 'rate_per_s', 'burst') if k in site_http}
+                }
+            if 'cache_max_age_s' in site_http:
+                self._cache_max_age[key] = site_http['cache_max_age_s']
+
+        retry_cfg = http_cfg.get('retry', {})
+        self.max_retries = retry_cfg.get('max_retries', 3)
+        self.backoff_base_s = retry_cfg.get('backoff_base_s', 1.0)
+        self.backoff_max_s = retry_cfg.get('backoff_max_s', 30.0)
+
+        cache_cfg = http_cfg.get('cache', {})
+        self._cache_dir = cache_cfg.get('dir')
+        self._cache_max_bytes = int(cache_cfg.get('max_mb', 200) * 1024 * 1024)
+        self._default_max_age = cache_cfg.get('default_max_age_s', 0)
+        self._cache: Optional[HttpCache] = None
+        self._cache_stats = defaultdict(lambda: {'fresh': 0, 'revalidated': 0, 'miss': 0})
+
+        self._groups: Dict[str, _HostGroup] = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _group_name(self, hostname: str) -> str:
+        """Map a hostname to its configured group (suffix match), else itself."""
+        hostname = (hostname or '').lower()
+        parts = hostname.split('.')
+        for i in range(len(parts) - 1):
+            group = self._host_to_group.get('.'.join(parts[i:]))
+            if group:
+                return group
+        return hostname
+
+    def _group(self, url: str) -> _HostGroup:
+        name = self._group_name(urlparse(url).hostname)
+        group = self._groups.get(name)
+        if group is None:
+            with self._lock:
+                group = self._groups.get(name)
+                if group is None:
+                    limits = self._group_limits.get(name, {'max_connections': self.default_max_connections})
+                    group = _HostGroup(name, limits, max(self.pool_size, limits['max_connections']))
+                    self._groups[name] = group
+        return group
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Issue a request through the pooled session for the URL's host.
+
+        Throttled responses and connection errors are retried; the last
+        response (possibly still a 429/5xx) is returned, or the last
+        connection error raised.
+        """
+        kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+        store = fixtures.active()
+        try:
+            if store and store.replaying:
+                r = store.replay_response(method, url, kwargs)
+            else:
+                r = self._send(method, url, kwargs)
+                if store:
+                    store.record_response(method, url, kwargs, r)
+        except requests.RequestException:
+            telemetry.count('errors')
+            raise
+        telemetry.record_response(r)
+        return r
+
+    def _send(self, method: str, url: str, kwargs: Dict) -> requests.Response:
+        """Send with the group's limiter, retrying throttled attempts."""
+        group = self._group(url)
+        attempt = 0
+        while True:
+            retry_after = None
+            group.limiter.acquire()
+            try:
+                r = group.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                group.limiter.release(throttled=True)
+                if attempt >= self.max_retries:
+                    raise
+            except BaseException:
+                group.limiter.release()
+                raise
+            else:
+                throttled = r.status_code in THROTTLE_STATUSES
+                if throttled:
+                    retry_after = retry_after_seconds(r.headers.get('Retry-After'), self.backoff_max_s)
+                group.limiter.release(throttled=throttled, retry_after=retry_after)
+                if not throttled or attempt >= self.max_retries:
+                    return r
+
+            delay = retry_after if retry_after is not None else backoff_delay(
+                attempt, self.backoff_base_s, self.backoff_max_s)
+            attempt += 1
+            telemetry.count('retries')
+            time.sleep(delay)
+
+    def get(self, url: str, cache: Optional[str] = None, **kwargs) -> requests.Response:
+        """
+        GET a URL, optionally through the on-disk cache.
+
+        Args:
+            url: URL to fetch
+            cache: Site key whose cache policy applies (e.g. "devpost");
+                   None bypasses the cache
+        """
+        if not cache or fixtures.active():
+            return self.request('GET', url, **kwargs)
+        return self._cached_get(url, cache, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def _get_cache(self) -> HttpCache:
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = HttpCache(self._cache_dir, self._cache_max_bytes)
+        return self._cache
+
+    def _cached_get(self, url: str, source: str, **kwargs) -> requests.Response:
+        cache = self._get_cache()
+        meta = cache.lookup(url)
+
+        if meta:
+            max_age = self._cache_max_age.get(source, self._default_max_age)
+            try:
+                if max_age and cache.age(meta) < max_age:
+                    r = cache.response(meta)
+                    self._count(source, 'fresh')
+                    return r
+            except OSError:
+                meta = None  # Evicted under us, fall through to a full fetch
+
+        if meta:
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(cache.conditional_headers(meta))
+            kwargs['headers'] = headers
+
+        r = self.request('GET', url, **kwargs)
+
+        if r.status_code == 304 and meta:
+            try:
+                cache.touch(meta)
+                cached = cache.response(meta)
+                self._count(source, 'revalidated')
+                return cached
+            except OSError:
+                pass
+        elif r.status_code == 200:
+            try:
+                cache.store(url, r)
+            except OSError:
+                pass  # A full disk should not fail the scrape
+        self._count(source, 'miss')
+        return r
+
+    def _count(self, source: str, kind: str):
+        with self._stats_lock:
+            self._cache_stats[source][kind] += 1
+        note_cache_reads((kind,))
+        if kind != 'miss':
+            telemetry.count('cache_hits')
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-source cache counters: fresh hits, 304 revalidations, misses."""
+        with self._stats_lock:
+            return {source: dict(counts) for source, counts in self._cache_stats.items()}
+
+    def reset_stats(self):
+        """Clear the per-run cache counters (limiter state is kept)."""
+        with self._stats_lock:
+            self._cache_stats.clear()
+
+    def limiter_stats(self) -> Dict[str, Dict]:
+        """Per host group: current and lowest concurrency limit, throttled responses."""
+        with self._lock:
+            return {name: group.limiter.snapshot() for name, group in self._groups.items()}
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            for group in self._groups.values():
+                group.session.close()
+            self._groups.clear()
+
+
+# Shared instance used by all scrapers in this process
+fetcher = Fetcher()
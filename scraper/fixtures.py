@@ -0,0 +1,298 @@
+"""
+Record / Replay Fixtures
+========================
+Capture the network side of a real scrape once, then replay it offline.
+
+In **record** mode every response that goes through the shared Fetcher and
+every rendered ``page.content()`` from a pooled browser page is written to a
+fixture directory::
+
+    <dir>/http/<key>.json    method, url, status, headers, encoding
+    <dir>/http/<key>.body    raw response body
+    <dir>/pages/<key>.json   site, url and the HTML snapshots taken there
+
+In **replay** mode the same calls are answered from that directory: the
+Fetcher never opens a socket and browser pages are ``ReplayPage`` objects
+that serve the recorded HTML, so no browser is launched. A request with no
+fixture raises ``requests.ConnectionError`` (as if offline) and a page with
+no snapshot renders empty; both are counted as misses.
+
+HTTP fixtures are keyed by method, final URL (query string included) and
+request body. Page snapshots are keyed by site and the URL last passed to
+``goto()``, in the order ``content()`` was called, so a scraper that clicks
+its way to a listing replays from the page it started on.
+
+Turn it on with ``main.py scrape --record DIR`` / ``--replay DIR``,
+``main.py bench`` (see bench_scrapers.py) or the environment::
+
+    HACKFIND_FIXTURES=replay HACKFIND_FIXTURES_DIR=data/fixtures python -m scraper.scrape_all
+
+The HTTP cache is bypassed while fixtures are active so every request is
+recorded and replays are deterministic.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from scraper.parsing import make_soup
+
+MODE_ENV = 'HACKFIND_FIXTURES'
+DIR_ENV = 'HACKFIND_FIXTURES_DIR'
+DEFAULT_DIR = Path(__file__).parent.parent / 'data' / 'fixtures'
+
+_EMPTY_PAGE = '<html><head></head><body></body></html>'
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def request_key(method: str, url: str, kwargs: Dict) -> str:
+    """Fixture key for a request: method, final URL and body."""
+    prepared = requests.Request(
+        method.upper(), url,
+        params=kwargs.get('params'), data=kwargs.get('data'), json=kwargs.get('json')
+    ).prepare()
+    body = prepared.body or b''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if kwargs.get('json') is not None:
+        body = json.dumps(kwargs['json'], sort_keys=True).encode('utf-8')
+    return _digest(prepared.method, prepared.url, hashlib.sha1(body).hexdigest())
+
+
+class FixtureStore:
+    """Reads and writes fixtures under one directory."""
+
+    def __init__(self, path, mode: str):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Unknown fixture mode: {mode}')
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._pages: Dict[str, Dict] = {}
+        self._served: Dict[str, int] = {}
+        self.stats = {'http': 0, 'pages': 0, 'http_misses': 0, 'page_misses': 0}
+        if mode == 'record':
+            (self.path / 'http').mkdir(parents=True, exist_ok=True)
+            (self.path / 'pages').mkdir(parents=True, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.stats[kind] += 1
+
+    # ---- HTTP ----
+
+    def record_response(self, method: str, url: str, kwargs: Dict, response: requests.Response):
+        """Save a live response under its request key."""
+        key = request_key(method, url, kwargs)
+        meta = {
+            'method': method.upper(),
+            'url': response.url or url,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'headers': dict(response.headers),
+        }
+        base = self.path / 'http' / key
+        with open(f'{base}.body', 'wb') as f:
+            f.write(response.content)
+        with open(f'{base}.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        self._count('http')
+
+    def replay_response(self, method: str, url: str, kwargs: Dict) -> requests.Response:
+        """
+        Rebuild the recorded response for a request.
+
+        Raises:
+            requests.ConnectionError: If the request was never recorded
+        """
+        base = self.path / 'http' / request_key(method, url, kwargs)
+        try:
+            with open(f'{base}.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(f'{base}.body', 'rb') as f:
+                body = f.read()
+        except OSError:
+            self._count('http_misses')
+            raise requests.ConnectionError(f'No fixture for {method.upper()} {url}')
+
+        r = requests.Response()
+        r.status_code = meta['status']
+        r.url = meta['url']
+        r.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        r.encoding = meta.get('encoding')
+        r._content = body
+        r.from_fixture = True
+        self._count('http')
+        return r
+
+    # ---- Browser pages ----
+
+    def _page_entry(self, site: str, url: str) -> Dict:
+        key = _digest(site, url)
+        entry = self._pages.get(key)
+        if entry is None:
+            path = self.path / 'pages' / f'{key}.json'
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = {'site': site, 'url': url, 'snapshots': []}
+            entry['_path'] = str(path)
+            self._pages[key] = entry
+        return entry
+
+    def record_page(self, site: str, url: str, html: str):
+        """Append a rendered snapshot for (site, url)."""
+        with self._lock:
+            entry = self._page_entry(site, url)
+            entry['snapshots'].append(html)
+            with open(entry['_path'], 'w', encoding='utf-8') as f:
+                json.dump({k: v for k, v in entry.items() if k != '_path'}, f)
+            self.stats['pages'] += 1
+
+    def replay_page(self, site: str, url: str) -> Optional[str]:
+        """Next recorded snapshot for (site, url); the last one repeats."""
+        with self._lock:
+            entry = self._page_entry(site, url)
+            snapshots = entry['snapshots']
+            if not snapshots:
+                self.stats['page_misses'] += 1
+                return None
+            key = _digest(site, url)
+            i = self._served.get(key, 0)
+            self._served[key] = i + 1
+            self.stats['pages'] += 1
+            return snapshots[min(i, len(snapshots) - 1)]
+
+
+class RecordingPage:
+    """Wraps a live Playwright page and snapshots what the scraper reads."""
+
+    def __init__(self, page, store: FixtureStore, site: Optional[str]):
+        self._page = page
+        self._store = store
+        self._site = site or 'other'
+        self._url = ''
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+    def goto(self, url: str, **kwargs):
+        self._url = url
+        return self._page.goto(url, **kwargs)
+
+    def content(self) -> str:
+        html = self._page.content()
+        self._store.record_page(self._site, self._url or self._page.url, html)
+        return html
+
+    def query_selector_all(self, selector: str):
+        # Scrapers reading element handles never call content(); snapshot here
+        self._store.record_page(self._site, self._url or self._page.url, self._page.content())
+        return self._page.query_selector_all(selector)
+
+
+class ReplayElement:
+    """Minimal element handle over a BeautifulSoup tag."""
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        value = self._tag.get(name)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def inner_text(self) -> str:
+        return self._tag.get_text('\n', strip=True)
+
+
+class ReplayPage:
+    """
+    Stand-in for a Playwright page that serves recorded snapshots.
+
+    Navigation, waits and clicks succeed immediately; ``content()`` returns
+    the snapshot recorded for the last ``goto()`` URL.
+    """
+
+    def __init__(self, store: FixtureStore, site: Optional[str]):
+        self._store = store
+        self._site = site or 'other'
+        self.url = 'about:blank'
+        self._html: Optional[str] = None
+
+    def _current(self) -> str:
+        if self._html is None:
+            self._html = self._store.replay_page(self._site, self.url) or _EMPTY_PAGE
+        return self._html
+
+    def goto(self, url: str, **kwargs):
+        self.url = url
+        self._html = None
+
+    def content(self) -> str:
+        html = self._current()
+        self._html = None  # A later content() call gets the next snapshot
+        return html
+
+    def query_selector_all(self, selector: str):
+        return [ReplayElement(tag) for tag in make_soup(self.content()).select(selector)]
+
+    def evaluate(self, expression: str, arg=None):
+        # Only the scroll helper evaluates JS: answer its item count query
+        if isinstance(arg, str):
+            return len(make_soup(self._current()).select(arg))
+        return None
+
+    def wait_for_function(self, *args, **kwargs):
+        raise TimeoutError('Replayed pages do not change')
+
+    def wait_for_selector(self, *args, **kwargs):
+        return None
+
+    def wait_for_load_state(self, *args, **kwargs):
+        return None
+
+    def wait_for_timeout(self, *args, **kwargs):
+        return None
+
+    def click(self, *args, **kwargs):
+        return None
+
+    def close(self):
+        return None
+
+
+_active: Optional[FixtureStore] = None
+
+
+def activate(mode: str, path=None) -> FixtureStore:
+    """Switch the process to record or replay mode."""
+    global _active
+    _active = FixtureStore(path or DEFAULT_DIR, mode)
+    return _active
+
+
+def deactivate():
+    global _active
+    _active = None
+
+
+def active() -> Optional[FixtureStore]:
+    """The active fixture store, or None for live scraping."""
+    return _active
+
+
+if os.environ.get(MODE_ENV):
+    activate(os.environ[MODE_ENV].lower(), os.environ.get(DIR_ENV))
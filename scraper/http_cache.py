@@ -0,0 +1,144 @@
+"""
+On-Disk HTTP Cache
+==================
+Size-bounded response cache for detail pages, keyed by URL.
+
+Each entry stores the body plus the validators (ETag / Last-Modified) so the
+next run can send a conditional request and treat ``304 Not Modified`` as a
+hit. Entries younger than the source's max age are served without touching
+the network at all.
+
+Layout (one pair of files per URL)::
+
+    .cache/http/<sha1(url)>.json   # metadata: url, validators, stored_at
+    .cache/http/<sha1(url)>.body   # raw response body
+
+When the cache grows past ``max_bytes`` the least recently used entries
+(oldest mtime) are evicted.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'http'
+
+# Response headers worth keeping with the body
+_KEPT_HEADERS = ('ETag', 'Last-Modified', 'Content-Type')
+
+
+class HttpCache:
+    """Thread-safe URL -> response cache on the local filesystem."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self.cache_dir.glob('*.body'))
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.json', self.cache_dir / f'{key}.body'
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return stored metadata for a URL, or None if not cached."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or not body_path.exists():
+            return None
+        return meta
+
+    def age(self, meta: Dict) -> float:
+        """Seconds since the entry was stored or last revalidated."""
+        return time.time() - meta.get('stored_at', 0)
+
+    def conditional_headers(self, meta: Dict) -> Dict[str, str]:
+        """Validators to send with a revalidation request."""
+        headers = {}
+        stored = meta.get('headers', {})
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+
+    def response(self, meta: Dict) -> requests.Response:
+        """Rebuild a 200 response from a cache entry."""
+        _, body_path = self._paths(meta['url'])
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        os.utime(body_path)  # mark as recently used for eviction
+
+        r = requests.Response()
+        r.status_code = 200
+        r.url = meta['url']
+        r.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        r.encoding = meta.get('encoding')
+        r._content = body
+        r.from_cache = True
+        return r
+
+    def store(self, url: str, response: requests.Response):
+        """Save a 200 response and its validators."""
+        meta_path, body_path = self._paths(url)
+        body = response.content
+        meta = {
+            'url': url,
+            'stored_at': time.time(),
+            'encoding': response.encoding,
+            'headers': {h: response.headers[h] for h in _KEPT_HEADERS if h in response.headers},
+        }
+
+        old_size = body_path.stat().st_size if body_path.exists() else 0
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+        with self._lock:
+            self._size += len(body) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def touch(self, meta: Dict):
+        """Record a successful revalidation (304) so max-age counts from now."""
+        meta_path, body_path = self._paths(meta['url'])
+        meta['stored_at'] = time.time()
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        os.utime(body_path)
+
+    def _write_atomic(self, path: Path, data: bytes):
+        tmp = path.with_suffix(path.suffix + f'.{threading.get_ident()}.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _evict(self):
+        """Drop least recently used entries until under 90% of the budget."""
+        bodies = []
+        for body_path in self.cache_dir.glob('*.body'):
+            try:
+                bodies.append((body_path.stat().st_mtime, body_path))
+            except OSError:
+                continue
+        bodies.sort()
+        target = self.max_bytes * 0.9
+        for _, body_path in bodies:
+            if self._size <= target:
+                break
+            try:
+                size = body_path.stat().st_size
+                body_path.unlink()
+                body_path.with_suffix('.json').unlink(missing_ok=True)
+                self._size -= size
+            except OSError:
+                continue
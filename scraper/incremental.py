@@ -0,0 +1,120 @@
+"""
+Incremental Scraping
+====================
+Skips detail enrichment for listings that have not changed since last run.
+
+The listing APIs (Devpost, Unstop, Devfolio) already return the summary
+fields that move when an event changes (title, dates, prize, registrations).
+A hash of those fields is stored per event ID; on the next run only new or
+changed listings are sent to the detail fetchers, and unchanged events just
+get their ``last_updated`` bumped.
+
+A fingerprint is only stored once the event was saved with details fetched
+or revalidated in this run. Details served from the HTTP cache by a site's
+``cache_max_age_s`` (fetcher.py) may predate the listing change, so such a
+listing stays "changed" and is sent to the detail fetcher again next run,
+until its cache entry is old enough to be revalidated.
+
+On a resumed run (``--resume``, see checkpoint.py), listings whose events
+the interrupted run already saved are skipped as well; their fingerprints
+are stored as if they had been refreshed in this run.
+"""
+import hashlib
+import json
+import threading
+from functools import wraps
+from typing import Callable, Dict, List, Set
+
+from scraper import checkpoint
+from scraper.fetcher import cache_reads
+
+
+def listing_fingerprint(summary: Dict) -> str:
+    """Stable hash of the listing summary fields."""
+    payload = json.dumps(summary, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ListingTracker:
+    """
+    Per-run change tracker for one source.
+
+    Usage:
+        tracker = ListingTracker(db, normalizer, 'Devpost', force=force)
+        fetch = tracker.watch(fetch_details)
+        event_id = tracker.event_id(url, title)
+        if tracker.is_changed(event_id, summary):
+            details = fetch(key)
+            ...save...
+            tracker.mark_saved(event_id, key)
+        tracker.commit()
+    """
+
+    def __init__(self, db, normalizer, source: str, force: bool = False):
+        self.db = db
+        self.normalizer = normalizer
+        self.source = source
+        self.force = force
+        self.previous = {} if force else db.get_listing_fingerprints(source)
+        self.current: Dict[str, str] = {}
+        self.saved: Dict[str, str] = {}
+        self.unchanged: List[str] = []
+        self.resumed = 0                   # Saved by the interrupted run being resumed
+        self.cached: Set = set()           # Fetch keys whose details were served by max age
+        self.deferred = 0                  # Saved from those; fingerprint not stored
+        self._lock = threading.Lock()
+
+    def event_id(self, url: str, title: str) -> str:
+        """Same ID DataNormalizer.normalize() assigns to the saved event."""
+        return self.normalizer._generate_id(self.source, {'url': url, 'title': title})
+
+    def is_changed(self, event_id: str, summary: Dict) -> bool:
+        """True if the listing is new, changed, or force mode is on (and not saved by a resumed run)."""
+        fp = listing_fingerprint(summary)
+        self.current[event_id] = fp
+        if checkpoint.persisted(event_id):
+            self.saved[event_id] = fp
+            self.resumed += 1
+            return False
+        if self.force or self.previous.get(event_id) != fp:
+            return True
+        self.unchanged.append(event_id)
+        return False
+
+    def watch(self, fetch_details: Callable) -> Callable:
+        """Wrap a one-argument detail fetcher to note the keys whose details were served by max age."""
+        @wraps(fetch_details)
+        def fetch(key):
+            with cache_reads() as kinds:
+                details = fetch_details(key)
+            if 'fresh' in kinds:
+                with self._lock:
+                    self.cached.add(key)
+            return details
+        return fetch
+
+    def mark_saved(self, event_id: str, key=None):
+        """
+        Record the fingerprint once the event was saved with its details.
+
+        Args:
+            event_id: Saved event
+            key: Argument its details were fetched with through ``watch()``;
+                 details served by max age leave the fingerprint unrecorded
+        """
+        if event_id not in self.current:
+            return
+        if key is not None and key in self.cached:
+            self.deferred += 1
+            return
+        self.saved[event_id] = self.current[event_id]
+
+    def commit(self):
+        """Persist new fingerprints and touch unchanged events."""
+        self.db.save_listing_fingerprints(self.source, self.saved)
+        touched = self.db.touch_events(self.unchanged)
+        if self.unchanged or self.resumed:
+            print(f'  ({len(self.unchanged)} unchanged, {touched} touched, {len(self.saved)} refreshed'
+                  + (f', {self.resumed} saved before resume' if self.resumed else '') + ')')
+        if self.deferred:
+            print(f'  ({self.deferred} saved with cached details, re-checked next run)')
@@ -0,0 +1,156 @@
+"""
+Run-Scoped Detail Memo
+======================
+Remembers parsed detail results for the rest of a run, across scrapers.
+
+The same event is often fetched by several scrapers in one run: MLH links
+to events hosted on Devpost and Devfolio, which ``scrape_devpost`` and
+``scrape_devfolio`` have usually just fetched; DevDisplay fetches Devfolio
+and Unstop details again. The on-disk HTTP cache still costs a lookup,
+often a revalidation round trip, and a re-parse. The memo hands out the
+parsed result directly.
+
+Detail fetchers are wrapped with ``@memoized(namespace, canonical)``:
+
+- keys are canonical (``canonical_url`` drops scheme, ``www.``, query and
+  trailing slash; slugs and IDs are lower-cased), so the same event linked
+  in different ways is fetched once
+- concurrent lookups of a key that is still being fetched wait for that
+  fetch instead of starting another
+- empty results (failed fetches) are not kept, so a later scraper retries
+- callers get their own copy of the result
+- how the HTTP cache served the fetch (``fetcher.cache_reads()``) is kept
+  with the result and reported again to every caller that reuses it
+
+Hits are counted per namespace (``memo.stats()``) and as ``cache_hits`` of
+the source that asked. ``scrape_all.main()`` resets the memo at the start
+of every run. It lives in one process, so browser sources running in
+worker processes (see browser_workers.py) keep their own.
+"""
+import copy
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from scraper.fetcher import cache_reads, note_cache_reads
+from scraper.telemetry import telemetry
+
+
+def canonical_key(value) -> Optional[str]:
+    """Slug or ID key: stripped and lower-cased."""
+    key = str(value).strip().lower() if value is not None else ''
+    return key or None
+
+
+def canonical_url(url) -> Optional[str]:
+    """URL key: host (without www.) and path, ignoring scheme, query and trailing slash."""
+    if not url:
+        return None
+    parts = urlsplit(str(url).strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return f'{host}{parts.path.rstrip("/")}' or None
+
+
+class RunMemo:
+    """Thread-safe memo of detail results for the current run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything (start of a run)."""
+        with self._lock:
+            self._entries: Dict[tuple, Future] = {}
+            self._stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def get(self, namespace: str, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Result for ``key``, computed at most once per run while it succeeds.
+
+        Args:
+            namespace: Kind of result, e.g. "devpost"
+            key: Canonical key within the namespace
+            compute: Fetches the result on a miss
+        """
+        with self._lock:
+            future = self._entries.get((namespace, key))
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[(namespace, key)] = future
+                self._stats[namespace]['misses'] += 1
+            else:
+                self._stats[namespace]['hits'] += 1
+
+        if not owner:
+            telemetry.count('cache_hits')
+            return copy.deepcopy(future.result())
+
+        try:
+            value = compute()
+        except BaseException as e:
+            self._forget(namespace, key)
+            future.set_exception(e)
+            raise
+        if not value:
+            self._forget(namespace, key)  # Let the next caller try again
+        future.set_result(value)
+        return copy.deepcopy(value)
+
+    def _forget(self, namespace: str, key: str):
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-namespace hits and misses."""
+        with self._lock:
+            return {ns: dict(counts) for ns, counts in self._stats.items()}
+
+
+# Shared memo for all scrapers in this process
+memo = RunMemo()
+
+
+def memoized(namespace: str, canonical: Callable[[Any], Optional[str]] = canonical_key):
+    """
+    Memoize a one-argument detail fetcher for the run.
+
+    Args:
+        namespace: Memo namespace shared by fetchers of the same results
+        canonical: Maps the argument to its key; None skips the memo
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(arg):
+            key = canonical(arg)
+            if key is None:
+                return func(arg)
+
+            def compute():
+                with cache_reads() as kinds:
+                    value = func(arg)
+                return (value, frozenset(kinds)) if value else value
+
+            entry = memo.get(namespace, key, compute)
+            if not entry:
+                return entry
+            value, kinds = entry
+            note_cache_reads(kinds)
+            return value
+        return wrapper
+    return decorate
+
+
+def print_memo_report(stats: Dict[str, Dict[str, int]]):
+    """One line of detail memo hits per namespace."""
+    hits = sum(s['hits'] for s in stats.values())
+    if not hits:
+        return
+    parts = ', '.join(f'{ns} {s["hits"]}/{s["hits"] + s["misses"]}' for ns, s in sorted(stats.items()) if s['hits'])
+    print(f'  Detail memo: {hits} fetches reused ({parts})')
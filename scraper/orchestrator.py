@@ -0,0 +1,284 @@
+"""
+Scrape Orchestrator
+===================
+Runs independent source scrapers concurrently instead of one after another.
+
+Every source hits a different host, so the wall time of a full run should be
+close to the slowest source rather than the sum of all of them.
+
+Features:
+- Global concurrency limit (``max_workers``)
+- Per-source timeout; a source that overruns is reported and cancelled:
+  its deadline is set so the scraper loops wind down (see budget.py), the
+  events it still saves are dropped (see writer.py) and its browser lane
+  is handed to the next job
+- Optional run budget: per-source time slices, pre-emption and skipping
+  of sources that no longer fit (see budget.py)
+- Per-source wall time, yield and HTTP cache hit rate report
+- Browser sources share a few long-lived browsers (see browser_pool.py),
+  optionally in supervised worker processes (see browser_workers.py)
+- Browser transfer size / load time report, blocked vs full
+- Run telemetry attributed per source (see telemetry.py)
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from scraper.browser_pool import BrowserLanes
+from scraper.browser_workers import BrowserProcessPool
+from scraper import budget as run_budget
+from scraper import telemetry
+from scraper.settings import browser_pool_config, run_config
+
+
+@dataclass
+class ScrapeJob:
+    """A single source to scrape."""
+    key: str                          # websites.json key, e.g. "devpost"
+    func: Callable[[], int]           # Returns number of events saved
+    method: str = "http"              # "http" or "browser"
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source in a run."""
+    key: str
+    method: str
+    saved: int = 0
+    wall_time: float = 0.0
+    status: str = "ok"                # ok, error, timeout, preempted, skipped
+    error: Optional[str] = None
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.saved / self.wall_time if self.wall_time > 0 else 0.0
+
+
+class _SourceRunner(threading.Thread):
+    """
+    Daemon thread running one job.
+
+    Daemon so that a source we gave up on (timeout) cannot keep the
+    interpreter alive at exit. Once ``abandoned`` is set its reported
+    result is left as it is.
+    """
+
+    def __init__(self, job: ScrapeJob, on_done: threading.Event, lanes=None, limit: Optional[float] = None):
+        super().__init__(name=f"scrape-{job.key}", daemon=True)
+        self.job = job
+        self.lanes = lanes
+        self.limit = limit            # Seconds before the job is abandoned
+        self.result = SourceResult(key=job.key, method=job.method)
+        self.started_at = None
+        self.finished = False
+        self.abandoned = False
+        self.future = None            # Lane job of a browser source
+        self._on_done = on_done
+
+    def run(self):
+        self.started_at = time.monotonic()
+        saved, error = 0, None
+        try:
+            with telemetry.source(self.job.key):
+                if self.lanes:
+                    # Browser jobs run on a lane (thread or worker process) that owns a shared browser
+                    self.future = self.lanes.submit(self.job.func, source=self.job.key)
+                    saved = self.future.result() or 0
+                else:
+                    saved = self.job.func() or 0
+        except Exception as e:
+            error = str(e)
+        finally:
+            if not self.abandoned:
+                self.result.saved = saved
+                if error is not None:
+                    self.result.status = "error"
+                    self.result.error = error
+                self.result.wall_time = time.monotonic() - self.started_at
+            self.finished = True
+            self._on_done.set()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at if self.started_at else 0.0
+
+
+def run_scrapers(
+    jobs: List[ScrapeJob],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    browser_lanes: Optional[int] = None,
+    event_sink: Optional[Callable] = None,
+    budget: Optional[run_budget.RunBudget] = None,
+    on_finish: Optional[Callable[[SourceResult], None]] = None
+) -> List[SourceResult]:
+    """
+    Run scrape jobs concurrently.
+
+    Args:
+        jobs: Sources to scrape, started in list order
+        max_workers: Max sources running at once (default: scrape_run.max_workers)
+        timeout: Per-source timeout in seconds (default: scrape_run.source_timeout_s)
+        browser_lanes: Browsers shared by "browser" jobs (default: browser_config.pool.lanes)
+        event_sink: Receives events saved by browser jobs running in worker
+                    processes (browser_config.pool.isolation = "process");
+                    without it browser jobs run on in-process lanes
+        budget: Time slices of a budgeted run; a job that cannot get its
+                minimum slice is not started (status "skipped"), one that
+                used its slice is "preempted", and one that runs on past
+                its slice plus grace period is abandoned ("timeout")
+        on_finish: Called with each job's result as soon as the job ends,
+                   times out or is skipped (e.g. to flush its events and
+                   checkpoint finished sources)
+
+    Returns:
+        One SourceResult per job, in the order they finished
+    """
+    cfg = run_config()
+    max_workers = max(1, max_workers or cfg.get('max_workers', 6))
+    timeout = timeout if timeout is not None else cfg.get('source_timeout_s')
+
+    pool_cfg = browser_pool_config()
+    browser_lanes = max(1, browser_lanes or pool_cfg.get('lanes', 2))
+    lanes = None
+    if any(j.method == 'browser' for j in jobs):
+        if pool_cfg.get('isolation') == 'process' and event_sink:
+            lanes = BrowserProcessPool(
+                browser_lanes, event_sink,
+                job_timeout=pool_cfg.get('job_timeout_s') or timeout,
+                memory_mb=pool_cfg.get('worker_memory_mb'),
+            )
+        else:
+            lanes = BrowserLanes(browser_lanes)
+
+    pending = list(jobs)
+    running: List[_SourceRunner] = []
+    results: List[SourceResult] = []
+    changed = threading.Event()
+
+    def finish(result: SourceResult):
+        results.append(result)
+        if on_finish:
+            on_finish(result)
+
+    def can_start(job: ScrapeJob) -> bool:
+        # Browser jobs only start when a lane is free, so timeouts don't count queueing
+        if job.method != 'browser':
+            return True
+        return sum(r.job.method == 'browser' for r in running) < browser_lanes
+
+    while pending or running:
+        for job in list(pending):
+            if len(running) >= max_workers:
+                break
+            if not can_start(job):
+                continue
+            pending.remove(job)
+            limit = timeout
+            if budget:
+                slice_s = budget.start_slice(job.key)
+                if slice_s is None:
+                    print(f'  ⏭ {job.key} skipped: {max(0.0, budget.left()):.0f}s of the run budget left')
+                    finish(SourceResult(key=job.key, method=job.method, status="skipped",
+                                        error="run budget exhausted"))
+                    continue
+                limit = min(limit, slice_s + budget.grace_s) if limit else slice_s + budget.grace_s
+            runner = _SourceRunner(job, changed, lanes if job.method == 'browser' else None, limit)
+            runner.start()
+            running.append(runner)
+        if not running:
+            continue
+
+        # Sleep until a runner finishes or the nearest timeout expires
+        limits = [r.limit - r.elapsed() for r in running if r.limit]
+        changed.wait(max(0.0, min(limits)) if limits else None)
+        changed.clear()
+
+        for runner in list(running):
+            if runner.finished:
+                if budget and runner.result.status == "ok" and run_budget.expired(runner.job.key):
+                    runner.result.status = "preempted"
+                    runner.result.error = f"time slice used up; kept {runner.result.saved} events"
+                running.remove(runner)
+                finish(runner.result)
+            elif runner.limit and runner.elapsed() >= runner.limit:
+                runner.abandoned = True
+                runner.result.status = "timeout"
+                runner.result.wall_time = runner.elapsed()
+                runner.result.error = f"exceeded {runner.limit:g}s"
+                print(f'  ⏱ {runner.job.key} timed out after {runner.limit:.0f}s, moving on')
+                # Cancel it: the scraper loops see an expired deadline and stop,
+                # the writer drops what it still saves, and the browser lane it
+                # holds goes to the next job
+                run_budget.abandon(runner.job.key)
+                if runner.future is not None:
+                    runner.lanes.cancel(runner.future)
+                running.remove(runner)
+                finish(runner.result)
+
+    if lanes:
+        lanes.close()
+        print(f'  Browser pool: {lanes.stats["launches"]} launch(es), {lanes.stats["contexts"]} contexts, '
+              f'{lanes.stats["pages"]} pages, {lanes.stats["recycled"]} recycled'
+              + (f', {lanes.stats["restarts"]} worker restart(s)' if lanes.stats.get('restarts') else ''))
+
+    return results
+
+
+def print_run_report(results: List[SourceResult], wall_time: float):
+    """Print per-source wall time and yield, slowest first."""
+    print('\n  Source          Method   Status    Saved    Time    Ev/s')
+    print('  ' + '-' * 57)
+    for r in sorted(results, key=lambda r: r.wall_time, reverse=True):
+        print(f'  {r.key:<15} {r.method:<8} {r.status:<9} {r.saved:>5} {r.wall_time:>6.1f}s {r.events_per_sec:>7.1f}')
+        if r.error:
+            print(f'      ↳ {r.error}')
+
+    sequential = sum(r.wall_time for r in results)
+    slowest = max((r.wall_time for r in results), default=0.0)
+    print('  ' + '-' * 57)
+    print(f'  Wall time: {wall_time:.1f}s (slowest source {slowest:.1f}s, sequential sum {sequential:.1f}s)')
+
+
+def print_cache_report(cache_stats: Dict[str, Dict[str, int]]):
+    """Print HTTP cache hit rate per source (fresh + 304 count as hits)."""
+    for source, counts in sorted(cache_stats.items()):
+        hits = counts.get('fresh', 0) + counts.get('revalidated', 0)
+        total = hits + counts.get('miss', 0)
+        rate = 100.0 * hits / total if total else 0.0
+        print(f'  Cache {source:<10} {rate:5.1f}% hit '
+              f'({counts.get("fresh", 0)} fresh, {counts.get("revalidated", 0)} revalidated, {counts.get("miss", 0)} miss)')
+
+
+def print_limiter_report(limiter_stats: Dict[str, Dict]):
+    """Print host groups that were throttled and how far their limit dropped."""
+    for group, s in sorted(limiter_stats.items()):
+        if s.get('throttled'):
+            print(f'  Throttled {group:<10} {s["throttled"]} responses, concurrency '
+                  f'{s["max"]} → {s["lowest_limit"]} (now {s["limit"]})')
+
+
+def print_browser_report(metrics: Dict[str, Dict], previous: Dict[str, Dict]):
+    """
+    Print browser transfer size and load time per source.
+
+    ``previous`` holds the last stored run per source and mode; when the
+    other mode (blocked vs full) is on record, the saving is shown.
+    """
+    print('\n  Browser source  Mode     Pages   Req  Blocked       KB   Avg load')
+    print('  ' + '-' * 64)
+    for site, m in sorted(metrics.items()):
+        kb = m['bytes'] / 1024
+        load = m['load_s'] / m['loads'] if m['loads'] else 0.0
+        print(f'  {site:<15} {m["mode"]:<8} {m["pages"]:>5} {m["requests"]:>5} {m["blocked"]:>8} '
+              f'{kb:>8.0f} {load:>9.2f}s')
+
+        other = previous.get(site, {}).get('full' if m['mode'] == 'blocked' else 'blocked')
+        if other and other.get('pages'):
+            before, after = (other, m) if m['mode'] == 'blocked' else (m, other)
+            kb_before = before['bytes'] / before['pages'] / 1024
+            kb_after = after['bytes'] / after['pages'] / 1024
+            load_before = before['load_s'] / before['loads'] if before['loads'] else 0.0
+            load_after = after['load_s'] / after['loads'] if after['loads'] else 0.0
+            print(f'      ↳ {kb_before:.0f} → {kb_after:.0f} KB per page, '
+                  f'avg load {load_before:.2f}s → {load_after:.2f}s (full → blocked)')
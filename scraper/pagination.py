@@ -0,0 +1,116 @@
+"""
+Parallel Listing Pagination
+===========================
+Fetches listing pages concurrently instead of walking them one by one.
+
+The first page is fetched on its own. If the API reports how many pages
+there are, the remaining pages are fanned out at once; otherwise pages are
+probed ahead in windows of ``window`` pages. Either way the result stops
+cleanly at the first empty (or short) page, and pages are returned in order.
+
+``iter_pages()`` yields each page as soon as it (and the pages before it)
+arrived, with at most ``window`` pages in flight, so a streaming scraper
+(see pipeline.py) can start on page 1 while later pages are still loading.
+``paginate()`` collects them into one list. Both stop early, after the
+pages already fetched, once the source's run-budget slice is used up
+(see budget.py).
+
+Scrapers read the window size from ``pagination.parallel_pages`` of their
+site in config/websites.json.
+"""
+from math import ceil
+from collections import deque
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from scraper import budget
+from scraper.telemetry import SourcePoolExecutor
+
+# fetch_page(page_number) -> (items, total_page_count or None)
+PageFetcher = Callable[[int], Tuple[list, Optional[int]]]
+
+
+def page_count(total_items, per_page) -> Optional[int]:
+    """Number of pages for a reported item total, or None if unknown."""
+    try:
+        total_items, per_page = int(total_items), int(per_page)
+    except (TypeError, ValueError):
+        return None
+    return ceil(total_items / per_page) if per_page > 0 else None
+
+
+def _safe_fetch(fetch_page: PageFetcher, page: int) -> Tuple[Optional[list], Optional[int]]:
+    """Fetch a page; a failed page comes back as (None, None)."""
+    try:
+        items, total_pages = fetch_page(page)
+        return items or [], total_pages
+    except Exception:
+        return None, None
+
+
+def iter_pages(
+    fetch_page: PageFetcher,
+    start: int = 1,
+    max_pages: int = 29,
+    window: int = 4,
+    page_size: Optional[int] = None
+) -> Iterator[List]:
+    """
+    Fetch listing pages concurrently and yield their items page by page, in order.
+
+    Args:
+        fetch_page: Fetches one page; returns (items, total page count or None)
+        start: First page number (1 for page-numbered APIs, 0 for offset APIs)
+        max_pages: Upper bound on pages fetched
+        window: Pages fetched concurrently (and buffered ahead of the consumer)
+        page_size: If set, a page shorter than this is treated as the last one
+
+    Yields:
+        The items of each non-empty page
+    """
+    first_items, total_pages = _safe_fetch(fetch_page, start)
+    if not first_items:
+        return
+    yield first_items
+    if page_size and len(first_items) < page_size:
+        return
+
+    last = start + max_pages - 1
+    if total_pages:
+        last = min(last, start + total_pages - 1)
+
+    with SourcePoolExecutor(max_workers=max(1, window)) as executor:
+        in_flight = deque()
+        next_page = start + 1
+        while in_flight or next_page <= last:
+            if budget.expired():
+                print(f'    ⏱ Time slice used up; stopping at page {next_page - len(in_flight)}')
+                return
+            while next_page <= last and len(in_flight) < window:
+                in_flight.append(executor.submit(_safe_fetch, fetch_page, next_page))
+                next_page += 1
+            page_items, _ = in_flight.popleft().result()
+            if page_items is None and total_pages:
+                continue  # Known page count: skip a failed page
+            if not page_items:
+                return  # Unknown page count: stop at the first gap
+            yield page_items
+            if page_size and len(page_items) < page_size:
+                return
+
+
+def paginate(
+    fetch_page: PageFetcher,
+    start: int = 1,
+    max_pages: int = 29,
+    window: int = 4,
+    page_size: Optional[int] = None
+) -> List:
+    """
+    Fetch all listing pages and return their items in page order.
+
+    Args: see iter_pages()
+
+    Returns:
+        Flat list of items from all pages
+    """
+    return [item for page in iter_pages(fetch_page, start, max_pages, window, page_size) for item in page]
@@ -0,0 +1,104 @@
+"""
+HTML Parsing Helpers
+====================
+One place to choose how scrapers parse HTML.
+
+- ``make_soup()`` builds BeautifulSoup trees with the lxml backend (falls
+  back to html.parser if lxml is missing) and can restrict the tree to the
+  elements a scraper actually reads:
+    * ``ANCHORS``   - only ``<a>`` elements (and their contents)
+    * ``HEAD_META`` - only ``<title>``, ``<meta>`` and JSON-LD scripts
+- ``parsed()`` is the same as a context manager that decomposes the tree
+  on exit, so large pages are freed as soon as a scraper is done with them.
+- ``html_to_text()`` extracts visible text straight from an lxml tree,
+  without building a soup at all.
+
+Restricted trees have no parents beyond the kept elements, so scrapers that
+climb from a link to its card (TechGig, the Kaggle listing) use a full tree.
+
+Measure with ``python -m scraper.bench_parsing`` (see that module).
+"""
+from contextlib import contextmanager
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+    PARSER = 'lxml'
+except ImportError:  # pragma: no cover - lxml is in requirements.txt
+    lxml = None
+    PARSER = 'html.parser'
+
+# Elements whose text is not visible (matches BeautifulSoup.get_text())
+_NON_TEXT = {'script', 'style', 'template'}
+
+
+def _is_head_meta(tag) -> bool:
+    if tag.name in ('title', 'meta'):
+        return True
+    return tag.name == 'script' and tag.get('type') == 'application/ld+json'
+
+
+ANCHORS = SoupStrainer('a')
+HEAD_META = SoupStrainer(lambda name: name in ('title', 'meta', 'script'))
+
+
+def make_soup(markup, only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse HTML with the fast backend.
+
+    Args:
+        markup: HTML text or bytes
+        only: Restrict the tree (ANCHORS, HEAD_META or any SoupStrainer)
+    """
+    soup = BeautifulSoup(markup or '', PARSER, parse_only=only)
+    if only is HEAD_META:
+        # Strainers match on tag name only; drop non-JSON-LD scripts here
+        for tag in soup.find_all('script'):
+            if not _is_head_meta(tag):
+                tag.decompose()
+    return soup
+
+
+@contextmanager
+def parsed(markup, only: Optional[SoupStrainer] = None):
+    """make_soup() that frees the tree when the block exits."""
+    soup = make_soup(markup, only)
+    try:
+        yield soup
+    finally:
+        soup.decompose()
+
+
+def html_to_text(markup) -> str:
+    """
+    Visible text of an HTML document or fragment, space separated.
+
+    Equivalent to ``BeautifulSoup(markup).get_text(separator=' ', strip=True)``.
+    """
+    if not markup:
+        return ''
+    if lxml is None:
+        return BeautifulSoup(markup, PARSER).get_text(separator=' ', strip=True)
+    try:
+        root = lxml.html.fromstring(markup)
+    except (etree.ParserError, ValueError):
+        return BeautifulSoup(markup, PARSER).get_text(separator=' ', strip=True)
+
+    # Document-order walk: element text, children, then the element's tail.
+    # Comments have a non-string tag; their text is skipped but not their tail.
+    parts = []
+    stack = [(root, False)]
+    while stack:
+        el, closing = stack.pop()
+        if closing:
+            if el is not root and el.tail:
+                parts.append(el.tail)
+            continue
+        if isinstance(el.tag, str) and el.tag not in _NON_TEXT and el.text:
+            parts.append(el.text)
+        stack.append((el, True))
+        stack.extend((child, False) for child in reversed(el))
+    return ' '.join(p.strip() for p in parts if p.strip())
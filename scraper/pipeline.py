@@ -0,0 +1,110 @@
+"""
+Streaming Scrape Pipeline
+=========================
+Moves events through listing → details → normalize → save as they arrive.
+
+The large API sources (Devpost, Devfolio, Unstop) used to collect every
+listing page, then fetch every detail page into a map, and only then
+normalize and save. Peak memory grew with the source and nothing reached
+the database until the very end. They now stream:
+
+    iter_pages()  -->  stream_details()  -->  normalize + writer.save()
+    (``window`` pages    (``max_pending`` detail   (the scraper's loop; the
+     in flight)           fetches in flight)        writer flushes by size/age)
+
+Every stage holds a bounded number of items and only pulls from the stage
+before it when it has room, so a slow detail host or database slows the
+listing down instead of letting items pile up in memory. Events are written
+as soon as the writer's batch fills or ``scrape_run.write_max_delay_s``
+has passed (see writer.py).
+
+Time spent waiting on listing pages and on detail fetches is recorded as
+the source's ``listing`` and ``details`` phases (see telemetry.py).
+
+When the source's run-budget slice is used up (see budget.py), no more
+listings are pulled; fetches already started are finished and yielded, so
+everything fetched so far is still saved.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from scraper import budget
+from scraper.telemetry import SourcePoolExecutor, telemetry
+
+
+def stream_details(
+    items: Iterable[Tuple[Any, Any]],
+    fetch_func: Callable[[Any], Optional[Dict]],
+    max_workers: int = 20,
+    max_pending: Optional[int] = None,
+    progress_every: int = 0
+) -> Iterator[Tuple[Any, Optional[Dict]]]:
+    """
+    Fetch details for a stream of listings, yielding each as soon as it is ready.
+
+    Args:
+        items: (listing, key) pairs; ``fetch_func(key)`` fetches the details.
+               A key of None means no details are needed and the listing is
+               passed straight through.
+        fetch_func: Returns the details dict (or None) for a key
+        max_workers: Detail fetches running at once
+        max_pending: Detail fetches started but not yet consumed
+                     (default: twice ``max_workers``)
+        progress_every: Print progress after every N fetched details (0 = quiet)
+
+    Yields:
+        (listing, details or None) in completion order. A failed fetch yields
+        None, so the listing can still be saved from its listing data.
+    """
+    max_pending = max(1, max_pending or 2 * max_workers)
+    items = iter(items)
+    pending = {}
+    exhausted = preempted = False
+    fetched = failed = 0
+    listing_s = details_s = 0.0
+    try:
+        with SourcePoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                # Pull more listings only while there is room for their fetches
+                while not exhausted and len(pending) < max_pending:
+                    if budget.expired():
+                        exhausted = preempted = True
+                        break
+                    start = time.monotonic()
+                    try:
+                        item, key = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    finally:
+                        listing_s += time.monotonic() - start
+                    if key is None:
+                        yield item, None
+                    else:
+                        pending[executor.submit(fetch_func, key)] = item
+                if not pending:
+                    break
+
+                start = time.monotonic()
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                details_s += time.monotonic() - start
+                for future in done:
+                    item = pending.pop(future)
+                    try:
+                        details = future.result()
+                    except Exception:
+                        details = None
+                    fetched += 1
+                    if not details:
+                        failed += 1
+                    if progress_every and fetched % progress_every == 0:
+                        print(f'    Fetched {fetched} details...')
+                    yield item, details
+    finally:
+        telemetry.add_time('listing', listing_s)
+        telemetry.add_time('details', details_s)
+    if failed:
+        print(f'    ⚠ No details for {failed}/{fetched} items (saved from listing data)')
+    if preempted:
+        print(f'    ⏱ Time slice used up; stopped after {fetched} details')
@@ -0,0 +1,136 @@
+"""
+Adaptive Host Rate Limiting
+===========================
+Per-host-group concurrency and request rate that adapt to the server.
+
+Each host group in the Fetcher gets an ``AdaptiveLimiter``:
+
+- **Concurrency (AIMD)**: at most ``limit`` requests are in flight. Every
+  ``limit`` successful responses raise the limit by one, up to
+  ``max_connections``; a throttled response (429, 5xx, timeout) halves it,
+  down to ``min_connections``. Decreases are spaced by a cooldown, so a
+  burst of 429s from requests that were already in flight counts once.
+- **Rate (token bucket)**: optionally at most ``rate_per_s`` requests per
+  second, with bursts of up to ``burst``.
+- **Pause**: a ``Retry-After`` on a throttled response stops the whole
+  group from starting new requests until it has passed.
+
+Configured per site in the ``http`` block of config/websites.json::
+
+    "http": {"hosts": ["devpost.com"], "max_connections": 20,
+             "min_connections": 2, "rate_per_s": 10, "burst": 20}
+
+Retry policy (attempts, backoff) lives in ``http.retry``; see fetcher.py.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit plus optional token bucket for one host group."""
+
+    def __init__(
+        self,
+        max_connections: int,
+        min_connections: int = 1,
+        rate_per_s: Optional[float] = None,
+        burst: Optional[int] = None,
+        cooldown_s: float = 2.0
+    ):
+        self.max_connections = max(1, max_connections)
+        self.min_connections = max(1, min(min_connections, self.max_connections))
+        self.limit = float(self.max_connections)
+        self.rate = rate_per_s
+        self.capacity = float(burst or max(1, int(rate_per_s or 1)))
+        self.cooldown_s = cooldown_s
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._successes = 0
+        self._tokens = self.capacity
+        self._refilled = time.monotonic()
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self.stats = {'throttled': 0, 'lowest_limit': self.max_connections}
+
+    def _take_token(self, now: float) -> float:
+        """Take a token if one is available; else seconds until the next one."""
+        if not self.rate:
+            return 0.0
+        self._tokens = min(self.capacity, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may start."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                    continue
+                if self._in_flight >= int(self.limit):
+                    self._cond.wait()
+                    continue
+                wait = self._take_token(now)
+                if wait:
+                    self._cond.wait(wait)
+                    continue
+                self._in_flight += 1
+                return
+
+    def release(self, throttled: bool = False, retry_after: Optional[float] = None):
+        """
+        Finish a request and adapt the limit.
+
+        Args:
+            throttled: The server pushed back (429, 5xx, timeout)
+            retry_after: Seconds the server asked us to wait, if any
+        """
+        with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.stats['throttled'] += 1
+                self._successes = 0
+                if now - self._last_decrease >= self.cooldown_s:
+                    self.limit = max(self.min_connections, self.limit / 2)
+                    self._last_decrease = now
+                    self.stats['lowest_limit'] = min(self.stats['lowest_limit'], int(self.limit))
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif self.limit < self.max_connections:
+                self._successes += 1
+                if self._successes >= int(self.limit):
+                    self.limit = min(self.max_connections, self.limit + 1)
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            return {'limit': int(self.limit), 'max': self.max_connections, **self.stats}
+
+
+def retry_after_seconds(value: Optional[str], cap: float) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date), capped at ``cap``."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(0.0, seconds), cap)
+
+
+def backoff_delay(attempt: int, base_s: float, max_s: float) -> float:
+    """Exponential backoff with full jitter for retry number ``attempt`` (0-based)."""
+    return random.uniform(0, min(max_s, base_s * (2 ** attempt)))
@@ -0,0 +1,311 @@
+"""
+Raw Payload Store
+=================
+Keeps the raw scraped records so events can be re-normalized offline.
+
+Scrapers build a raw dict per event and pass it straight to
+``DataNormalizer.normalize()``; once the event is saved the raw dict is
+gone, so a fix to the normalizer (prize, date or tag parsing) used to mean
+scraping every site again. During a run, every raw dict handed to the
+normalizer is also appended to a compressed, append-only NDJSON file per
+source and run::
+
+    data/raw/<Source>/<run_id>.ndjson.gz       {"run": ..., "at": ..., "raw": {...}}
+
+The run ID is the checkpoint run ID (checkpoint.py), so a resumed run adds
+to the same run. Each process writing a source opens its own part
+(``<run_id>.2.ndjson.gz``, ...), which covers resumed runs and browser
+worker processes (browser_workers.py). Files are flushed every
+``flush_every_s`` seconds and whenever the event writer flushes, so a
+killed run keeps everything up to its last flush; the reader stops at the
+truncated end.
+
+``python main.py renormalize`` streams the files back through
+``DataNormalizer`` in worker processes (one file per task) and bulk-upserts
+the events as each file is done. When an event appears in several runs,
+only its latest record is normalized and written, with that record's
+``scraped_at``, so the rebuilt database matches what the runs saved, with
+the current normalizer. Unchanged
+listings are not normalized again on incremental runs (incremental.py),
+so their newest record is in an earlier run's file; keep the files of
+earlier runs.
+
+Options live in ``scrape_run.raw_store`` of config/websites.json::
+
+    "raw_store": {"enabled": true, "dir": "data/raw", "flush_every_s": 5}
+"""
+import gzip
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from scraper.settings import run_config
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+_FILE = re.compile(r'(?P<run>[^.]+)(?:\.(?P<part>\d+))?\.ndjson\.gz$')
+
+
+def store_config() -> Dict:
+    return run_config().get('raw_store', {})
+
+
+def raw_dir() -> Path:
+    return PROJECT_ROOT / store_config().get('dir', 'data/raw')
+
+
+class RawStore:
+    """Appends raw records of one run to per-source NDJSON.gz files."""
+
+    def __init__(self, directory: Path, run_id: str, flush_every_s: Optional[float] = None):
+        self.path = Path(directory)
+        self.run_id = run_id
+        self.flush_every_s = flush_every_s if flush_every_s is not None else store_config().get('flush_every_s', 5)
+        self._files: Dict[str, gzip.GzipFile] = {}
+        self._lock = threading.Lock()
+        self._flushed = time.monotonic()
+        self.stats = {'records': 0, 'failed': 0}
+
+    def _open(self, source: str) -> gzip.GzipFile:
+        """This process's part of the run's file for ``source``."""
+        folder = self.path / source
+        folder.mkdir(parents=True, exist_ok=True)
+        part = 1
+        while True:
+            name = f'{self.run_id}.ndjson.gz' if part == 1 else f'{self.run_id}.{part}.ndjson.gz'
+            try:
+                # Exclusive create: never append to a part another process owns
+                # or one a killed run left truncated
+                return gzip.GzipFile(fileobj=open(folder / name, 'xb'), mode='wb')
+            except FileExistsError:
+                part += 1
+
+    def save(self, source: str, raw: Dict):
+        """Append one raw record; never fails the scrape."""
+        try:
+            line = json.dumps({'run': self.run_id, 'at': datetime.utcnow().isoformat(), 'raw': raw},
+                              ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            self.stats['failed'] += 1
+            return
+        with self._lock:
+            out = self._files.get(source)
+            if out is None:
+                out = self._files[source] = self._open(source)
+            out.write(line.encode('utf-8') + b'\n')
+            self.stats['records'] += 1
+            if time.monotonic() - self._flushed >= self.flush_every_s:
+                self._flush()
+
+    def _flush(self):
+        for out in self._files.values():
+            out.flush()
+            out.fileobj.flush()
+        self._flushed = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            for out in self._files.values():
+                fileobj = out.fileobj
+                out.close()
+                fileobj.close()
+            self._files = {}
+
+
+class RecordingNormalizer:
+    """Normalizer wrapper that stores each raw record while a RawStore is active."""
+
+    def __init__(self, normalizer):
+        self._normalizer = normalizer
+
+    def __getattr__(self, name):
+        return getattr(self._normalizer, name)
+
+    def normalize(self, raw_data: Dict, source: str):
+        if _active is not None:
+            _active.save(source, raw_data)
+        return self._normalizer.normalize(raw_data, source)
+
+
+# Store of the run in progress in this process, if any
+_active: Optional[RawStore] = None
+
+
+def activate(store: Optional[RawStore]):
+    global _active
+    _active = store
+
+
+def active() -> Optional[RawStore]:
+    return _active
+
+
+def close():
+    """Close the active store's files and deactivate it."""
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+# ---- Re-normalization ----
+
+def _file_order(path: Path) -> Tuple[str, int]:
+    match = _FILE.match(path.name)
+    return (match.group('run'), int(match.group('part') or 1)) if match else (path.name, 0)
+
+
+def raw_files(directory: Optional[Path] = None, sources: Optional[List[str]] = None) -> List[Tuple[str, Path]]:
+    """(source, file) pairs, oldest run first within each source."""
+    root = Path(directory or raw_dir())
+    if not root.is_dir():
+        return []
+    wanted = {s.lower() for s in sources} if sources else None
+    files = []
+    for folder in sorted(p for p in root.iterdir() if p.is_dir()):
+        if wanted and folder.name.lower() not in wanted:
+            continue
+        files += [(folder.name, path) for path in sorted(folder.glob('*.ndjson.gz'), key=_file_order)]
+    return files
+
+
+def iter_records(path: Path, stats: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    """Records of one file; stops quietly at a truncated end (killed run)."""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as lines:
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    if stats is not None:
+                        stats['bad_lines'] = stats.get('bad_lines', 0) + 1
+    except (EOFError, zlib.error, gzip.BadGzipFile):
+        if stats is not None:
+            stats['truncated'] = stats.get('truncated', 0) + 1
+
+
+def _index_file(source: str, path: str) -> Tuple[List[Tuple[Optional[str], str]], Dict[str, int]]:
+    """Worker task: (event ID, record time) of every line of one raw file, and counts."""
+    from backend.utils.data_normalizer import DataNormalizer
+
+    normalizer = DataNormalizer()
+    stats = {'records': 0, 'failed': 0}
+    keys = []
+    for record in iter_records(Path(path), stats):
+        stats['records'] += 1
+        try:
+            keys.append((normalizer._generate_id(source, record['raw']), record.get('at') or ''))
+        except Exception:
+            stats['failed'] += 1
+            keys.append((None, ''))
+    return keys, stats
+
+
+def _normalize_file(source: str, path: str, lines: Set[int]) -> Tuple[List, int]:
+    """Worker task: normalize the records on ``lines`` of one raw file; returns (events, failed)."""
+    from backend.utils.data_normalizer import DataNormalizer
+
+    normalizer = DataNormalizer()
+    events, failed = [], 0
+    for line, record in enumerate(iter_records(Path(path))):
+        if line not in lines:
+            continue
+        try:
+            event = normalizer.normalize(record['raw'], source)
+        except Exception:
+            failed += 1
+            continue
+        event.scraped_at = record.get('at') or event.scraped_at
+        events.append(event)
+    return events, failed
+
+
+def _in_order(pool: ProcessPoolExecutor, func, tasks: List[tuple], ahead: int) -> Iterator:
+    """Results of ``func(*task)`` in task order, with at most ``ahead`` tasks in flight."""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(func, *task))
+        if len(pending) >= ahead:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def renormalize(
+    target,
+    directory: Optional[Path] = None,
+    sources: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 500
+) -> Dict[str, int]:
+    """
+    Rebuild events from the stored raw records with the current normalizer.
+
+    Two passes over the files, both in worker processes: the first only
+    indexes event ID -> newest record (time, then later file and line); the
+    second normalizes each file's winning records, which are upserted in
+    batches as each file comes back. Memory holds the index and a few
+    files' events, not the whole history.
+
+    Args:
+        target: Database manager to upsert into (TiDB or SQLite)
+        directory: Raw store directory (default: scrape_run.raw_store.dir)
+        sources: Only these source folders (case-insensitive)
+        workers: Normalizer processes (default: CPU count)
+        batch_size: Events per bulk upsert
+
+    Returns:
+        Counts: files, records, events (written), duplicates, failed, truncated
+    """
+    files = raw_files(directory, sources)
+    stats = {'files': len(files), 'records': 0, 'events': 0, 'duplicates': 0,
+             'failed': 0, 'truncated': 0, 'bad_lines': 0}
+    if not files:
+        return stats
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+    tasks = [(source, str(path)) for source, path in files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Newest record of each event: (time, file, line)
+        newest: Dict[str, Tuple[str, int, int]] = {}
+        for rank, (keys, counts) in enumerate(_in_order(pool, _index_file, tasks, workers * 2)):
+            for key, n in counts.items():
+                stats[key] = stats.get(key, 0) + n
+            for line, (event_id, at) in enumerate(keys):
+                if event_id is None:
+                    continue
+                if event_id in newest:
+                    stats['duplicates'] += 1
+                newest[event_id] = max(newest.get(event_id, ('', -1, -1)), (at, rank, line))
+
+        winners: Dict[int, Set[int]] = defaultdict(set)
+        for _, rank, line in newest.values():
+            winners[rank].add(line)
+        del newest
+
+        tasks = [task + (winners.pop(rank, set()),) for rank, task in enumerate(tasks)]
+        for events, failed in _in_order(pool, _normalize_file, tasks, workers * 2):
+            stats['failed'] += failed
+            for start in range(0, len(events), batch_size):
+                stats['events'] += target.save_event_batch(events[start:start + batch_size])
+    return stats
+
+
+def print_renormalize_report(stats: Dict[str, int], elapsed: float):
+    print(f"  Re-normalized {stats['records']} raw records from {stats['files']} file(s) in {elapsed:.1f}s: "
+          f"{stats['events']} events written ({stats['duplicates']} older copies skipped)")
+    if stats['failed'] or stats['truncated'] or stats['bad_lines']:
+        print(f"  ⚠ {stats['failed']} records failed to normalize, {stats['truncated']} truncated file(s), "
+              f"{stats['bad_lines']} unreadable line(s)")
@@ -0,0 +1,115 @@
+"""
+Scraper Registry
+================
+Which sources exist and how to run them, without importing any scraper.
+
+Each source is registered with its metadata and a ``"module:function"``
+target. Nothing is imported, and no database or browser is touched, until
+a source is actually run (``SourceSpec.load()``), so ``main.py list`` or a
+single-site scrape start without loading every scraper.
+
+- name and priority tier come from config/websites.json
+- cost (seconds per saved event) is measured from run history by the
+  scheduler (see scheduler.py)
+
+Sources outside this file are discovered from the config. A site whose
+block has a ``"scraper": "package.module:function"`` entry is registered
+with the site's ``method``, e.g.::
+
+    "devnovate": {"name": "Devnovate", "method": "http",
+                  "scraper": "scraper.plugins.devnovate:scrape_devnovate"}
+"""
+import importlib
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from scraper.settings import load_config, site_config
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """How to run one source."""
+    key: str                          # websites.json key, e.g. "devpost"
+    target: str                       # "module:function" returning events saved
+    method: str = "http"              # "http" or "browser"
+    incremental: bool = False         # Takes force= (skips unchanged listings)
+    full_run: bool = True             # Part of a full / scheduled run
+
+    @property
+    def name(self) -> str:
+        return site_config(self.key).get('name', self.key)
+
+    @property
+    def tier(self) -> Optional[str]:
+        for tier, keys in load_config().get('scraping_priority', {}).items():
+            if self.key in keys:
+                return tier
+        return None
+
+    def load(self) -> Callable:
+        """Import and return the scrape function."""
+        module, _, func = self.target.partition(':')
+        return getattr(importlib.import_module(module), func)
+
+    def job_func(self, force: bool = False) -> Callable[[], int]:
+        """Zero-argument callable that runs the source."""
+        func = self.load()
+        return partial(func, force=force) if self.incremental else func
+
+
+_REGISTRY: Dict[str, SourceSpec] = {}
+_discovered = False
+
+
+def register(key: str, target: str, method: str = "http", incremental: bool = False,
+             full_run: bool = True) -> SourceSpec:
+    """Add (or replace) a source; returns its spec."""
+    spec = SourceSpec(key, target, method, incremental, full_run)
+    _REGISTRY[key] = spec
+    return spec
+
+
+def _discover():
+    """Register sources declared by a ``scraper`` entry in websites.json."""
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+    for key, site in load_config().get('websites', {}).items():
+        target = site.get('scraper')
+        if target and key not in _REGISTRY:
+            register(key, target, site.get('method', 'http'))
+
+
+def sources(full_run: bool = False) -> List[SourceSpec]:
+    """Registered sources in default run order (only full-run ones if ``full_run``)."""
+    _discover()
+    return [spec for spec in _REGISTRY.values() if spec.full_run or not full_run]
+
+
+def get(key: str) -> SourceSpec:
+    """Spec of one source; ValueError if no scraper is registered for it."""
+    _discover()
+    if key not in _REGISTRY:
+        raise ValueError(f"No scraper for '{key}' (available: {', '.join(_REGISTRY)})")
+    return _REGISTRY[key]
+
+
+# Built-in sources, in the order a full run starts them
+_SCRAPE_ALL = 'scraper.scrape_all'
+register('devpost', f'{_SCRAPE_ALL}:scrape_devpost', incremental=True)
+register('devfolio', f'{_SCRAPE_ALL}:scrape_devfolio', incremental=True)
+register('unstop', f'{_SCRAPE_ALL}:scrape_unstop', incremental=True)
+register('mlh', f'{_SCRAPE_ALL}:scrape_mlh')
+register('superteam', f'{_SCRAPE_ALL}:scrape_superteam')
+register('dorahacks', f'{_SCRAPE_ALL}:scrape_dorahacks', 'browser')
+register('hackerearth', f'{_SCRAPE_ALL}:scrape_hackerearth', 'browser')
+register('hackquest', f'{_SCRAPE_ALL}:scrape_hackquest', 'browser')
+register('devdisplay', f'{_SCRAPE_ALL}:scrape_devdisplay', 'browser')
+register('mycareernet', f'{_SCRAPE_ALL}:scrape_mycareernet', 'browser')
+register('kaggle', f'{_SCRAPE_ALL}:scrape_kaggle', 'browser')
+# Only run on request (python main.py scrape --site ...)
+register('techgig', f'{_SCRAPE_ALL}:scrape_techgig', 'browser', full_run=False)
+register('geeksforgeeks', f'{_SCRAPE_ALL}:scrape_geeksforgeeks', 'browser', full_run=False)
+register('hackculture', f'{_SCRAPE_ALL}:scrape_hackculture', 'browser', full_run=False)
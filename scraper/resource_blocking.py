@@ -0,0 +1,134 @@
+"""
+Browser Resource Blocking
+=========================
+Request interception for pooled Playwright pages.
+
+The browser scrapers only read ``page.content()``, so images, media, fonts
+and third-party trackers are pure overhead: they inflate transfer size and
+hold back ``load`` / ``networkidle``. Pages opened through the BrowserPool
+abort those requests unless the site allows them.
+
+Defaults live in ``browser_config.pool.blocking`` of config/websites.json;
+a site can opt back in to specific resource types or hosts::
+
+    "browser": {"allow_resource_types": ["font"], "allow_hosts": ["gstatic.com"]}
+
+or switch blocking off entirely with ``"block_resources": false``. Setting
+``HACKFIND_BROWSER_BLOCK=0`` disables blocking for a whole run, which is how
+the "full" baseline in the report is measured.
+
+Per-source transfer size and load time are kept for the last run in each
+mode (.cache/browser_metrics.json) so the report can show the saving.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from scraper.settings import browser_pool_config, site_config
+
+BLOCK_ENV = 'HACKFIND_BROWSER_BLOCK'
+METRICS_PATH = Path(__file__).parent.parent / '.cache' / 'browser_metrics.json'
+
+DEFAULT_BLOCKED_TYPES = ['image', 'media', 'font']
+DEFAULT_BLOCKED_HOSTS = [
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'googlesyndication.com', 'facebook.net', 'hotjar.com', 'clarity.ms',
+    'segment.io', 'mixpanel.com', 'amplitude.com', 'fullstory.com',
+    'intercom.io', 'nr-data.net', 'snap.licdn.com', 'ads-twitter.com',
+]
+
+
+class ResourceFilter:
+    """Decides which requests a page for a given site may make."""
+
+    def __init__(self, site: Optional[str] = None, config: Optional[Dict] = None):
+        cfg = (config if config is not None else browser_pool_config()).get('blocking', {})
+        site_browser = site_config(site).get('browser', {}) if site else {}
+
+        enabled = cfg.get('enabled', True) and site_browser.get('block_resources', True)
+        if os.environ.get(BLOCK_ENV, '').lower() in ('0', 'false', 'no'):
+            enabled = False
+        self.enabled = enabled
+
+        allow_types = set(site_browser.get('allow_resource_types', []))
+        allow_hosts = set(site_browser.get('allow_hosts', []))
+        self.blocked_types = set(cfg.get('resource_types', DEFAULT_BLOCKED_TYPES)) - allow_types
+        self.blocked_hosts = tuple(h for h in cfg.get('hosts', DEFAULT_BLOCKED_HOSTS) if h not in allow_hosts)
+
+    @property
+    def mode(self) -> str:
+        return 'blocked' if self.enabled else 'full'
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        """True if a request of this type to this URL should be aborted."""
+        if not self.enabled:
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        host = (urlparse(url).hostname or '').lower()
+        return any(host == h or host.endswith('.' + h) for h in self.blocked_hosts)
+
+
+class BrowserMetrics:
+    """Thread-safe per-source page metrics for the current run."""
+
+    FIELDS = ('pages', 'requests', 'blocked', 'bytes', 'loads', 'load_s')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: Dict[str, Dict] = {}
+
+    def reset(self):
+        """Forget the current run (e.g. between scheduler runs)."""
+        with self._lock:
+            self._runs = {}
+
+    def record(self, site: str, mode: str, page_stats: Dict):
+        with self._lock:
+            entry = self._runs.setdefault(site, {'mode': mode, **{f: 0 for f in self.FIELDS}})
+            entry['pages'] += 1
+            for f in self.FIELDS[1:]:
+                entry[f] += page_stats.get(f, 0)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {site: dict(entry) for site, entry in self._runs.items()}
+
+    def merge(self, snapshot: Dict[str, Dict]):
+        """Add another process's snapshot (e.g. a browser worker) to this run."""
+        with self._lock:
+            for site, other in snapshot.items():
+                entry = self._runs.setdefault(site, {'mode': other['mode'], **{f: 0 for f in self.FIELDS}})
+                for f in self.FIELDS:
+                    entry[f] += other.get(f, 0)
+
+    def save(self, path: Path = METRICS_PATH) -> Dict[str, Dict]:
+        """
+        Merge this run into the stored metrics (last run per source and mode).
+
+        Returns:
+            The stored metrics before this run, for before/after comparison
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        previous = json.loads(json.dumps(stored))
+
+        for site, entry in self.snapshot().items():
+            stored.setdefault(site, {})[entry['mode']] = entry
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f, indent=2)
+        except OSError:
+            pass
+        return previous
+
+
+# Shared collector for all pools in this process
+browser_metrics = BrowserMetrics()
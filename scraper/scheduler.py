@@ -0,0 +1,194 @@
+"""
+Staleness Scheduler
+===================
+Decides which sources to scrape, in what order, and when to wake up next.
+
+A source is due once its data is older than its TTL: ``cache_ttl_hours`` of
+the site in config/websites.json, else the top-level ``cache_ttl_hours``.
+Sources whose last run failed are retried sooner
+(``scrape_run.schedule.retry_failed_hours``). The last scrape time and
+outcome come from ``scrape_metadata``, which every run refreshes.
+
+Due sources are ordered by priority tier (``scraping_priority``), then by
+their historical cost per saved event (median wall time / events over the
+recent ``scrape_runs``), cheapest first; sources with no history go first.
+Since the orchestrator starts jobs in list order, the valuable and cheap
+sources get the workers and browser lanes first.
+
+``run_daemon()`` repeats this forever, sleeping until the next source's TTL
+expires instead of running everything on a fixed cron.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Callable, Dict, List, Optional
+
+from scraper.settings import load_config, run_config, site_config
+
+
+@dataclass
+class SourcePlan:
+    """Scheduling state of one source."""
+    key: str
+    tier: int                         # 0 = highest priority
+    ttl_hours: float
+    last_scraped: Optional[datetime]
+    last_ok: bool
+    due_at: datetime
+    cost: Optional[float]             # seconds per saved event, None if unknown
+
+    def is_due(self, now: datetime) -> bool:
+        return self.due_at <= now
+
+
+def schedule_config() -> Dict:
+    return run_config().get('schedule', {})
+
+
+def tier_names() -> List[str]:
+    return list(load_config().get('scraping_priority', {}))
+
+
+def tier_rank(key: str) -> int:
+    """Position of the tier listing ``key``; unlisted sources rank last."""
+    for rank, sources in enumerate(load_config().get('scraping_priority', {}).values()):
+        if key in sources:
+            return rank
+    return len(tier_names())
+
+
+def resolve_tier(name: str) -> str:
+    """Full tier name for a prefix such as "tier_1"."""
+    for tier in tier_names():
+        if tier == name or tier.startswith(name):
+            return tier
+    raise ValueError(f"Unknown tier '{name}' (choose from {', '.join(tier_names())})")
+
+
+def ttl_hours(key: str) -> float:
+    return site_config(key).get('cache_ttl_hours', load_config().get('cache_ttl_hours', 6))
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def cost_per_event(runs: List[Dict], window: int = 5) -> Optional[float]:
+    """Median seconds per saved event over the last successful runs."""
+    costs = [r['wall_s'] / max(1, r['saved']) for r in runs if r.get('status') == 'ok'][:window]
+    return median(costs) if costs else None
+
+
+def plan_sources(db, keys: List[str], now: Optional[datetime] = None) -> List[SourcePlan]:
+    """Scheduling state for each source, in priority order."""
+    now = now or datetime.now()
+    retry_failed = schedule_config().get('retry_failed_hours', 1)
+    try:
+        history = db.get_scrape_runs(limit=50 * max(1, len(keys)))
+    except Exception:
+        history = []
+
+    plans = []
+    for key in keys:
+        meta = db.get_scrape_metadata(key) or {}
+        last = _as_datetime(meta.get('last_scraped'))
+        last_ok = bool(meta.get('success', True))
+        ttl = ttl_hours(key)
+        wait = ttl if last_ok else min(ttl, retry_failed)
+        plans.append(SourcePlan(
+            key=key,
+            tier=tier_rank(key),
+            ttl_hours=ttl,
+            last_scraped=last,
+            last_ok=last_ok,
+            due_at=last + timedelta(hours=wait) if last else now,
+            cost=cost_per_event([r for r in history if r['source'] == key]),
+        ))
+    # Unknown cost sorts first (-1) so new sources get measured
+    plans.sort(key=lambda p: (p.tier, -1 if p.cost is None else p.cost))
+    return plans
+
+
+def select_sources(
+    plans: List[SourcePlan],
+    tier: Optional[str] = None,
+    force: bool = False,
+    now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Sources to scrape now, in run order.
+
+    Args:
+        plans: Output of plan_sources()
+        tier: Only sources of this tier (name or prefix, e.g. "tier_1")
+        force: Ignore freshness and take every (tier) source
+    """
+    now = now or datetime.now()
+    if tier:
+        rank = tier_names().index(resolve_tier(tier))
+        plans = [p for p in plans if p.tier == rank]
+    return [p.key for p in plans if force or p.is_due(now)]
+
+
+def print_plan(plans: List[SourcePlan], now: Optional[datetime] = None):
+    """Print each source's freshness and when it is next due."""
+    now = now or datetime.now()
+    names = tier_names()
+    print(f'\n  {"Source":<14} {"Tier":<20} {"TTL":>5} {"Last scraped":<17} {"Due":<17} {"s/event":>8}')
+    print('  ' + '-' * 86)
+    for p in plans:
+        tier = names[p.tier] if p.tier < len(names) else '-'
+        last = p.last_scraped.strftime('%Y-%m-%d %H:%M') if p.last_scraped else 'never'
+        due = 'now' if p.is_due(now) else p.due_at.strftime('%Y-%m-%d %H:%M')
+        cost = f'{p.cost:.2f}' if p.cost is not None else '-'
+        flag = '' if p.last_ok else '  (last run failed)'
+        print(f'  {p.key:<14} {tier:<20} {p.ttl_hours:>4g}h {last:<17} {due:<17} {cost:>8}{flag}')
+
+
+def run_daemon(
+    db,
+    keys: List[str],
+    run: Callable[[List[str]], None],
+    tier: Optional[str] = None
+):
+    """
+    Scrape sources as their TTLs expire, forever (Ctrl+C stops).
+
+    Args:
+        db: Database manager (scrape_metadata / scrape_runs)
+        keys: Schedulable source keys
+        run: Called with the due sources, in order
+        tier: Restrict to one tier
+    """
+    cfg = schedule_config()
+    min_sleep = cfg.get('min_sleep_s', 60)
+    max_sleep = cfg.get('max_sleep_s', 6 * 3600)
+    try:
+        while True:
+            now = datetime.now()
+            plans = plan_sources(db, keys, now)
+            due = select_sources(plans, tier, now=now)
+            if due:
+                print(f'\n⏰ {now:%Y-%m-%d %H:%M} due: {", ".join(due)}')
+                run(due)
+                # Re-plan after a short pause: the run itself may have taken a while
+                time.sleep(min_sleep)
+                continue
+
+            if tier:
+                rank = tier_names().index(resolve_tier(tier))
+                plans = [p for p in plans if p.tier == rank]
+            next_due = min((p.due_at for p in plans), default=now + timedelta(seconds=max_sleep))
+            sleep_s = min(max_sleep, max(min_sleep, (next_due - datetime.now()).total_seconds()))
+            print(f'  💤 Nothing due; sleeping {sleep_s / 60:.0f} min (next: {next_due:%H:%M})')
+            time.sleep(sleep_s)
+    except KeyboardInterrupt:
+        print('\n  Scheduler stopped')
@@ -8,26 +8,56 @@ import sys
 import re
 import json
 import time
-import requests
+import atexit
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to path (parent of scraper dir)
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.database.tidb_manager import get_database_manager
+from backend.database.tidb_manager import LazyDatabase
 from backend.utils.data_normalizer import DataNormalizer
+from backend.utils.keyword_matcher import KeywordMatcher
+from scraper.fetcher import cache_reads, fetcher, note_cache_reads
+from scraper.incremental import ListingTracker
+from scraper.memo import canonical_url, memo, memoized, print_memo_report
+from scraper.pagination import iter_pages, page_count
+from scraper import budget, checkpoint, raw_store, registry, sharding
+from scraper.pipeline import stream_details
+from scraper.parsing import make_soup, html_to_text, ANCHORS, HEAD_META
+from scraper.settings import load_config, site_config
+from scraper.writer import EventWriter
+from scraper.browser_pool import browser_page, browser_pool, crawl_tabs
+from scraper.scrolling import scroll_until_stable
+from scraper.resource_blocking import browser_metrics
+from scraper.telemetry import SourcePoolExecutor, TimedNormalizer, phases, telemetry
+from scraper.orchestrator import ScrapeJob, run_scrapers, print_run_report, print_cache_report, print_browser_report, print_limiter_report
 
 # Initialize global objects
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0', 
     'Accept': 'application/json, text/html, */*'
 }
-db = get_database_manager()  # Auto-selects TiDB or SQLite based on USE_TIDB env
-normalizer = DataNormalizer()
+db = LazyDatabase()  # TiDB or SQLite (USE_TIDB env), connected on first use
+# Counts normalize() time per source; keeps the raw records of a run (see raw_store.py)
+normalizer = raw_store.RecordingNormalizer(TimedNormalizer(DataNormalizer()))
+writer = EventWriter(db)  # Batches saves; flushed before fingerprints and at the end of a run
+atexit.register(writer.flush)
+atexit.register(raw_store.close)
+
+# Listing fields that change when an event changes (see incremental.py)
+DEVPOST_SUMMARY_FIELDS = (
+    'title', 'submission_period_dates', 'prize_amount', 'registrations_count',
+    'online_only', 'displayed_location', 'themes'
+)
+UNSTOP_SUMMARY_FIELDS = ('title', 'start_date', 'end_date', 'region', 'prizes', 'registerCount')
+DEVFOLIO_SUMMARY_FIELDS = (
+    'name', 'starts_at', 'ends_at', 'prize_amount', 'participants_count',
+    'is_online_event', 'location'
+)
 
 # ==========================================
 # Metadata Extraction Helpers
@@ -37,49 +67,48 @@ def clean_html(html_text):
     """Remove HTML tags and clean text"""
     if not html_text:
         return ""
-    soup = BeautifulSoup(html_text, 'html.parser')
-    text = soup.get_text(separator=' ', strip=True)
+    text = html_to_text(html_text)
     # Remove extra whitespace
     text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
+# Default keyword sets; the "tagging" block of config/websites.json overrides them
+TAG_KEYWORDS = [
+    'AI', 'ML', 'machine learning', 'blockchain', 'web3', 'crypto',
+    'mobile', 'app', 'android', 'ios', 'web', 'frontend', 'backend',
+    'cloud', 'security', 'cybersecurity', 'data', 'IoT', 'AR', 'VR',
+    'gaming', 'fintech', 'healthcare', 'education', 'sustainability',
+    'beginner', 'student', 'online', 'virtual', 'remote'
+]
+THEME_KEYWORDS = [
+    'AI', 'Machine Learning', 'Web3', 'Blockchain', 'Cloud', 
+    'Security', 'FinTech', 'Healthcare', 'IoT', 'AR/VR',
+    'Mobile', 'Open Innovation', 'Social Good', 'Education'
+]
+
+@lru_cache(maxsize=None)
+def keyword_matcher(kind):
+    """Compiled matcher for the 'tags' or 'themes' keyword set (built once)."""
+    defaults = {'tags': TAG_KEYWORDS, 'themes': THEME_KEYWORDS}
+    return KeywordMatcher(load_config().get('tagging', {}).get(kind, defaults[kind]))
+
 def extract_tags_from_text(text, max_tags=10):
-    """Extract relevant keywords as tags from text"""
-    if not text:
-        return []
-    
-    # Common tech keywords to look for
-    keywords = [
-        'AI', 'ML', 'machine learning', 'blockchain', 'web3', 'crypto',
-        'mobile', 'app', 'android', 'ios', 'web', 'frontend', 'backend',
-        'cloud', 'security', 'cybersecurity', 'data', 'IoT', 'AR', 'VR',
-        'gaming', 'fintech', 'healthcare', 'education', 'sustainability',
-        'beginner', 'student', 'online', 'virtual', 'remote'
-    ]
-    
-    text_lower = text.lower()
-    found_tags = []
-    
-    for kw in keywords:
-        if kw.lower() in text_lower and kw not in found_tags:
-            found_tags.append(kw)
-            if len(found_tags) >= max_tags:
-                break
-    
-    return found_tags
+    """Extract relevant keywords as tags from text (whole words, one pass)"""
+    return keyword_matcher('tags').find_all(text, limit=max_tags)
 
 # ==========================================
 # Detail Page Scrapers
 # ==========================================
 
+@memoized('devpost', canonical_url)
 def scrape_devpost_details(event_url):
     """Scrape description, tags, themes from Devpost event page"""
     try:
-        r = requests.get(event_url, headers=headers, timeout=10)
+        r = fetcher.get(event_url, headers=headers, timeout=10, cache='devpost')
         if r.status_code != 200:
             return None
         
-        soup = BeautifulSoup(r.text, 'html.parser')
+        soup = make_soup(r.text)
         
         # Description from .content or fallback to large text blocks
         description = ""
@@ -125,6 +154,7 @@ def scrape_devpost_details(event_url):
         # Scrape Team Size from Text
         team_size = None
         ts_text = soup.get_text()
+        soup.decompose()  # Only the text is needed from here on
         ts_match = re.search(r'Team\s*Size:?\s*(\d+)(?:\s*[-–]\s*(\d+))?', ts_text, re.IGNORECASE)
         if ts_match:
             min_s = ts_match.group(1)
@@ -174,11 +204,11 @@ def scrape_devfolio_details(event_slug):
     """Scrape description and domains from Devfolio event page"""
     try:
         url = f"https://{event_slug}.devfolio.co/overview"
-        r = requests.get(url, headers=headers, timeout=10)
+        r = fetcher.get(url, headers=headers, timeout=10)
         if r.status_code != 200:
             return None
         
-        soup = BeautifulSoup(r.text, 'html.parser')
+        soup = make_soup(r.text)
         
         # Get page text, skip nav/header elements
         # Remove nav and header elements first
@@ -195,17 +225,9 @@ def scrape_devfolio_details(event_slug):
         description = " ".join(paragraphs[:10])[:1000]
         
         # Themes/Domains - look for domain keywords in full page text
-        themes = []
         page_text = soup.get_text()
-        domain_keywords = [
-            'AI', 'Machine Learning', 'Web3', 'Blockchain', 'Cloud', 
-            'Security', 'FinTech', 'Healthcare', 'IoT', 'AR/VR',
-            'Mobile', 'Open Innovation', 'Social Good', 'Education'
-        ]
-        for kw in domain_keywords:
-            if kw.lower() in page_text.lower():
-                themes.append(kw)
-        themes = themes[:10]
+        soup.decompose()  # Only the text is needed from here on
+        themes = keyword_matcher('themes').find_all(page_text, limit=10)
         
         # Extract tags from description
         tags = extract_tags_from_text(description)
@@ -214,6 +236,7 @@ def scrape_devfolio_details(event_slug):
     except Exception as e:
         return None
 
+@memoized('unstop')
 def fetch_unstop_details_api(event_id):
     """
     Fetch details for a single event ID from Unstop API.
@@ -221,7 +244,7 @@ def fetch_unstop_details_api(event_id):
     """
     try:
         api_url = f"https://unstop.com/api/public/competition/{event_id}?round_lang=1"
-        r = requests.get(api_url, headers=headers, timeout=10)
+        r = fetcher.get(api_url, headers=headers, timeout=10, cache='unstop')
         
         if r.status_code != 200:
             return None
@@ -240,11 +263,9 @@ def fetch_unstop_details_api(event_id):
         
         # Description
         raw_desc = comp.get('details', '')
-        # Simple clean since we don't have the clean_html helper here, use BS4
         description = ""
         if raw_desc:
-            soup = BeautifulSoup(raw_desc, 'html.parser')
-            description = soup.get_text(separator=' ', strip=True)[:3000]
+            description = html_to_text(raw_desc)[:3000]
             
         # Team Size
         ts_min = None
@@ -291,24 +312,44 @@ def fetch_unstop_details_api(event_id):
 # Parallel Scraper Helpers
 # ==========================================
 
-def fetch_details_parallel(items, fetch_func, max_workers=20):
+# Secondary requests issued from inside detail workers (e.g. Devfolio /prizes).
+# Kept separate from the detail worker pools so workers never wait on themselves.
+_subrequests = SourcePoolExecutor(max_workers=16, thread_name_prefix='subrequest')
+
+def fetch_details_parallel(items, fetch_func, max_workers=20, progress_every=0):
     """
     Fetch details for a list of items in parallel.
     items: list of dicts with 'url_or_id' key
     fetch_func: function that takes url_or_id and returns dict
+    progress_every: print progress after every N completed items (0 = quiet)
+    
+    Throttling and retries happen in the fetcher (per-host adaptive limit);
+    items still without details afterwards are counted and reported. Once
+    the source's run-budget slice is used up, the remaining items are not
+    fetched.
     """
+    def fetch(key):
+        return None if budget.expired() else fetch_func(key)
+
     results = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_item = {executor.submit(fetch_func, item['url_or_id']): item for item in items}
+    failed = 0
+    with SourcePoolExecutor(max_workers=max_workers) as executor:
+        future_to_item = {executor.submit(fetch, item['url_or_id']): item for item in items}
         
-        for future in as_completed(future_to_item):
+        for done, future in enumerate(as_completed(future_to_item), 1):
             item = future_to_item[future]
             try:
                 data = future.result()
                 if data:
                     results[item['id']] = data
+                else:
+                    failed += 1
             except Exception as e:
-                pass
+                failed += 1
+            if progress_every and done % progress_every == 0:
+                print(f'    Fetched {done}/{len(items)} details...')
+    if failed:
+        print(f'    ⚠ No details for {failed}/{len(items)} items (saved from listing data)')
     return results
 
 # ==========================================
@@ -333,7 +374,7 @@ def parse_iso_timestamp(ts):
     except: return None
 
 def safe_get(url, timeout=30):
-    try: return requests.get(url, headers=headers, timeout=timeout)
+    try: return fetcher.get(url, headers=headers, timeout=timeout)
     except: return None
 
 def _extract_jsonld_events(data, base_url):
@@ -381,7 +422,7 @@ def _extract_jsonld_events(data, base_url):
 # API Scrapers
 # ==========================================
 
-def scrape_devpost():
+def scrape_devpost(force=False):
     print('\n📦 Devpost...')
     saved = 0
     # Regex patterns
@@ -389,42 +430,44 @@ def scrape_devpost():
     pat_same_month = re.compile(r'([A-Za-z]{3})\s+(\d{1,2})\s*-\s*(\d{1,2}),\s+(\d{4})')
     pat_diff_month = re.compile(r'([A-Za-z]{3})\s+(\d{1,2})\s*-\s*([A-Za-z]{3})\s+(\d{1,2}),\s+(\d{4})')
     
-    print(f'  Fetching pages...')
+    print(f'  Fetching pages and details...')
     
-    # 1. Collect all events first
-    total_hackathons = []
+    # 1. Stream listing pages (a few fetched ahead, in order)
+    def fetch_page(page):
+        r = safe_get(f'https://devpost.com/api/hackathons?page={page}&per_page=50')
+        if not r: return [], None
+        data = r.json()
+        meta = data.get('meta') or {}
+        return data.get('hackathons', []), page_count(meta.get('total_count'), meta.get('per_page'))
     
-    for page in range(1, 30):  # Increased limit to ~1500 events
-        try:
-            r = safe_get(f'https://devpost.com/api/hackathons?page={page}&per_page=50')
-            if not r: break
-            
-            hackathons = r.json().get('hackathons', [])
-            if not hackathons: break
-            
-            total_hackathons.extend(hackathons)
-        except: break
+    pages = iter_pages(fetch_page, start=1, max_pages=29,  # Up to ~1500 events
+                       window=site_config('devpost').get('pagination', {}).get('parallel_pages', 4))
             
-    print(f'  Found {len(total_hackathons)} events. Fetching details in parallel...')
+    # 2. Only new or changed listings go on to the detail fetchers
+    tracker = ListingTracker(db, normalizer, 'Devpost', force=force)
+    counts = {'found': 0, 'changed': 0, 'invite_only': 0}
     
-    # Prepare for parallel fetch
-    to_fetch = []
-    for h in total_hackathons:
-        if h.get('url'):
-            to_fetch.append({'id': h['url'], 'url_or_id': h['url']})
-    
-    # Fetch details
-    details_map = fetch_details_parallel(to_fetch, scrape_devpost_details, max_workers=20)
+    def listings():
+        for page in pages:
+            for h in page:
+                counts['found'] += 1
+                # Skip invite-only hackathons
+                if h.get('invite_only'):
+                    counts['invite_only'] += 1
+                    continue
+                if h.get('url'):
+                    event_id = tracker.event_id(h['url'], h.get('title'))
+                    if not sharding.owns(event_id):
+                        continue  # Another shard's event
+                    if not tracker.is_changed(event_id, {k: h.get(k) for k in DEVPOST_SUMMARY_FIELDS}):
+                        continue
+                    counts['changed'] += 1
+                yield h, h.get('url')
     
-    # Save events with details
-    saved = 0
-    skipped_invite = 0
-    for h in total_hackathons:
+    # 3. Save each event as soon as its details arrive
+    for h, details in stream_details(listings(), tracker.watch(scrape_devpost_details), max_workers=20):
         try:
-            # Skip invite-only hackathons
-            if h.get('invite_only'):
-                skipped_invite += 1
-                continue
+            event_id = tracker.event_id(h.get('url'), h.get('title'))
                 
             # Dates logic (kept from original)
             dates = h.get('submission_period_dates', {})
@@ -459,8 +502,6 @@ def scrape_devpost():
                                 end_date = datetime.strptime(matches[1], '%b %d, %Y').strftime('%Y-%m-%d')
                         except: pass
             
-            # Get details
-            details = details_map.get(h.get('url'))
             if details:
                 description = details.get('description', '')
                 tags = details.get('tags', [])
@@ -484,54 +525,63 @@ def scrape_devpost():
                 'tags': tags,
                 'themes': themes
             }
-            if raw['title']: db.save_event(normalizer.normalize(raw, 'Devpost')); saved += 1
+            if raw['title']:
+                writer.save(normalizer.normalize(raw, 'Devpost')); saved += 1
+                if details: tracker.mark_saved(event_id, h.get('url'))
         except: pass
     
-    if skipped_invite > 0:
-        print(f'  (Skipped {skipped_invite} invite-only)')
+    writer.flush()
+    tracker.commit()
+    print(f'  Found {counts["found"]} events ({counts["changed"]} new/changed)')
+    if counts['invite_only'] > 0:
+        print(f'  (Skipped {counts["invite_only"]} invite-only)')
         
     print(f'  ✓ {saved}')
     return saved
 
-def scrape_devfolio():
+def scrape_devfolio(force=False):
     print('\n🎯 Devfolio (API-Enhanced)...')
     saved = 0
     try:
-        # 1. Collect all events first via search API
-        all_events = []
-        all_events = []
-        for list_type in ['application_open', 'all']:
-            # Fetch multiple pages
-            for offset in range(0, 1000, 50): # Up to 1000 events per type
-                try:
-                    r = requests.post('https://api.devfolio.co/api/search/hackathons', 
-                                     json={"type": list_type, "from": offset, "size": 50}, 
-                                     headers=headers, timeout=30)
-                    hits = r.json().get('hits', {}).get('hits', [])
-                    if not hits: break
-                    all_events.extend(hits)
-                    if len(hits) < 50: break # End of results
-                except: break
-        
-        # Deduplicate by slug
-        unique_events = {}
-        for h in all_events:
-            src = h.get('_source', {})
-            slug = src.get('slug')
-            if slug: unique_events[slug] = src
+        # 1. Stream events from the search API (from/size pages, a few fetched ahead)
+        window = site_config('devfolio').get('pagination', {}).get('parallel_pages', 4)
+        tracker = ListingTracker(db, normalizer, 'Devfolio', force=force)
+        counts = {'found': 0, 'changed': 0}
         
-        total_events = list(unique_events.values())
-        print(f'  Found {len(total_events)} events. Fetching details via API...')
+        def listings():
+            seen = set()  # Deduplicate by slug across both listings
+            for list_type in ['application_open', 'all']:
+                def fetch_page(page, list_type=list_type):
+                    r = fetcher.post('https://api.devfolio.co/api/search/hackathons', 
+                                     json={"type": list_type, "from": page * 50, "size": 50}, 
+                                     headers=headers, timeout=30)
+                    hits = r.json().get('hits', {})
+                    total = hits.get('total')
+                    if isinstance(total, dict): total = total.get('value')
+                    return hits.get('hits', []), page_count(total, 50)
+                
+                # Up to 1000 events per type
+                for page in iter_pages(fetch_page, start=0, max_pages=20, window=window, page_size=50):
+                    for h in page:
+                        src = h.get('_source', {})
+                        slug = src.get('slug')
+                        if not slug or slug in seen: continue
+                        seen.add(slug)
+                        counts['found'] += 1
+                        
+                        # 2. Keep only new or changed hackathons
+                        event_id = tracker.event_id(f"https://{slug}.devfolio.co/", src.get('name'))
+                        if not sharding.owns(event_id):
+                            continue  # Another shard's event
+                        if tracker.is_changed(event_id, {k: src.get(k) for k in DEVFOLIO_SUMMARY_FIELDS}):
+                            counts['changed'] += 1
+                            yield src, slug
         
-        # 2. Fetch details via API for each hackathon
-        for i, src in enumerate(total_events):
+        # 3. Fetch details via API (bounded by the devfolio host cap) and save each as it arrives
+        for src, details in stream_details(listings(), tracker.watch(fetch_devfolio_details_api), max_workers=8, progress_every=50):
             try:
-                slug = src.get('slug')
-                if not slug:
-                    continue
-                
-                # Fetch detailed data via API
-                details = fetch_devfolio_details_api(slug)
+                slug = src['slug']
+                event_id = tracker.event_id(f"https://{slug}.devfolio.co/", src.get('name'))
                 
                 if details:
                     # Use API data (priority)
@@ -579,15 +629,16 @@ def scrape_devfolio():
                     'themes': themes
                 }
                 if raw['title'] and raw['url']:
-                    db.save_event(normalizer.normalize(raw, 'Devfolio'))
+                    writer.save(normalizer.normalize(raw, 'Devfolio'))
                     saved += 1
-                    
-                # Progress indicator
-                if (i + 1) % 20 == 0:
-                    print(f'    Processed {i + 1}/{len(total_events)}...')
+                    if details: tracker.mark_saved(event_id, slug)
                     
             except Exception as e:
                 pass
+        
+        writer.flush()
+        tracker.commit()
+        print(f'  Found {counts["found"]} events ({counts["changed"]} new/changed)')
                 
     except Exception as e:
         print(f'  Error: {e}')
@@ -602,24 +653,16 @@ def scrape_hackculture():
     print('\n🏛️ HackCulture (Browser)...')
     saved = 0
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        with browser_page('hackculture') as page:
             # Visit /challenges directly
             page.goto('https://hackculture.io/challenges', wait_until='networkidle', timeout=60000)
             
             # Scroll to trigger lazy loading
-            for _ in range(3):
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                page.wait_for_timeout(1000)
+            scroll_until_stable(page, 'a[href*="/challenges/"]')
             
             html = page.content()
-            browser.close()
 
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, ANCHORS)
         
         # Extract events from rendered HTML
         seen = set()
@@ -668,7 +711,7 @@ def scrape_hackculture():
                     'participants_count': None,
                     'team_size_max': None
                 }
-                db.save_event(normalizer.normalize(raw, 'HackCulture')); saved += 1
+                writer.save(normalizer.normalize(raw, 'HackCulture')); saved += 1
                     
     except Exception as e: print(f'  Error: {e}')
     print(f'  ✓ {saved}')
@@ -676,37 +719,51 @@ def scrape_hackculture():
 
 
 
-def scrape_unstop():
+def _unstop_public_url(h):
+    public_url = h.get('public_url', '')
+    return f"https://unstop.com/{public_url}" if not public_url.startswith('http') else public_url
+
+def scrape_unstop(force=False):
     print('\n🎪 Unstop...')
     saved = 0
     try:
-        # 1. Collect all events first
-        all_events = []
-        for page in range(1, 30):  # Increased limit to ~3000 events
-            try:
-                r = requests.get(f'https://unstop.com/api/public/opportunity/search-result?opportunity=hackathons&per_page=100&page={page}',
-                                headers=headers, timeout=30)
-                data = r.json().get('data', {}).get('data', [])
-                if not data: break
-                all_events.extend(data)
-            except: pass
+        # 1. Stream listing pages (a few fetched ahead, in order)
+        def fetch_page(page):
+            r = fetcher.get(f'https://unstop.com/api/public/opportunity/search-result?opportunity=hackathons&per_page=100&page={page}',
+                            headers=headers, timeout=30)
+            payload = r.json().get('data', {})
+            return payload.get('data', []), payload.get('last_page')
         
-        print(f'  Found {len(all_events)} events. Fetching details in parallel...')
+        pages = iter_pages(fetch_page, start=1, max_pages=29,  # Up to ~3000 events
+                           window=site_config('unstop').get('pagination', {}).get('parallel_pages', 4))
         
-        # 2. Prepare for parallel fetch
-        to_fetch = []
-        for h in all_events:
-            # Prefer ID for API lookup
-            eid = h.get('id')
-            if eid:
-                to_fetch.append({'id': str(eid), 'url_or_id': eid})
+        # 2. Only new or changed listings go on to the detail fetchers
+        tracker = ListingTracker(db, normalizer, 'Unstop', force=force)
+        counts = {'found': 0, 'changed': 0}
         
-        # 3. Fetch details
-        details_map = fetch_details_parallel(to_fetch, fetch_unstop_details_api, max_workers=20)
+        def listings():
+            for page in pages:
+                for h in page:
+                    counts['found'] += 1
+                    # Prefer ID for API lookup
+                    eid = h.get('id')
+                    if eid:
+                        event_id = tracker.event_id(_unstop_public_url(h), h.get('title'))
+                        if not sharding.owns(event_id):
+                            continue  # Another shard's event
+                        summary = {k: h.get(k) for k in UNSTOP_SUMMARY_FIELDS}
+                        summary['regn'] = {k: (h.get('regnRequirements') or {}).get(k) for k in ('start_regn_dt', 'end_regn_dt')}
+                        if not tracker.is_changed(event_id, summary):
+                            continue
+                        counts['changed'] += 1
+                    yield h, eid or None
         
-        # 4. Save events with details
-        for h in all_events:
+        # 3. Save each event as soon as its details arrive
+        for h, details in stream_details(listings(), tracker.watch(fetch_unstop_details_api), max_workers=20):
             try:
+                full_url = _unstop_public_url(h)
+                event_id = tracker.event_id(full_url, h.get('title'))
+                
                 # Dates: try regnRequirements or top level
                 regn = h.get('regnRequirements', {})
                 start = h.get('start_date')
@@ -746,10 +803,6 @@ def scrape_unstop():
                     if total_cash > 0:
                         prize = f"{currency}{total_cash:,}"
                 
-                # Get details
-                eid = str(h.get('id', ''))
-                details = details_map.get(eid)
-                
                 description = ""
                 tags = []
                 themes = []
@@ -788,9 +841,6 @@ def scrape_unstop():
                     tags = extract_tags_from_text(description)
                     themes = []
                     # Do NOT map 'show_team_size' here as it's often 0/1 boolean
-                
-                public_url = h.get('public_url', '')
-                full_url = f"https://unstop.com/{public_url}" if not public_url.startswith('http') else public_url
 
                 raw = {
                     'title': h.get('title'), 
@@ -807,10 +857,15 @@ def scrape_unstop():
                     'tags': tags,
                     'themes': themes
                 }
-                db.save_event(normalizer.normalize(raw, 'Unstop')); saved += 1
+                writer.save(normalizer.normalize(raw, 'Unstop')); saved += 1
+                if details: tracker.mark_saved(event_id, h.get('id'))
             except Exception as e: 
                 # print(f"Unstop Error: {e}") 
                 pass
+        
+        writer.flush()
+        tracker.commit()
+        print(f'  Found {counts["found"]} events ({counts["changed"]} new/changed)')
     except: pass
     print(f'  ✓ {saved}')
     return saved
@@ -819,8 +874,8 @@ def scrape_unstop():
 def scrape_mlh():
     print('\n🏆 MLH...')
     saved = 0
+    clock = phases()
     try:
-        from bs4 import BeautifulSoup
         import concurrent.futures
         
         events_to_process = []
@@ -830,7 +885,7 @@ def scrape_mlh():
             r = safe_get(f'https://mlh.io/seasons/{year}/events')
             if not r: continue
             
-            soup = BeautifulSoup(r.text, 'html.parser')
+            soup = make_soup(r.text, ANCHORS)
             for link in soup.find_all('a', href=True):
                 href = link['href']
                 
@@ -906,9 +961,12 @@ def scrape_mlh():
         # Unique by URL
         unique_events = {e['url']: e for e in events_to_process}.values()
         print(f"  Found {len(unique_events)} potential events. Enriching...")
+        clock.lap('listing')
 
         # 2. Enrich Data (Parallel)
         def fetch_enrichment(e):
+            if budget.expired():
+                return None  # Out of time: save from the listing data
             url = e['url']
             try:
                 # Devpost
@@ -916,11 +974,7 @@ def scrape_mlh():
                     return scrape_devpost_details(url)
                 # Devfolio
                 elif 'devfolio.co' in url:
-                    slug = None
-                    if 'devfolio.co/' in url:
-                         slug = url.split('devfolio.co/')[1].split('/')[0]
-                    else:
-                         slug = url.split('//')[1].split('.')[0]
+                    slug = _devfolio_slug(url)
                     if slug: 
                         return fetch_devfolio_details_api(slug)
                 # Generic / Custom Site
@@ -928,7 +982,7 @@ def scrape_mlh():
                     # Visit page to get meta tags or better title/date
                     sub_r = safe_get(url)
                     if sub_r:
-                        sub_soup = BeautifulSoup(sub_r.text, 'html.parser')
+                        sub_soup = make_soup(sub_r.text, HEAD_META)
                         # Extract meta description
                         meta_desc = ""
                         og_desc = sub_soup.select_one('meta[property="og:description"]')
@@ -944,7 +998,7 @@ def scrape_mlh():
             except: pass
             return None
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        with SourcePoolExecutor(max_workers=10) as executor:
             future_to_event = {executor.submit(fetch_enrichment, e): e for e in unique_events}
             
             for future in concurrent.futures.as_completed(future_to_event):
@@ -964,8 +1018,9 @@ def scrape_mlh():
                          e['participants_count'] = result['participants']
 
                 # Save
-                db.save_event(normalizer.normalize(e, 'MLH'))
+                writer.save(normalizer.normalize(e, 'MLH'))
                 saved += 1
+        clock.lap('details')
                 
     except Exception as e: 
         print(f"  MLH Error: {e}")
@@ -985,7 +1040,7 @@ def scrape_superteam():
                 raw = {'title': h.get('title'), 'url': h.get('link'), 'prize': h.get('rewardAmount'), 'mode': 'online',
                        'participants_count': h.get('_count', {}).get('Submission') if isinstance(h.get('_count'), dict) else None,
                        'team_size_max': h.get('team_size')}
-                db.save_event(normalizer.normalize(raw, 'Superteam')); saved += 1
+                writer.save(normalizer.normalize(raw, 'Superteam')); saved += 1
     except: pass
     print(f'  ✓ {saved}')
     return saved
@@ -1003,19 +1058,10 @@ def scrape_dorahacks():
     print('\n🐶 DoraHacks (Browser - Anti-Bot)...')
     saved = 0
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
         import random
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            # Use stealthy context options
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1366, 'height': 768},
-                device_scale_factor=1,
-            )
-            page = context.new_page()
+        # Stealth profile: desktop Chrome user agent and viewport
+        with browser_page('dorahacks', stealth=True) as page:
             
             # Go to home first
             try:
@@ -1036,14 +1082,11 @@ def scrape_dorahacks():
             except: pass
             
             # Scroll
-            for _ in range(3):
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                page.wait_for_timeout(1000)
+            scroll_until_stable(page, 'a[href*="/hackathon/"]')
                 
             html = page.content()
-            browser.close()
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         seen = set()
         
         # Selectors might be generic or specific classes
@@ -1076,7 +1119,7 @@ def scrape_dorahacks():
                     'participants_count': participants,
                     'team_size_max': None
                 }
-                db.save_event(normalizer.normalize(raw, 'DoraHacks')); saved += 1
+                writer.save(normalizer.normalize(raw, 'DoraHacks')); saved += 1
                 
     except Exception as e: print(f'  Error: {e}')
     print(f'  ✓ {saved}')
@@ -1092,24 +1135,16 @@ def scrape_techgig():
     print('\n💻 TechGig (Browser - Broad)...')
     saved = 0
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        with browser_page('techgig') as page:
             # Try engage subdomain directly as it seemed to have links in debug
             page.goto('https://engage.techgig.com/hackathons', wait_until='networkidle', timeout=60000)
             
             # Scroll
-            for _ in range(3):
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                page.wait_for_timeout(1000)
+            scroll_until_stable(page, 'a[href*="hackathon"], a[href*="challenge"]')
                 
             html = page.content()
-            browser.close()
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         seen = set()
         
         # Broadest possible search: All links with 'hackathon' or 'challenge'
@@ -1187,7 +1222,7 @@ def scrape_techgig():
                     'participants_count': participants, 
                     'team_size_max': None
                 }
-                db.save_event(normalizer.normalize(raw, 'TechGig')); saved += 1
+                writer.save(normalizer.normalize(raw, 'TechGig')); saved += 1
                 
     except Exception as e: print(f'  Error: {e}')
     print(f'  ✓ {saved}')
@@ -1202,14 +1237,11 @@ def scrape_geeksforgeeks():
     print('\n📗 GeeksforGeeks (Browser)...')
     saved = 0
     try:
-        from playwright.sync_api import sync_playwright
         from datetime import datetime
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        with browser_page('geeksforgeeks') as page:
             page.goto('https://www.geeksforgeeks.org/events/', wait_until='networkidle', timeout=30000)
-            page.wait_for_timeout(3000)
+            scroll_until_stable(page, 'a[href^="/event/"]')
             
             cards = page.query_selector_all('a[href^="/event/"]')
             seen = set()
@@ -1258,8 +1290,7 @@ def scrape_geeksforgeeks():
                         'participants_count': None,
                         'team_size_max': None
                     }
-                    db.save_event(normalizer.normalize(raw, 'GeeksforGeeks')); saved += 1
-            browser.close()
+                    writer.save(normalizer.normalize(raw, 'GeeksforGeeks')); saved += 1
     except Exception as e: print(f'  Error: {e}')
     print(f'  ✓ {saved}')
     return saved
@@ -1272,29 +1303,17 @@ def scrape_hackerearth():
     print('\n🧠 HackerEarth (Browser)...')
     saved = 0
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            # Use stealthy context options (restored)
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1366, 'height': 768}
-            )
-            page = context.new_page()
+        # Stealth profile: desktop Chrome user agent and viewport
+        with browser_page('hackerearth', stealth=True) as page:
             page.goto('https://www.hackerearth.com/challenges/', wait_until='networkidle', timeout=60000)
             
             # Scroll to load more
-            for _ in range(5):
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                page.wait_for_timeout(1000)
+            scroll_until_stable(page, 'a[href*="/challenges/"], .challenge-card-modern a')
                 
             html = page.content()
-            browser.close()
 
             
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         seen = set()
         
         # Select challenge cards
@@ -1375,7 +1394,7 @@ def scrape_hackerearth():
                     'participants_count': participants,
                     'team_size_max': None
                 }
-                db.save_event(normalizer.normalize(raw, 'HackerEarth')); saved += 1
+                writer.save(normalizer.normalize(raw, 'HackerEarth')); saved += 1
                 
     except Exception as e: print(f'  Error: {e}')
     print(f'  ✓ {saved}')
@@ -1386,17 +1405,12 @@ def scrape_hackquest():
     print('\n🎮 HackQuest (Browser)...')
     saved = 0
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        with browser_page('hackquest') as page:
             page.goto('https://www.hackquest.io/hackathons', wait_until='networkidle', timeout=60000)
-            for _ in range(3): page.evaluate('window.scrollTo(0, document.body.scrollHeight)'); page.wait_for_timeout(1000)
+            scroll_until_stable(page, 'a[href^="/hackathons/"]')
             html = page.content()
-            browser.close()
             
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         seen = set()
         for card in soup.select('a[href^="/hackathons/"]'):
             href = card.get('href', '')
@@ -1410,18 +1424,58 @@ def scrape_hackquest():
             if title:
                 raw = {'title': title, 'url': href, 'mode': 'online',
                        'participants_count': None, 'team_size_max': None}
-                db.save_event(normalizer.normalize(raw, 'HackQuest')); saved += 1
+                writer.save(normalizer.normalize(raw, 'HackQuest')); saved += 1
     except Exception as e: print(f'  Error: {e}')
     print(f'  ✓ {saved}')
     return saved
 
+def _devfolio_slug(url):
+    """Extract the hackathon slug from "slug.devfolio.co" or "devfolio.co/slug" URLs."""
+    # Try subdomain match first
+    sub_match = re.search(r'https?://([^.]+)\.devfolio\.co', url)
+    if sub_match and sub_match.group(1) != 'www':
+        return sub_match.group(1)
+    # Try path match
+    path_match = re.search(r'devfolio\.co/([^/?]+)', url)
+    return path_match.group(1) if path_match else None
+
+def _with_cache_reads(func, *args):
+    """``func(*args)`` and how its cached GETs were served (for pool threads)."""
+    with cache_reads() as kinds:
+        return func(*args), kinds
+
+def fetch_devfolio_prize(slug):
+    """Fetch and total the prizes for a Devfolio hackathon ('Prize TBD' if none)."""
+    prize = 'Prize TBD'
+    try:
+        pr = fetcher.get(
+            f'https://api.devfolio.co/api/hackathons/{slug}/prizes',
+            headers={'Accept': 'application/json'},
+            timeout=10,
+            cache='devfolio'
+        )
+        if pr.status_code == 200:
+            prizes = pr.json()
+            if prizes:
+                total = sum(float(p.get('amount', 0)) for p in prizes)
+                if total > 0:
+                    currency = prizes[0].get('currency', 'USD')
+                    symbol = {'USD': '$', 'INR': '₹', 'EUR': '€', 'GBP': '£'}.get(currency, '$')
+                    prize = f"{symbol}{int(total):,}"
+    except: pass
+    return prize
+
+@memoized('devfolio')
 def fetch_devfolio_details_api(slug):
     """Fetch hackathon details from Devfolio REST API (fast ~0.5s)."""
     try:
-        r = requests.get(
+        # Prizes live on a separate endpoint; request both at once
+        prize_future = _subrequests.submit(_with_cache_reads, fetch_devfolio_prize, slug)
+        r = fetcher.get(
             f'https://api.devfolio.co/api/hackathons/{slug}',
             headers={'Accept': 'application/json'},
-            timeout=10
+            timeout=10,
+            cache='devfolio'
         )
         if r.status_code != 200:
             return None
@@ -1441,23 +1495,8 @@ def fetch_devfolio_details_api(slug):
         country = data.get('country', '')
         location = 'Online' if is_online else f"{city}, {country}".strip(', ') or 'In-Person'
         
-        # Get prizes from separate endpoint
-        prize = 'Prize TBD'
-        try:
-            pr = requests.get(
-                f'https://api.devfolio.co/api/hackathons/{slug}/prizes',
-                headers={'Accept': 'application/json'},
-                timeout=10
-            )
-            if pr.status_code == 200:
-                prizes = pr.json()
-                if prizes:
-                    total = sum(float(p.get('amount', 0)) for p in prizes)
-                    if total > 0:
-                        currency = prizes[0].get('currency', 'USD')
-                        symbol = {'USD': '$', 'INR': '₹', 'EUR': '€', 'GBP': '£'}.get(currency, '$')
-                        prize = f"{symbol}{int(total):,}"
-        except: pass
+        prize, prize_reads = prize_future.result()
+        note_cache_reads(prize_reads)  # Read on another thread
         
         return {
             'start_date': event_start,
@@ -1479,27 +1518,18 @@ def scrape_devdisplay():
     """Scrape DevDisplay hackathons with fast API-based detail fetching."""
     print('\n🖥️ DevDisplay (API-Enhanced)...')
     saved = 0
+    clock = phases()
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
-        
         # Step 1: Get listing page (browser required - JS-rendered page)
         print('  Fetching listing page via browser...')
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        with browser_page('devdisplay') as page:
             page.goto('https://www.devdisplay.org/hackathons', wait_until='networkidle', timeout=60000)
             
-            # Scroll to trigger any lazy loading
-            for _ in range(5):
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                page.wait_for_timeout(1000)
-                
-            page.wait_for_timeout(2000)
+            # Scroll to trigger any lazy loading (cards are titled with <h2>)
+            scroll_until_stable(page, 'h2')
             html = page.content()
-            browser.close()
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         hackathons_to_scrape = []
         seen = set()
         
@@ -1576,62 +1606,65 @@ def scrape_devdisplay():
             })
         
         print(f'  Found {len(hackathons_to_scrape)} hackathons, fetching details via API...')
+        clock.lap('listing')
         
-        # Step 2: Fetch details via fast API calls
+        # Step 2: Fetch details via fast API calls, all platforms in parallel
+        devfolio_items, unstop_items = [], []
         for i, h in enumerate(hackathons_to_scrape):
             url = h['url']
-            print(f'    [{i+1}/{len(hackathons_to_scrape)}] {h["title"][:40]}...')
-            
+            if 'devfolio.co' in url:
+                slug = _devfolio_slug(url)
+                if slug:
+                    # Enforce canonical URL to prevent duplicates (e.g. devfolio.co/slug -> slug.devfolio.co)
+                    h['url'] = f"https://{slug}.devfolio.co/"
+                    devfolio_items.append({'id': i, 'url_or_id': slug})
+            elif 'unstop.com' in url:
+                # Extract event ID from end of URL (e.g., "...-154300")
+                match = re.search(r'-(\d+)$', url)
+                if match:
+                    unstop_items.append({'id': i, 'url_or_id': match.group(1)})
+        
+        with SourcePoolExecutor(max_workers=2) as executor:
+            devfolio_future = executor.submit(fetch_details_parallel, devfolio_items, fetch_devfolio_details_api, 8)
+            unstop_future = executor.submit(fetch_details_parallel, unstop_items, fetch_unstop_details_api, 8)
+            devfolio_details = devfolio_future.result()
+            unstop_details = unstop_future.result()
+        print(f'  Got details for {len(devfolio_details)}/{len(devfolio_items)} Devfolio, '
+              f'{len(unstop_details)}/{len(unstop_items)} Unstop')
+        clock.lap('details')
+        
+        for i, h in enumerate(hackathons_to_scrape):
             try:
-                if 'devfolio.co' in url:
-                    # Extract slug from URL (handle both "slug.devfolio.co" and "devfolio.co/slug")
-                    slug = None
-                    # Try subdomain match first
-                    sub_match = re.search(r'https?://([^.]+)\.devfolio\.co', url)
-                    if sub_match and sub_match.group(1) != 'www':
-                        slug = sub_match.group(1)
-                    else:
-                        # Try path match
-                        path_match = re.search(r'devfolio\.co/([^/?]+)', url)
-                        if path_match:
-                            slug = path_match.group(1)
-                            
-                    if slug:
-                        # Enforce canonical URL to prevent duplicates (e.g. devfolio.co/slug -> slug.devfolio.co)
-                        h['url'] = f"https://{slug}.devfolio.co/"
-                        
-                        details = fetch_devfolio_details_api(slug)
-                        if details:
-                            # Merge details (API data takes priority)
-                            if details.get('start_date'): h['start_date'] = details['start_date']
-                            if details.get('end_date'): h['end_date'] = details['end_date']
-                            if details.get('prize'): h['prize'] = details['prize']
-                            if details.get('team_size_min'): h['team_size_min'] = details['team_size_min']
-                            if details.get('team_size_max'): h['team_size_max'] = details['team_size_max']
-                            if details.get('mode'): h['mode'] = details['mode']
-                            if details.get('location'): h['location'] = details['location']
-                            if details.get('participants_count'): h['participants_count'] = details['participants_count']
-                        
-                elif 'unstop.com' in url:
-                    # Extract event ID from end of URL (e.g., "...-154300")
-                    match = re.search(r'-(\d+)$', url)
-                    if match:
-                        details = fetch_unstop_details_api(match.group(1))
-                        if details:
-                            if details.get('end_date'): h['end_date'] = parse_iso_timestamp(details['end_date'])
-                            if details.get('team_size_min'): h['team_size_min'] = details['team_size_min']
-                            if details.get('team_size_max'): h['team_size_max'] = details['team_size_max']
-                            if details.get('registerCount'): h['participants_count'] = details['registerCount']
-                            # Mode and location from region
-                            region = details.get('region', '')
-                            if region and region.lower() == 'online':
-                                h['mode'] = 'online'
-                                h['location'] = 'Online'
-                            elif region and region.lower() == 'offline':
-                                h['mode'] = 'in-person'
-                                city = details.get('city', '')
-                                state = details.get('state', '')
-                                h['location'] = f"{city}, {state}".strip(', ') or 'In-Person'
+                if i in devfolio_details:
+                    details = devfolio_details[i]
+                    if details:
+                        # Merge details (API data takes priority)
+                        if details.get('start_date'): h['start_date'] = details['start_date']
+                        if details.get('end_date'): h['end_date'] = details['end_date']
+                        if details.get('prize'): h['prize'] = details['prize']
+                        if details.get('team_size_min'): h['team_size_min'] = details['team_size_min']
+                        if details.get('team_size_max'): h['team_size_max'] = details['team_size_max']
+                        if details.get('mode'): h['mode'] = details['mode']
+                        if details.get('location'): h['location'] = details['location']
+                        if details.get('participants_count'): h['participants_count'] = details['participants_count']
+                    
+                elif i in unstop_details:
+                    details = unstop_details[i]
+                    if details:
+                        if details.get('end_date'): h['end_date'] = parse_iso_timestamp(details['end_date'])
+                        if details.get('team_size_min'): h['team_size_min'] = details['team_size_min']
+                        if details.get('team_size_max'): h['team_size_max'] = details['team_size_max']
+                        if details.get('registerCount'): h['participants_count'] = details['registerCount']
+                        # Mode and location from region
+                        region = details.get('region', '')
+                        if region and region.lower() == 'online':
+                            h['mode'] = 'online'
+                            h['location'] = 'Online'
+                        elif region and region.lower() == 'offline':
+                            h['mode'] = 'in-person'
+                            city = details.get('city', '')
+                            state = details.get('state', '')
+                            h['location'] = f"{city}, {state}".strip(', ') or 'In-Person'
             except Exception as e:
                 print(f'      Error: {e}')
             
@@ -1650,7 +1683,7 @@ def scrape_devdisplay():
                 'tags': h.get('tags', []),
                 'description': h.get('description', '')
             }
-            db.save_event(normalizer.normalize(raw, 'DevDisplay'))
+            writer.save(normalizer.normalize(raw, 'DevDisplay'))
             saved += 1
             
     except Exception as e:
@@ -1665,17 +1698,12 @@ def scrape_mycareernet():
     print('\n💼 MyCareerNet (Browser)...')
     saved = 0
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        with browser_page('mycareernet') as page:
             page.goto('https://mycareernet.in/mycareernet/contests', wait_until='networkidle', timeout=60000)
-            page.wait_for_timeout(3000)
+            scroll_until_stable(page, '.hackathonCard')
             html = page.content()
-            browser.close()
             
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         seen = set()
         for card in soup.select('.hackathonCard'):
             link = card.find('a', href=True)
@@ -1689,7 +1717,7 @@ def scrape_mycareernet():
             if title:
                 raw = {'title': title, 'url': href, 'mode': 'online',
                        'participants_count': None, 'team_size_max': None}
-                db.save_event(normalizer.normalize(raw, 'MyCareerNet')); saved += 1
+                writer.save(normalizer.normalize(raw, 'MyCareerNet')); saved += 1
     except Exception as e: print(f'  Error: {e}')
     print(f'  ✓ {saved}')
     return saved
@@ -1698,25 +1726,23 @@ def scrape_mycareernet():
 def scrape_kaggle():
     print('\n📊 Kaggle (Browser)...')
     saved = 0
+    clock = phases()
     try:
-        from playwright.sync_api import sync_playwright
-        from bs4 import BeautifulSoup
         import re
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto('https://www.kaggle.com/competitions', wait_until='networkidle', timeout=60000)
-            
-            # Scroll to load more
-            for _ in range(5):
-                page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                page.wait_for_timeout(1000)
+        detail_cfg = site_config('kaggle').get('detail_crawl', {})
+        
+        with browser_pool() as pool:
+            with pool.page('kaggle') as page:
+                page.goto('https://www.kaggle.com/competitions', wait_until='networkidle', timeout=60000)
                 
-            html = page.content()
+                # Scroll to load more
+                scroll_until_stable(page, 'a[href*="/competitions/"]')
+                    
+                html = page.content()
             
             # Parse listing page
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = make_soup(html)
             seen = set()
             competitions = []
             
@@ -1788,16 +1814,22 @@ def scrape_kaggle():
                     'days_left': days_left
                 })
             
-            print(f'  Found {len(competitions)} competitions. Fetching details...')
+            max_details = detail_cfg.get('max_details')  # None = all competitions
+            to_crawl = competitions[:max_details] if max_details else competitions
+            tabs = detail_cfg.get('tabs', 4)
+            print(f'  Found {len(competitions)} competitions. Fetching {len(to_crawl)} details in {tabs} tabs...')
+            clock.lap('listing')
+            processed = 0
             
             # Fetch detail pages for dates, description, team size
-            for i, comp in enumerate(competitions[:50]):  # Limit to 50 for speed
+            def save_detail(comp, detail_html):
+                nonlocal saved, processed
+                processed += 1
                 try:
-                    page.goto(comp['url'], wait_until='domcontentloaded', timeout=30000)
-                    page.wait_for_timeout(2000)  # Wait for JS to render
+                    if detail_html is None:
+                        raise ValueError('detail page did not load')
                     
-                    detail_html = page.content()
-                    detail_soup = BeautifulSoup(detail_html, 'html.parser')
+                    detail_soup = make_soup(detail_html)
                     detail_text = detail_soup.get_text(separator=' ', strip=True)
                     
                     # Extract deadline/end date
@@ -1844,6 +1876,7 @@ def scrape_kaggle():
                         if len(text) > 100 and 'cookie' not in text.lower() and 'privacy' not in text.lower():
                             description = text[:500]
                             break
+                    detail_soup.decompose()  # Free the tree before the next tab is parsed
                     
                     # Build final record
                     raw = {
@@ -1858,11 +1891,11 @@ def scrape_kaggle():
                         'description': description,
                         'tags': extract_tags_from_text(description)
                     }
-                    db.save_event(normalizer.normalize(raw, 'Kaggle'))
+                    writer.save(normalizer.normalize(raw, 'Kaggle'))
                     saved += 1
                     
-                    if (i + 1) % 10 == 0:
-                        print(f'    Processed {i + 1}/{min(len(competitions), 50)}...')
+                    if processed % 10 == 0:
+                        print(f'    Processed {processed}/{len(to_crawl)}...')
                         
                 except Exception as e:
                     # Fallback: save without details
@@ -1873,10 +1906,16 @@ def scrape_kaggle():
                         'prize': comp['prize'],
                         'participants_count': comp['participants']
                     }
-                    db.save_event(normalizer.normalize(raw, 'Kaggle'))
+                    writer.save(normalizer.normalize(raw, 'Kaggle'))
                     saved += 1
             
-            browser.close()
+            crawl_tabs(
+                pool, to_crawl, lambda comp: comp['url'], save_detail,
+                tabs=tabs, site='kaggle',
+                wait_selector=detail_cfg.get('content_selector'),
+                selector_timeout_ms=detail_cfg.get('selector_timeout_ms', 15000)
+            )
+            clock.lap('details')
                 
     except Exception as e: 
         print(f'  Error: {e}')
@@ -1886,30 +1925,129 @@ def scrape_kaggle():
     return saved
 
 
-def main():
+def build_jobs(force=False):
+    """Every source of a full run, in default order (see registry.py)."""
+    return [ScrapeJob(spec.key, spec.job_func(force), spec.method) for spec in registry.sources(full_run=True)]
+
+
+def main(max_workers=None, timeout=None, force=False, sources=None, budget_s=None, shard=None, resume=False):
+    """
+    Run a scrape.
+    
+    sources: Source keys to run, in start order (default: all of build_jobs());
+             main.py passes the stale ones from the scheduler
+    budget_s: Wall-clock budget of the run in seconds; sources are then
+              started highest yield first and pre-empted at the end of
+              their time slice (see budget.py)
+    shard: sharding.Shard to run as; only its sources and listings are
+           scraped, into its staging database (see sharding.py)
+    resume: Continue the checkpoint of an interrupted run: finished sources
+            are skipped, and so are listings whose events were already
+            saved (see checkpoint.py)
+    """
+    global db, writer
     print('='*50)
     print('  HackFind - CONSOLIDATED Scraper')
     print('='*50)
     
-    scrapers = [
-        scrape_devpost, scrape_devfolio, scrape_unstop,
-        scrape_mlh, scrape_superteam,
-        scrape_dorahacks, 
-        scrape_hackerearth, scrape_hackquest, scrape_devdisplay, scrape_mycareernet,
-        scrape_kaggle
-    ]
+    jobs = build_jobs(force)
+    if sources is not None:
+        by_key = {job.key: job for job in jobs}
+        jobs = [by_key[key] for key in sources if key in by_key]
+    if shard:
+        # A resumed run keeps what the interrupted one staged
+        db = sharding.activate(shard, db, keep=resume)
+        writer = EventWriter(db)
+        mine = shard.select([job.key for job in jobs])
+        jobs = [job for job in jobs if job.key in mine]
+        print(f'  Shard {shard}: {", ".join(mine) or "no sources"} → {db.path}')
+    
+    progress = checkpoint.Checkpoint(checkpoint.checkpoint_path(shard))
+    if progress.start(resume):
+        checkpoint.print_resume_report(progress)
+        finished = progress.finished_sources()
+        for key, saved in finished.items():
+            db.update_scrape_metadata(key, saved, True)
+        jobs = [job for job in jobs if job.key not in finished]
+    elif resume:
+        print('  ↻ No interrupted run to resume, starting a new one')
+    checkpoint.activate(progress)
+    if raw_store.store_config().get('enabled', True):
+        raw_store.activate(raw_store.RawStore(raw_store.raw_dir(), progress.run_id))
+    
+    def flushed(events):
+        # Raw records reach the disk no later than their events reach the checkpoint
+        if raw_store.active():
+            raw_store.active().flush()
+        progress.record_events(events)
+    writer.on_flush = flushed
+    
+    def source_done(result):
+        # Write what every source saved, timed out ones included, but only
+        # checkpoint one that completed, once its events are in the database
+        writer.flush()
+        if result.status == 'ok':
+            progress.finish_source(result.key, result.saved)
+    
+    run_budget = None
+    budget.reset()
+    if budget_s:
+        order, run_budget = budget.plan_budget(db, [job.key for job in jobs], budget_s)
+        by_key = {job.key: job for job in jobs}
+        jobs = [by_key[key] for key in order]
+        budget.print_budget_plan(order, run_budget)
+    
+    telemetry.reset()
+    browser_metrics.reset()
+    fetcher.reset_stats()
+    memo.reset()
+    written_before, batches_before = writer.stats['written'], writer.stats['batches']
+    dropped_before = writer.stats['dropped']
+    run_start = time.monotonic()
+    results = run_scrapers(jobs, max_workers=max_workers, timeout=timeout, event_sink=writer.save,
+                           budget=run_budget, on_finish=source_done)
+    writer.flush()
+    # Skipped sources did not run: leave their history and freshness alone
+    telemetry.persist(db, [r for r in results if r.status != 'skipped'], browser_metrics.snapshot())
+    total = sum(r.saved for r in results)
+    raw_records = raw_store.active().stats['records'] if raw_store.active() else 0
+    raw_store.close()
     
-    total = 0
-    for s in scrapers:
-        try: total += s()
-
-        except Exception as e: print(f"  Error running scraper: {e}")
-        time.sleep(0.5)
-        
     print('\n' + '='*50)
+    print_run_report(results, time.monotonic() - run_start)
+    print_cache_report(fetcher.cache_stats())
+    print_limiter_report(fetcher.limiter_stats())
+    print_memo_report(memo.stats())
+    print(f'  DB writes: {writer.stats["written"] - written_before} events in '
+          f'{writer.stats["batches"] - batches_before} batches')
+    if writer.stats['dropped'] > dropped_before:
+        print(f'  ⚠ {writer.stats["dropped"] - dropped_before} events dropped from sources saving after their timeout')
+    if raw_records:
+        print(f'  Raw records: {raw_records} stored under {raw_store.raw_dir()} (run {progress.run_id})')
+    if browser_metrics.snapshot():
+        print_browser_report(browser_metrics.snapshot(), browser_metrics.save())
     print(f'  Total this run: {total}')
     print(f'  Database total: {db.get_statistics()["total_events"]} hackathons')
     print('='*50)
+    # The run got to the end: nothing left to resume
+    progress.clear()
+    checkpoint.activate(None)
+    writer.on_flush = None
 
 if __name__ == '__main__':
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description='Scrape every source (scheduled CI entry point)')
+    parser.add_argument('--force', action='store_true', help='Re-fetch unchanged details')
+    parser.add_argument('--budget', type=budget.parse_duration,
+                        help='Wall-clock budget for the run, e.g. 75m (sources pre-empted to fit)')
+    parser.add_argument('--shard', type=sharding.Shard.parse,
+                        help='Run shard i of N (e.g. 2/3) into its staging database; merge with main.py merge')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run from its checkpoint')
+    cli = parser.parse_args()
+    # Run as a script, this file is __main__, but the registry imports the
+    # scrapers from scraper.scrape_all, a second copy of the module with its
+    # own db and writer; run that copy's main() so the shard's staging
+    # database and the checkpoint hooks are the ones the scrapers save through
+    from scraper.scrape_all import main as package_main
+    package_main(force=cli.force, budget_s=cli.budget, shard=cli.shard, resume=cli.resume)
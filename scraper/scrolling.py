@@ -0,0 +1,98 @@
+"""
+Infinite Scroll Helper
+======================
+Scrolls a Playwright page until the list stops growing.
+
+Replaces the fixed ``for _ in range(N): scroll; wait 1000ms`` loops in the
+browser scrapers. After each scroll it waits only as long as it takes for
+new items matching ``selector`` to appear (at most ``settle_ms``), and stops
+when the count has not grown for ``stable_rounds`` scrolls in a row, or when
+the item, round or time budget is hit. Pages that finished loading early
+stop early; pages that need more scrolls get them. Scrolling also stops
+when the source's run-budget slice runs out (see budget.py).
+"""
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from scraper import budget
+
+_COUNT_JS = 'sel => document.querySelectorAll(sel).length'
+_GREW_JS = '([sel, n]) => document.querySelectorAll(sel).length > n'
+_SCROLL_JS = 'window.scrollTo(0, document.body.scrollHeight)'
+
+
+@dataclass
+class ScrollResult:
+    """How a scroll_until_stable() call ended."""
+    rounds: int
+    items: int
+    reason: str                       # stable, max_items, max_rounds, budget
+
+    def __str__(self) -> str:
+        return f'{self.items} items after {self.rounds} scroll rounds ({self.reason})'
+
+
+def scroll_until_stable(
+    page,
+    selector: str,
+    max_items: Optional[int] = None,
+    max_rounds: int = 20,
+    settle_ms: int = 1500,
+    stable_rounds: int = 2,
+    budget_s: float = 30.0,
+    verbose: bool = True
+) -> ScrollResult:
+    """
+    Scroll to the bottom until the number of ``selector`` matches is stable.
+
+    Args:
+        page: Playwright page
+        selector: CSS selector for the list items, e.g. 'a[href*="/hackathon/"]'
+        max_items: Stop once at least this many items are present
+        max_rounds: Upper bound on scrolls
+        settle_ms: Max wait for new items after a scroll
+        stable_rounds: Scrolls without growth before the list counts as done
+        budget_s: Overall time budget (shortened to what is left of the
+                  source's run-budget slice)
+        verbose: Print the result
+
+    Returns:
+        ScrollResult with the rounds used and the final item count
+    """
+    slice_left = budget.remaining()
+    if slice_left is not None:
+        budget_s = max(0.0, min(budget_s, slice_left))
+    deadline = time.monotonic() + budget_s
+    count = page.evaluate(_COUNT_JS, selector)
+    rounds = 0
+    unchanged = 0
+    reason = 'max_rounds'
+
+    while rounds < max_rounds:
+        if max_items and count >= max_items:
+            reason = 'max_items'
+            break
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        if remaining_ms <= 0:
+            reason = 'budget'
+            break
+
+        page.evaluate(_SCROLL_JS)
+        rounds += 1
+        try:
+            page.wait_for_function(_GREW_JS, arg=[selector, count], timeout=min(settle_ms, remaining_ms))
+        except Exception:
+            pass  # No new items within settle_ms
+
+        new_count = page.evaluate(_COUNT_JS, selector)
+        unchanged = unchanged + 1 if new_count <= count else 0
+        count = max(count, new_count)
+        if unchanged >= stable_rounds:
+            reason = 'stable'
+            break
+
+    result = ScrollResult(rounds=rounds, items=count, reason=reason)
+    if verbose:
+        print(f'  Scrolled: {result}')
+    return result
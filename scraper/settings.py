@@ -0,0 +1,35 @@
+"""
+Scraper Settings
+================
+Read-only access to config/websites.json for the scraper package.
+
+The file is loaded once per process; callers get plain dicts and should
+treat them as read-only.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'websites.json'
+
+
+@lru_cache(maxsize=1)
+def load_config():
+    """Load and cache the full websites.json document."""
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def site_config(key):
+    """Config block for a single site key (e.g. 'devpost'), or {} if unknown."""
+    return load_config().get('websites', {}).get(key, {})
+
+
+def run_config():
+    """Run-level scraper options (concurrency, timeouts)."""
+    return load_config().get('scrape_run', {})
+
+
+def browser_pool_config():
+    """Shared Playwright pool options (lanes, page cap, context recycling)."""
+    return load_config().get('browser_config', {}).get('pool', {})
@@ -0,0 +1,268 @@
+"""
+Sharded Scraping
+================
+Splits one scrape across N parallel jobs (``--shard i/N``) and merges them.
+
+On one runner a full refresh fetches every source and every detail page.
+With a matrix of N runners, each running ``--shard i/N`` (i = 1..N):
+
+- the sources are dealt out round-robin in registry order, so each shard
+  runs about 1/N of them
+- the large sources in ``scrape_run.shard.split_details`` (Devpost,
+  Devfolio, Unstop) run on every shard, but each shard only keeps the
+  listings whose event ID hashes to it (CRC32 of the ID mod N), so their
+  detail pages are split as well
+- everything the shard writes (events, listing fingerprints, touched
+  events, run history) goes to its own staging SQLite file,
+  ``<staging_dir>/shard-i-of-N.db``; reads (fingerprints, run history,
+  freshness) still come from the main database
+
+The split depends only on the shard spec, the registry and the event IDs,
+so every runner computes the same assignment without coordinating.
+
+``python main.py merge`` then folds every staging file into the main
+database (TiDB or SQLite) in bulk:
+
+- events are upserted by ID in batches; if several shards staged the same
+  ID, the copy scraped last wins (ties: the higher shard), so the result
+  does not depend on merge order, and merging the same files again
+  upserts the same events
+- listing fingerprints and touched events are applied
+- the run rows of a source from different shards are combined into one
+  (events and counters summed, times those of the slowest shard)
+
+Options live in ``scrape_run.shard`` of config/websites.json::
+
+    "shard": {"split_details": ["devpost", "devfolio", "unstop"], "staging_dir": "data/staging"}
+"""
+import re
+import sqlite3
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.database.db_manager import DatabaseManager
+from scraper.settings import run_config
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Run-history columns summed across shards; the time columns take the maximum
+_SUMMED = ('saved', 'requests', 'bytes', 'cache_hits', 'retries', 'errors')
+_TIMES = ('wall_s', 'listing_s', 'details_s', 'normalize_s', 'write_s')
+
+
+def shard_config() -> Dict:
+    return run_config().get('shard', {})
+
+
+def split_sources() -> List[str]:
+    """Sources that run on every shard, each taking its share of the listings."""
+    return shard_config().get('split_details', ['devpost', 'devfolio', 'unstop'])
+
+
+def staging_dir() -> Path:
+    return PROJECT_ROOT / shard_config().get('staging_dir', 'data/staging')
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Shard ``index`` (1-based) of ``count``."""
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, text: str) -> 'Shard':
+        """Shard from "i/N", e.g. "2/4"."""
+        match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', str(text))
+        if not match:
+            raise ValueError(f"Invalid shard '{text}' (expected i/N, e.g. 1/4)")
+        index, count = int(match.group(1)), int(match.group(2))
+        if not 1 <= index <= count:
+            raise ValueError(f"Invalid shard '{text}' (i must be between 1 and N)")
+        return cls(index, count)
+
+    def __str__(self) -> str:
+        return f'{self.index}/{self.count}'
+
+    def owns(self, key) -> bool:
+        """Whether this shard handles the item with ``key`` (e.g. an event ID)."""
+        return zlib.crc32(str(key).encode('utf-8')) % self.count == self.index - 1
+
+    def select(self, keys: List[str]) -> List[str]:
+        """This shard's sources among ``keys``, in the given order."""
+        from scraper import registry
+
+        split = set(split_sources())
+        dealt = [spec.key for spec in registry.sources() if spec.key not in split]
+        mine = {key for i, key in enumerate(dealt) if i % self.count == self.index - 1}
+        return [key for key in keys if key in split or key in mine]
+
+    def staging_path(self, directory: Optional[Path] = None) -> Path:
+        return Path(directory or staging_dir()) / f'shard-{self.index}-of-{self.count}.db'
+
+
+_active: Optional[Shard] = None
+
+
+def active() -> Optional[Shard]:
+    """Shard this process is running as, if any."""
+    return _active
+
+
+def owns(key) -> bool:
+    """Whether the current shard handles ``key``; always True without sharding."""
+    return _active is None or _active.owns(key)
+
+
+class StagingDatabase:
+    """
+    Database manager for a shard: writes go to the staging file, reads to
+    the main database.
+    """
+
+    _STAGED = ('save_event', 'save_event_batch', 'save_scrape_runs',
+               'update_scrape_metadata', 'save_listing_fingerprints', 'get_statistics')
+
+    def __init__(self, primary, path: Path):
+        self.primary = primary
+        self.path = Path(path)
+        self.staging = DatabaseManager(str(self.path))
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS staged_touches (event_id TEXT PRIMARY KEY)")
+
+    def __getattr__(self, name):
+        return getattr(self.staging if name in self._STAGED else self.primary, name)
+
+    def touch_events(self, event_ids: List[str]) -> int:
+        """Record unchanged events; the merge bumps them in the main database."""
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany("INSERT OR IGNORE INTO staged_touches (event_id) VALUES (?)",
+                             [(event_id,) for event_id in event_ids])
+        return len(event_ids)
+
+
+def activate(shard: Shard, primary, keep: bool = False) -> StagingDatabase:
+    """
+    Run this process as ``shard``; returns the staging database to write to.
+
+    A staging file left over from an earlier run of the same shard is
+    replaced, unless ``keep`` is set (a resumed run adds to it).
+    """
+    global _active
+    _active = shard
+    if isinstance(primary, StagingDatabase):
+        primary = primary.primary  # Activated again in the same process
+    path = shard.staging_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not keep:
+        path.unlink(missing_ok=True)
+    return StagingDatabase(primary, path)
+
+
+# ---- Merge ----
+
+def _shard_files(directory: Path) -> List[Path]:
+    """Staging files in shard order."""
+    def index(path):
+        match = re.match(r'shard-(\d+)-of-\d+\.db$', path.name)
+        return int(match.group(1)) if match else 0
+    return sorted(Path(directory).glob('shard-*-of-*.db'), key=index)
+
+
+def _rows(path: Path, query: str) -> List[Dict]:
+    with sqlite3.connect(path) as conn:
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(query)]
+        except sqlite3.OperationalError:
+            return []  # Table missing: nothing staged of this kind
+
+
+def _combine_runs(rows: List[Dict]) -> Dict:
+    """One run-history row from the rows of the same source on several shards."""
+    combined = dict(rows[0])
+    combined.pop('id', None)
+    combined['started_at'] = min(r['started_at'] for r in rows)
+    for column in _SUMMED:
+        combined[column] = sum(r.get(column) or 0 for r in rows)
+    for column in _TIMES:
+        combined[column] = max(r.get(column) or 0 for r in rows)
+    failed = [r for r in rows if r['status'] != 'ok']
+    combined['status'] = failed[0]['status'] if failed else 'ok'
+    errors = [r['error_message'] for r in rows if r.get('error_message')]
+    combined['error_message'] = '; '.join(errors) or None
+    return combined
+
+
+def merge(target, directory: Optional[Path] = None, batch_size: int = 500, keep: bool = False) -> Dict[str, int]:
+    """
+    Fold every shard staging file into ``target``.
+
+    Args:
+        target: Main database manager (TiDB or SQLite)
+        directory: Staging directory (default: scrape_run.shard.staging_dir)
+        batch_size: Events per bulk upsert
+        keep: Leave the staging files in place afterwards
+
+    Returns:
+        Counts: files, events (written), duplicates, touched, runs
+    """
+    files = _shard_files(directory or staging_dir())
+    stats = {'files': len(files), 'events': 0, 'duplicates': 0, 'touched': 0, 'runs': 0}
+    if not files:
+        return stats
+
+    # Winning copy of each event: latest scraped_at, then the higher shard
+    winner: Dict[str, tuple] = {}
+    for rank, path in enumerate(files):
+        for row in _rows(path, "SELECT id, scraped_at FROM events"):
+            key = (row['scraped_at'] or '', rank)
+            if row['id'] in winner:
+                stats['duplicates'] += 1
+                key = max(key, winner[row['id']])
+            winner[row['id']] = key
+
+    for rank, path in enumerate(files):
+        batch = []
+        for event in DatabaseManager(str(path)).iter_events(batch_size):
+            if winner[event.id][1] != rank:
+                continue
+            batch.append(event)
+            if len(batch) >= batch_size:
+                stats['events'] += target.save_event_batch(batch)
+                batch = []
+        if batch:
+            stats['events'] += target.save_event_batch(batch)
+
+    fingerprints: Dict[str, Dict[str, str]] = defaultdict(dict)
+    touched = set()
+    runs: Dict[str, List[Dict]] = defaultdict(list)
+    for path in files:
+        for row in _rows(path, "SELECT event_id, source, fingerprint FROM listing_fingerprints"):
+            fingerprints[row['source']][row['event_id']] = row['fingerprint']
+        touched.update(row['event_id'] for row in _rows(path, "SELECT event_id FROM staged_touches"))
+        for row in _rows(path, "SELECT * FROM scrape_runs ORDER BY id"):
+            runs[row['source']].append(row)
+
+    for source, prints in sorted(fingerprints.items()):
+        target.save_listing_fingerprints(source, prints)
+    stats['touched'] = target.touch_events(sorted(touched))
+
+    rows = [_combine_runs(source_rows) for _, source_rows in sorted(runs.items())]
+    target.save_scrape_runs(rows)
+    for row in rows:
+        target.update_scrape_metadata(row['source'], row['saved'], row['status'] == 'ok', row['error_message'])
+    stats['runs'] = len(rows)
+
+    if not keep:
+        for path in files:
+            path.unlink()
+    return stats
+
+
+def print_merge_report(stats: Dict[str, int]):
+    print(f"  Merged {stats['files']} shard(s): {stats['events']} events written "
+          f"({stats['duplicates']} duplicate IDs resolved), {stats['touched']} unchanged touched, "
+          f"{stats['runs']} source runs")
@@ -0,0 +1,254 @@
+"""
+Scrape Run Telemetry
+====================
+Per-source counters and phase timings for each run, stored as run history.
+
+During a run every source accumulates:
+
+- phase times: ``listing`` and ``details`` (wall clock, marked by the
+  scraper with ``phases().lap()``), ``normalize`` (time in
+  ``DataNormalizer.normalize``) and ``write`` (its share of batched DB
+  writes). Normalize and write happen inside the listing/details phases,
+  so the four do not add up to the wall time.
+- HTTP requests, bytes downloaded, cache hits, retries and errors (counted
+  by the Fetcher and the detail memo; browser requests and bytes are added
+  from the page metrics when the run is stored)
+
+Counters are attributed to the source running on the current thread. The
+orchestrator sets it for each job; thread pools inside a scraper should be
+``SourcePoolExecutor`` so their workers count towards the same source.
+
+At the end of a run ``persist()`` writes one ``scrape_runs`` row per source
+(and refreshes ``scrape_metadata``); ``python main.py runs`` reports the
+history and flags sources that got slower or started failing.
+"""
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from statistics import median
+from typing import Callable, Dict, List, Optional
+
+PHASES = ('listing', 'details', 'normalize', 'write')
+COUNTERS = ('requests', 'bytes', 'cache_hits', 'retries', 'errors')
+
+_local = threading.local()
+
+
+def current_source() -> Optional[str]:
+    """Source key the current thread is working for, if any."""
+    return getattr(_local, 'source', None)
+
+
+@contextmanager
+def source(key: Optional[str]):
+    """Attribute everything on this thread to ``key`` inside the block."""
+    previous = current_source()
+    _local.source = key
+    try:
+        yield
+    finally:
+        _local.source = previous
+
+
+def bind(func: Callable) -> Callable:
+    """Wrap ``func`` so it runs attributed to the caller's current source."""
+    key = current_source()
+
+    def bound(*args, **kwargs):
+        with source(key):
+            return func(*args, **kwargs)
+    return bound
+
+
+class SourcePoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor whose tasks inherit the submitter's source."""
+
+    def submit(self, fn, *args, **kwargs):
+        return super().submit(bind(fn), *args, **kwargs)
+
+
+class RunTelemetry:
+    """Thread-safe per-source counters for the current run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new run."""
+        with self._lock:
+            self.started_at = datetime.now()
+            self.run_id = self.started_at.strftime('%Y%m%d-%H%M%S')
+            self._sources: Dict[str, Dict[str, float]] = defaultdict(
+                lambda: {name: 0 for name in PHASES + COUNTERS})
+
+    def count(self, counter: str, n: int = 1, key: Optional[str] = None):
+        key = key or current_source() or 'other'
+        with self._lock:
+            self._sources[key][counter] += n
+
+    def add_time(self, phase: str, seconds: float, key: Optional[str] = None):
+        key = key or current_source() or 'other'
+        with self._lock:
+            self._sources[key][phase] += seconds
+
+    def record_response(self, response):
+        """Count a fetched HTTP response (errors are 4xx/5xx)."""
+        key = current_source() or 'other'
+        with self._lock:
+            entry = self._sources[key]
+            entry['requests'] += 1
+            entry['bytes'] += len(response.content or b'')
+            if response.status_code >= 400:
+                entry['errors'] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._sources.items()}
+
+    def merge(self, snapshot: Dict[str, Dict[str, float]]):
+        """Add another process's snapshot (e.g. a browser worker) to this run."""
+        with self._lock:
+            for key, entry in snapshot.items():
+                for name, value in entry.items():
+                    self._sources[key][name] += value
+
+    def rows(self, results, browser: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """
+        One run-history row per source.
+
+        Args:
+            results: SourceResults from run_scrapers()
+            browser: browser_metrics.snapshot(), merged into the HTTP counters
+        """
+        snapshot = self.snapshot()
+        browser = browser or {}
+        rows = []
+        for r in results:
+            entry = snapshot.get(r.key, {name: 0 for name in PHASES + COUNTERS})
+            page_stats = browser.get(r.key, {})
+            # A scraper that marks no phases spent its whole run on the listing
+            listing = entry['listing'] if (entry['listing'] or entry['details']) else r.wall_time
+            rows.append({
+                'run_id': self.run_id,
+                'source': r.key,
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'status': r.status,
+                'saved': r.saved,
+                'wall_s': round(r.wall_time, 3),
+                'listing_s': round(listing, 3),
+                'details_s': round(entry['details'], 3),
+                'normalize_s': round(entry['normalize'], 3),
+                'write_s': round(entry['write'], 3),
+                'requests': int(entry['requests'] + page_stats.get('requests', 0)),
+                'bytes': int(entry['bytes'] + page_stats.get('bytes', 0)),
+                'cache_hits': int(entry['cache_hits']),
+                'retries': int(entry['retries']),
+                'errors': int(entry['errors']) + (r.status != 'ok'),
+                'error_message': r.error,
+            })
+        return rows
+
+    def persist(self, db, results, browser: Optional[Dict[str, Dict]] = None) -> int:
+        """Store this run's rows and refresh scrape_metadata; returns rows written."""
+        rows = self.rows(results, browser)
+        try:
+            db.save_scrape_runs(rows)
+            for row in rows:
+                db.update_scrape_metadata(row['source'], row['saved'], row['status'] == 'ok', row['error_message'])
+        except Exception as e:
+            print(f'  ⚠ Could not store run telemetry: {e}')
+            return 0
+        return len(rows)
+
+
+class PhaseClock:
+    """Splits a scraper's wall time into named phases."""
+
+    def __init__(self):
+        self._last = time.monotonic()
+
+    def lap(self, phase: str):
+        """Attribute the time since the previous lap to ``phase``."""
+        now = time.monotonic()
+        telemetry.add_time(phase, now - self._last)
+        self._last = now
+
+
+def phases() -> PhaseClock:
+    """Start timing phases for the current source."""
+    return PhaseClock()
+
+
+class TimedNormalizer:
+    """DataNormalizer wrapper that counts ``normalize()`` time per source."""
+
+    def __init__(self, normalizer):
+        self._normalizer = normalizer
+
+    def __getattr__(self, name):
+        return getattr(self._normalizer, name)
+
+    def normalize(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._normalizer.normalize(*args, **kwargs)
+        finally:
+            telemetry.add_time('normalize', time.perf_counter() - start)
+
+
+# Shared collector for the current run in this process
+telemetry = RunTelemetry()
+
+
+def print_runs_report(history: List[Dict], window: int = 5, slow_factor: float = 1.5):
+    """
+    Print the latest run per source against its recent history.
+
+    Args:
+        history: scrape_runs rows, newest first
+        window: Previous runs the latest is compared with
+        slow_factor: Flag a source whose wall time exceeds the previous
+                     median by this factor
+    """
+    by_source: Dict[str, List[Dict]] = defaultdict(list)
+    for row in history:
+        by_source[row['source']].append(row)
+
+    print(f'\n  {"Source":<14} {"Last run":<20} {"Status":<8} {"Saved":>6} {"Time":>8} {"Median":>8} '
+          f'{"Req":>6} {"MB":>7} {"Hits":>5} {"Err":>4}')
+    print('  ' + '-' * 96)
+    for key in sorted(by_source):
+        runs = by_source[key]
+        last, previous = runs[0], runs[1:window + 1]
+        prev_median = median(r['wall_s'] for r in previous) if previous else None
+
+        flags = []
+        if prev_median and last['wall_s'] > prev_median * slow_factor:
+            flags.append(f'slower ×{last["wall_s"] / prev_median:.1f}')
+        if previous and last['saved'] < 0.5 * median(r['saved'] for r in previous):
+            flags.append('fewer events')
+        if last['status'] != 'ok' and all(r['status'] == 'ok' for r in previous):
+            flags.append('newly failing')
+
+        median_text = f'{prev_median:.1f}s' if prev_median is not None else '-'
+        print(f'  {key:<14} {str(last["started_at"])[:19]:<20} {last["status"]:<8} {last["saved"]:>6} '
+              f'{last["wall_s"]:>7.1f}s {median_text:>8} {last.get("requests") or 0:>6} '
+              f'{(last.get("bytes") or 0) / 1e6:>7.1f} {last.get("cache_hits") or 0:>5} {last.get("errors") or 0:>4}')
+        print(f'      phases: listing {last["listing_s"]:.1f}s, details {last["details_s"]:.1f}s, '
+              f'normalize {last["normalize_s"]:.1f}s, write {last["write_s"]:.1f}s'
+              + (f'   ⚠ {", ".join(flags)}' if flags else ''))
+
+
+def print_source_history(history: List[Dict]):
+    """Print every stored run of one source, newest first."""
+    print(f'\n  {"Started":<20} {"Status":<8} {"Saved":>6} {"Time":>8} {"List":>7} {"Detail":>7} '
+          f'{"Norm":>6} {"Write":>6} {"Req":>6} {"Err":>4}')
+    print('  ' + '-' * 88)
+    for r in history:
+        print(f'  {str(r["started_at"])[:19]:<20} {r["status"]:<8} {r["saved"]:>6} {r["wall_s"]:>7.1f}s '
+              f'{r["listing_s"]:>6.1f}s {r["details_s"]:>6.1f}s {r["normalize_s"]:>5.1f}s {r["write_s"]:>5.1f}s '
+              f'{r.get("requests") or 0:>6} {r.get("errors") or 0:>4}')
@@ -0,0 +1,113 @@
+"""
+Buffered Event Writer
+=====================
+Collects normalized events from all scrapers and writes them in batches.
+
+Saving events one by one costs a connection and a commit per event (on
+TiDB, a new TLS connection per event). The writer buffers events and
+flushes them through ``save_event_batch`` once ``batch_size`` are queued,
+so a full run does tens of commits instead of thousands.
+
+Each batch's write time is split across the sources that queued its
+events, for the run telemetry (telemetry.py).
+
+If a batch fails, its events are retried one at a time so a single bad row
+cannot drop the rest of the batch.
+
+A batch is also flushed when its oldest event has waited longer than
+``max_delay_s`` (checked as events are queued), so a streaming scraper's
+first events reach the database within seconds even on a slow source.
+
+Events queued by a source the orchestrator gave up on (timeout, see
+``budget.abandon()``) are dropped: its result has been reported and its
+events flushed, and a scraper that ignores its deadline must not keep
+writing after that.
+
+``on_flush``, if set, is called after every write with the (source, event
+ID) pairs that reached the database; checkpoint.py records them there.
+
+Batch size and delay come from ``scrape_run.write_batch_size`` and
+``scrape_run.write_max_delay_s`` in config/websites.json. Callers must
+``flush()`` before relying on the events being in the database (the scrape
+entry points do this).
+"""
+import threading
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+
+from scraper import budget
+from scraper.settings import run_config
+from scraper.telemetry import current_source, telemetry
+
+
+class EventWriter:
+    """Thread-safe batching front end for a database manager."""
+
+    def __init__(self, db, batch_size: int = None, max_delay_s: float = None):
+        self.db = db
+        cfg = run_config()
+        self.batch_size = max(1, batch_size or cfg.get('write_batch_size', 200))
+        self.max_delay_s = max_delay_s if max_delay_s is not None else cfg.get('write_max_delay_s', 5)
+        self._buffer: List = []
+        self._oldest = 0.0                        # when the first buffered event was queued
+        self._sources: List[Optional[str]] = []   # source that queued each event
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'failed': 0, 'dropped': 0}
+        self.on_flush: Optional[Callable[[List[Tuple[Optional[str], str]]], None]] = None
+
+    def save(self, event) -> bool:
+        """Queue an event; flushes when the batch is full or old enough. False if dropped."""
+        now = time.monotonic()
+        with self._lock:
+            # Checked under the lock: an abandoned source's last events are
+            # either in the flush that follows abandon() or dropped here
+            if budget.abandoned():
+                self.stats['dropped'] += 1
+                return False
+            if not self._buffer:
+                self._oldest = now
+            self._buffer.append(event)
+            self._sources.append(current_source())
+            self.stats['queued'] += 1
+            full = (len(self._buffer) >= self.batch_size
+                    or bool(self.max_delay_s) and now - self._oldest >= self.max_delay_s)
+        if full:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of events written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                sources, self._sources = self._sources, []
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            persisted = list(zip(sources, batch))
+            try:
+                written = self.db.save_event_batch(batch)
+            except Exception as e:
+                print(f'  ⚠ Batch write of {len(batch)} events failed ({e}), retrying one by one')
+                written = 0
+                persisted = []
+                for key, event in zip(sources, batch):
+                    try:
+                        if self.db.save_event(event):
+                            written += 1
+                        persisted.append((key, event))
+                    except Exception:
+                        self.stats['failed'] += 1
+
+            elapsed = time.perf_counter() - start
+            for key, n in Counter(sources).items():
+                telemetry.add_time('write', elapsed * n / len(batch), key=key)
+
+            self.stats['batches'] += 1
+            self.stats['written'] += written
+            if self.on_flush:
+                self.on_flush([(key, event.id) for key, event in persisted])
+            return written
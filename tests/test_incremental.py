@@ -0,0 +1,91 @@
+"""
+ListingTracker only stores a listing's fingerprint once its details were
+fetched or revalidated; details served from the HTTP cache by the site's
+``cache_max_age_s`` leave the listing "changed" for the next run.
+"""
+import requests
+
+from backend.utils.data_normalizer import DataNormalizer
+from scraper import memo as run_memo
+from scraper.fetcher import Fetcher
+from scraper.incremental import ListingTracker
+from scraper.memo import memoized
+
+URL = 'https://example.devpost.com/'
+
+
+class FakeDb:
+    def __init__(self):
+        self.fingerprints = {}
+
+    def get_listing_fingerprints(self, source):
+        return dict(self.fingerprints)
+
+    def save_listing_fingerprints(self, source, fingerprints):
+        self.fingerprints.update(fingerprints)
+
+    def touch_events(self, event_ids):
+        return len(event_ids)
+
+
+def _fetcher(tmp_path, monkeypatch):
+    client = Fetcher({'websites': {'devpost': {'http': {'cache_max_age_s': 3600}}},
+                      'http': {'cache': {'dir': str(tmp_path / 'http')}}})
+
+    def request(method, url, **kwargs):
+        r = requests.Response()
+        r.status_code, r.url, r._content = 200, url, b'<p>Details</p>'
+        return r
+
+    monkeypatch.setattr(client, 'request', request)
+    return client
+
+
+def _run(db, client, summary):
+    """One incremental pass over a single listing; returns whether its details were fetched."""
+    run_memo.memo.reset()
+
+    @memoized('devpost-test', run_memo.canonical_url)
+    def details(url):
+        return {'description': client.get(url, cache='devpost').text}
+
+    tracker = ListingTracker(db, DataNormalizer(), 'Devpost')
+    fetch = tracker.watch(details)
+    event_id = tracker.event_id(URL, 'Example')
+    changed = tracker.is_changed(event_id, summary)
+    if changed:
+        assert fetch(URL)
+        tracker.mark_saved(event_id, URL)
+    tracker.commit()
+    return changed
+
+
+def test_details_served_by_max_age_are_checked_again(tmp_path, monkeypatch):
+    db, client = FakeDb(), _fetcher(tmp_path, monkeypatch)
+
+    assert _run(db, client, {'prize': 100})        # Fetched: fingerprint stored
+    assert not _run(db, client, {'prize': 100})
+    assert _run(db, client, {'prize': 500})        # Changed; details are a fresh cache entry
+    assert _run(db, client, {'prize': 500})        # So it is still changed next run
+    assert client.cache_stats()['devpost'] == {'fresh': 2, 'revalidated': 0, 'miss': 1}
+
+
+def test_memo_hit_reports_how_the_details_were_served(tmp_path, monkeypatch):
+    db, client = FakeDb(), _fetcher(tmp_path, monkeypatch)
+    client.get(URL, cache='devpost')  # Cached earlier, within max age
+    run_memo.memo.reset()
+
+    @memoized('devpost-test', run_memo.canonical_url)
+    def details(url):
+        return {'description': client.get(url, cache='devpost').text}
+
+    details(URL)  # Another source reads the page first
+    tracker = ListingTracker(db, DataNormalizer(), 'Devpost')
+    event_id = tracker.event_id(URL, 'Example')
+    assert tracker.is_changed(event_id, {'prize': 100})
+    assert tracker.watch(details)(URL)
+    tracker.mark_saved(event_id, URL)
+    tracker.commit()
+
+    assert run_memo.memo.stats()['devpost-test']['hits'] == 1
+    assert db.fingerprints == {}
@@ -0,0 +1,33 @@
+"""
+KeywordMatcher: whole-word matching with one compiled pattern per keyword set.
+
+Speed against the substring loops it replaced is reported by
+``python main.py bench --keywords``, not asserted here.
+"""
+from backend.utils.keyword_matcher import KeywordMatcher
+
+
+def test_whole_words_only():
+    matcher = KeywordMatcher(['AI', 'AR', 'app', 'machine learning'])
+    assert matcher.find_all("Maintain the chain; apply for the hackathon") == []
+    assert matcher.find_all("AI apps, AR and Machine-Learning") == ['AI', 'AR', 'app', 'machine learning']
+    assert matcher.search("ai_ml")
+    assert not matcher.search("airport")
+
+
+def test_symbols_and_phrases():
+    matcher = KeywordMatcher(['C++', 'C#', 'in person', 'web3'])
+    assert matcher.find_all("C++ or C# tooling, in-person at the venue") == ['C++', 'C#', 'in person']
+    assert matcher.find_all("“In person”… Web3s!\nweb3") == ['in person', 'web3']
+    assert not matcher.search("web30 and in personal")
+
+
+def test_overlapping_keywords():
+    matcher = KeywordMatcher(['machine', 'machine learning', 'learning systems', 'AR', 'VR', 'AR/VR'])
+    assert matcher.find_all("Machine learning systems in AR/VR") == matcher.keywords
+    assert matcher.find_all("Machine learning systems", limit=2) == ['machine', 'machine learning']
+
+
+def test_empty():
+    assert KeywordMatcher([]).find_all("anything") == []
+    assert not KeywordMatcher(['AI']).search(None)
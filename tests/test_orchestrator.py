@@ -0,0 +1,108 @@
+"""
+Per-source timeouts of scraper/orchestrator.py.
+
+A source that overruns ``source_timeout_s`` is reported through
+``on_finish`` like any other, its deadline is set so the scraper loops stop,
+whatever it still saves is dropped, and the browser lane it holds goes to
+the sources queued behind it.
+"""
+import threading
+import time
+
+from types import SimpleNamespace
+
+from scraper import budget
+from scraper.orchestrator import ScrapeJob, run_scrapers
+from scraper.writer import EventWriter
+
+release = threading.Event()
+stopped = threading.Event()
+
+
+def stuck_scraper():
+    """A hung page load: ignores its deadline until the test releases it."""
+    release.wait(10)
+    return 0
+
+
+def looping_scraper():
+    """Checks ``expired()`` between pages, like iter_pages does."""
+    pages = 0
+    while not budget.expired() and pages < 1000:
+        time.sleep(0.01)
+        pages += 1
+    stopped.set()
+    return pages
+
+
+def quick_scraper():
+    return 5
+
+
+def test_timed_out_source_is_finished_and_frees_its_lane():
+    release.clear()
+    finished = []
+    jobs = [ScrapeJob('stuck', stuck_scraper, 'browser'),
+            ScrapeJob('queued', quick_scraper, 'browser')]
+    try:
+        started = time.monotonic()
+        results = run_scrapers(jobs, max_workers=2, timeout=0.5, browser_lanes=1, on_finish=finished.append)
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    status = {r.key: r.status for r in results}
+    assert status == {'stuck': 'timeout', 'queued': 'ok'}
+    assert [r.key for r in finished] == ['stuck', 'queued']
+    assert elapsed < 5
+
+
+def test_timed_out_source_is_told_to_stop():
+    budget.reset()
+    stopped.clear()
+    finished = []
+    results = run_scrapers([ScrapeJob('looping', looping_scraper)], timeout=0.3, on_finish=finished.append)
+
+    assert [(r.key, r.status) for r in finished] == [('looping', 'timeout')]
+    assert results[0].saved == 0  # Reported as it was at the timeout
+    assert stopped.wait(2)
+    budget.reset()
+
+
+class CountingDb:
+    def __init__(self):
+        self.ids = []
+
+    def save_event_batch(self, events):
+        self.ids += [e.id for e in events]
+        return len(events)
+
+
+def test_timed_out_source_writes_nothing_after_it_is_reported():
+    budget.reset()
+    stopped.clear()
+    db = CountingDb()
+    writer = EventWriter(db, batch_size=5, max_delay_s=0)
+
+    def ignores_deadline():
+        # A loop that never checks budget.expired(), like the MLH listing loop
+        for i in range(100):
+            writer.save(SimpleNamespace(id=f'event-{i}'))
+            time.sleep(0.01)
+        stopped.set()
+        return 100
+
+    reported = []
+
+    def on_finish(result):
+        writer.flush()
+        reported.append(len(db.ids))
+
+    run_scrapers([ScrapeJob('stubborn', ignores_deadline)], timeout=0.3, on_finish=on_finish)
+    assert stopped.wait(5)
+    writer.flush()
+
+    assert 0 < reported[0] < 100
+    assert len(db.ids) == reported[0]
+    assert writer.stats['dropped'] == 100 - reported[0]
+    budget.reset()
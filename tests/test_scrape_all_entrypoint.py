@@ -0,0 +1,102 @@
+"""
+Script entry point of scraper/scrape_all.py (what CI runs).
+
+Run as a script the module is ``__main__``, while the registry imports the
+scrapers from ``scraper.scrape_all``; these tests check that the shard's
+staging database and the checkpoint are the ones the scrapers write to.
+"""
+import runpy
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.database.db_manager import DatabaseManager
+from scraper import checkpoint, raw_store, registry, scrape_all, sharding
+from scraper.writer import EventWriter
+
+SCRIPT = Path(__file__).parent.parent / 'scraper' / 'scrape_all.py'
+
+calls = []
+
+
+def fake_scraper():
+    """Saves like the real scrapers: through scraper.scrape_all's writer."""
+    calls.append('fake')
+    for i in range(3):
+        scrape_all.writer.save(scrape_all.normalizer.normalize(
+            {'title': f'Entry {i}', 'url': f'https://example.com/entry-{i}'}, 'Fake'))
+    return 3
+
+
+def other_scraper():
+    calls.append('other')
+    scrape_all.writer.save(scrape_all.normalizer.normalize(
+        {'title': 'Other', 'url': 'https://example.com/other'}, 'Other'))
+    return 1
+
+
+@pytest.fixture
+def run_script(tmp_path, monkeypatch):
+    specs = [registry.SourceSpec('fake', f'{__name__}:fake_scraper', 'http', False, True),
+             registry.SourceSpec('other', f'{__name__}:other_scraper', 'http', False, True)]
+    monkeypatch.setattr(registry, 'sources', lambda full_run=False: specs)
+    monkeypatch.setattr(sharding, 'staging_dir', lambda: tmp_path / 'staging')
+    monkeypatch.setattr(sharding, '_active', None)
+    monkeypatch.setattr(checkpoint, 'checkpoint_path', lambda shard=None: tmp_path / 'checkpoint.db')
+    monkeypatch.setattr(raw_store, 'raw_dir', lambda: tmp_path / 'raw')
+    primary = DatabaseManager(str(tmp_path / 'main.db'))
+    monkeypatch.setattr(scrape_all, 'db', primary)
+    monkeypatch.setattr(scrape_all, 'writer', EventWriter(primary))
+    calls.clear()
+
+    def run(*args):
+        monkeypatch.setattr(sys, 'argv', [str(SCRIPT), *args])
+        runpy.run_path(str(SCRIPT), run_name='__main__')
+        checkpoint.activate(None)
+        raw_store.close()
+
+    return run
+
+
+def _event_ids(path: Path):
+    with sqlite3.connect(path) as conn:
+        return {row[0] for row in conn.execute("SELECT id FROM events")}
+
+
+def test_shard_writes_to_staging_database(run_script, tmp_path):
+    run_script('--shard', '1/1')
+
+    assert sorted(calls) == ['fake', 'other']
+    assert len(_event_ids(tmp_path / 'staging' / 'shard-1-of-1.db')) == 4
+    assert _event_ids(tmp_path / 'main.db') == set()
+
+def test_resume_skips_sources_finished_before_the_kill(run_script, tmp_path):
+    # What a run killed after finishing "fake" leaves behind
+    interrupted = checkpoint.Checkpoint(tmp_path / 'checkpoint.db')
+    interrupted.start()
+    interrupted.finish_source('fake', 3)
+
+    run_script('--resume')
+
+    assert calls == ['other']
+    assert len(_event_ids(tmp_path / 'main.db')) == 1
+    assert checkpoint.Checkpoint(tmp_path / 'checkpoint.db').finished_sources() == {}
+
+
+def test_resumed_shard_keeps_what_was_staged(run_script, tmp_path):
+    staging = tmp_path / 'staging' / 'shard-1-of-1.db'
+    run_script('--shard', '1/1')
+    staged = _event_ids(staging)
+    # As if the run had been killed after both sources finished
+    interrupted = checkpoint.Checkpoint(tmp_path / 'checkpoint.db')
+    interrupted.start()
+    interrupted.finish_source('fake', 3)
+    interrupted.finish_source('other', 1)
+    calls.clear()
+
+    run_script('--shard', '1/1', '--resume')
+
+    assert calls == []
+    assert _event_ids(staging) == staged
@@ -0,0 +1,35 @@
+"""
+TiDBManager row mapping: the registration deadline is written to and read
+back from the ``deadline`` column (no connection needed).
+"""
+from datetime import date, timedelta
+
+from backend.database.tidb_manager import TiDBManager
+from backend.utils.data_normalizer import HackathonEvent
+
+COLUMNS = ['id', 'source', 'title', 'url', 'description', 'start_date', 'end_date',
+           'deadline', 'location', 'mode', 'prize_pool', 'prize_pool_numeric',
+           'tags', 'organizer', 'image_url', 'team_size_min', 'team_size_max',
+           'participants_count', 'status', 'scraped_at', 'last_updated']
+
+
+def _event(deadline):
+    return HackathonEvent(id='e1', source='Devpost', title='Example', url='https://example.com/',
+                          registration_deadline=deadline, tags=['AI'], status='upcoming')
+
+
+def test_registration_deadline_round_trip():
+    manager = TiDBManager.__new__(TiDBManager)  # Row helpers only, no connection
+    deadline = (date.today() + timedelta(days=7)).isoformat()
+    row = dict(zip(COLUMNS, manager._event_row(_event(deadline), '2026-01-01 00:00:00')))
+
+    assert row['deadline'] == deadline
+    assert manager._row_to_event(row).registration_deadline == deadline
+
+
+def test_closed_registration_is_not_saved():
+    manager = TiDBManager.__new__(TiDBManager)
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+    assert not manager._should_save(_event(yesterday))
+    assert manager._should_save(_event(None))